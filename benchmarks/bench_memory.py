@@ -0,0 +1,152 @@
+'''
+File: bench_memory.py
+Description: This module measures the resident memory cost of the core domain objects of the zoo system. It creates
+             a large batch of each entity type and reports the average number of bytes allocated per entity,
+             including the instance itself and any per-instance containers it owns. Each entity is measured
+             twice: once as a plain stand-in class that assigns the same attributes but keeps them in a
+             per-instance __dict__, as the domain classes did before they declared __slots__ (before), and once
+             as the slotted domain class itself (after).
+             Run from the repository root with: python -m benchmarks.bench_memory [count]
+'''
+
+import sys
+import tracemalloc
+
+from dates import to_date_key
+from domain.animals.animal_mammal import Mammal
+from domain.enclosures.enclosure import Enclosure
+from domain.ordered_set import OrderedSet
+from domain.records.cleaning_task import CleaningTask
+from domain.records.feeding_task import FeedingTask
+from domain.records.health_entry import Entry
+from domain.staff.staff_keeper import Keeper
+from zoodata.zoo_data import intern_species_record, species_catalog
+
+
+class PlainAnimal:
+    """ Stand-in for Animal, holding the same attributes in a per-instance __dict__. """
+
+    def __init__(self, name, species, age, enclosure, diet, sound):
+        self.name = name
+        self.age = age
+        self.profile = intern_species_record(species, enclosure, diet, sound)
+        self.in_enclosure = None
+        self.ailment = False
+        self.hungry = True
+        self.thirsty = True
+        self.asleep = False
+        self.treatment = False
+        self.treated_by = None
+        self.observer = None
+
+
+class PlainEnclosure:
+    """ Stand-in for Enclosure, holding the same attributes in a per-instance __dict__. """
+
+    def __init__(self, size, env_type, id_code):
+        self.contains = OrderedSet()
+        self.size = size
+        self.type = env_type
+        self.id_code = id_code
+        self.cleanliness = 5
+        self.keepers = []
+        self.observer = None
+
+
+class PlainKeeper:
+    """ Stand-in for Keeper, holding the same attributes in a per-instance __dict__. """
+
+    def __init__(self, name, age, gender, birthday, id):
+        self.name = name
+        self.age = age
+        self.gender = gender
+        self.birthday = birthday
+        self.id = id
+        self.role = "Keeper"
+        self.tasks = []
+        self.observer = None
+        self.assigned_enclosures = OrderedSet()
+        self.working_enclosure = None
+
+
+class PlainTask:
+    """ Stand-in for Task, holding the same attributes in a per-instance __dict__. """
+
+    def __init__(self, task_type, task_id, enclosure_id=None, animal_id=None, date=None):
+        self.type = task_type
+        self.enclosure_id = enclosure_id
+        self.animal_id = animal_id
+        self.date = date if date is not None else "UNSCHEDULED"
+        self.assigned = False
+        self.assigned_to = None
+        self.complete = False
+        self.id = task_id
+
+
+class PlainFeedingTask(PlainTask):
+    """ Stand-in for FeedingTask, holding the same attributes in a per-instance __dict__. """
+
+    def __init__(self, enclosure_id, animal_names, date):
+        self.animals = animal_names
+        super().__init__("Feeding", f"Fd-{enclosure_id}-{len(animal_names)}-{date[:5]}", enclosure_id, date=date)
+
+
+class PlainEntry:
+    """ Stand-in for Entry, holding the same attributes in a per-instance __dict__. """
+
+    def __init__(self, date, issue, details, severity, treatment):
+        self.date = to_date_key(date)
+        self.issue = issue
+        self.details = details
+        self.severity = severity
+        self.treatment = treatment
+
+
+def bytes_per_entity(factory, count: int) -> float:
+    """ Returns the average number of bytes allocated for one object created by factory. """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # Subtract the list holding the objects, it is not part of the entity cost.
+    allocated -= sys.getsizeof(objects)
+    return allocated / count
+
+
+def main(count: int = 100_000):
+    lion = species_catalog["Lion"]
+    # Names, ids and dates are created up front so the measurement only covers the entity objects themselves.
+    names = [f"Animal{i}" for i in range(count)]
+    ids = [f"50Sav{i}" for i in range(count)]
+    staff_names = [f"Keeper Number{i}" for i in range(count)]
+
+    before = {
+        "Animal (Mammal)": lambda i: PlainAnimal(names[i], lion.species, 5, lion.enclosure, lion.diet, lion.sound),
+        "Enclosure": lambda i: PlainEnclosure(50, "Savannah", ids[i]),
+        "Staff (Keeper)": lambda i: PlainKeeper(staff_names[i], 30, "Male", "01/01/1995", ids[i]),
+        "CleaningTask": lambda i: PlainTask("Cleaning", f"Cln-{ids[i]}-05/06", ids[i], date="05/06/2020"),
+        "FeedingTask": lambda i: PlainFeedingTask(ids[i], ["All Animals"], "05/06/2020"),
+        "Entry": lambda i: PlainEntry("05/06/2020", "Injury", "Scratched leg", 2, "Bandaging"),
+    }
+    after = {
+        "Animal (Mammal)": lambda i: Mammal.from_record(names[i], lion, 5),
+        "Enclosure": lambda i: Enclosure(50, "Savannah", ids[i]),
+        "Staff (Keeper)": lambda i: Keeper(staff_names[i], 30, "Male", "01/01/1995", ids[i]),
+        "CleaningTask": lambda i: CleaningTask(ids[i], "05/06/2020"),
+        "FeedingTask": lambda i: FeedingTask(ids[i], ["All Animals"], "05/06/2020"),
+        "Entry": lambda i: Entry("05/06/2020", "Injury", "Scratched leg", 2, "Bandaging"),
+    }
+
+    print(f"Bytes per entity ({count} objects each)")
+    print(f"  {'Entity':<18} {'__dict__':>9} {'__slots__':>9} {'saved':>7}")
+    for label in after:
+        dict_bytes = bytes_per_entity(before[label], count)
+        slot_bytes = bytes_per_entity(after[label], count)
+        print(f"  {label:<18} {dict_bytes:9.1f} {slot_bytes:9.1f} {1 - slot_bytes / dict_bytes:6.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
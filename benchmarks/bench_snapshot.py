@@ -0,0 +1,69 @@
+'''
+File: bench_snapshot.py
+Description: This module measures how long it takes to save and load a ZooSystem snapshot. It builds a zoo with
+             the given number of animals (housed ten per enclosure, with keepers, vets, a day of scheduled tasks
+             and a health entry per animal), then reports the snapshot size and the best save and load times.
+             Run from the repository root with: python -m benchmarks.bench_snapshot [count]
+'''
+
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from system.zoo_system import ZooSystem
+
+
+def build_zoo(count: int) -> ZooSystem:
+    """ Returns a zoo system populated with count lions and the staff and tasks that look after them. """
+    system = ZooSystem("Benchmark Zoo")
+    enclosure_count = max(1, count // 10)
+    # The system prints confirmations for some operations; they are not part of the measurement.
+    with open(os.devnull, "w") as null, redirect_stdout(null):
+        report = system.add_animals([("Mammal", f"Animal{i}", "Lion", 5) for i in range(count)])
+        enclosures = [system.add_enclosure(100, "Savannah") for _ in range(enclosure_count)]
+        for i, animal in enumerate(report.added):
+            system.assign_animal_to_enclosure(animal.name, enclosures[i % enclosure_count].id)
+        system.add_staff_bulk([(f"Keeper Number{i}", 30, "Male", "01/01/1995", "Keeper")
+                               for i in range(max(1, enclosure_count // 10))])
+        system.add_staff_bulk([(f"Vet Number{i}", 40, "Female", "01/01/1985", "Veterinarian")
+                               for i in range(max(1, count // 1000))])
+        keepers = [s for s in system.staff if s.role == "Keeper"]
+        for i, enclosure in enumerate(enclosures):
+            system.assign_enclosure_to_keeper(enclosure.id, keepers[i % len(keepers)].id)
+        system.schedule_feeding_auto("06/06/2020")
+        system.auto_assign_tasks("06/06/2020")
+        for animal in report.added:
+            system.create_health_entry(animal.name, "05/06/2020", "Checkup", "Routine checkup", 1, "None")
+    return system
+
+
+def best_time(action, repeat: int = 3) -> float:
+    """ Returns the fastest of several runs of action, in seconds. """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(count: int = 100_000):
+    print(f"Building a zoo with {count} animals...")
+    system = build_zoo(count)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "zoo.snap")
+        save_time = best_time(lambda: system.save(path))
+        load_time = best_time(lambda: ZooSystem.load(path))
+        size = os.path.getsize(path)
+
+    print(f"Snapshot of {count} animals")
+    print(f"  Size          {size / 1_000_000:8.2f} MB ({size / count:.1f} bytes per animal)")
+    print(f"  Save          {save_time * 1000:8.1f} ms")
+    print(f"  Load          {load_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,93 @@
+'''
+File: bench_sqlite.py
+Description: This module compares schedule and health record queries answered by the in-memory ZooSystem with
+             the same queries answered by the indexed SQLite store. It builds a zoo with the given numbers of
+             tasks spread over 100 days and half of them assigned to keepers. Each animal also gets one health
+             entry for every ten tasks. The module then reports the time of the first save into the store, the
+             time of a later save after one enclosure and one health record change, and the best time for each
+             query on both backends.
+             Run from the repository root with: python -m benchmarks.bench_sqlite [count ...]
+             The default counts are 10000, 100000 and 1000000.
+'''
+
+import sys
+import time
+
+from dates import format_date, parse_date
+from domain.records.cleaning_task import CleaningTask
+from system.sqlite_store import SqliteStore
+from system.zoo_system import ZooSystem
+
+DAYS = 100
+FIRST_DAY = parse_date("01/01/2020")
+
+
+def build_zoo(count: int) -> ZooSystem:
+    """ Returns a zoo system holding count cleaning tasks and count // 10 health entries. """
+    system = ZooSystem("Benchmark Zoo")
+    enclosure_count = max(1, count // DAYS)
+    system.add_animals([("Mammal", f"Animal{i}", "Lion", 5) for i in range(1000)])
+    system.add_staff_bulk([(f"Keeper Number{i}", 30, "Male", "01/01/1995", "Keeper") for i in range(100)])
+    keepers = [s.id for s in system.staff]
+    enclosures = [system.add_enclosure(100, "Savannah").id for _ in range(enclosure_count)]
+
+    for day in range(DAYS):
+        date = format_date(FIRST_DAY + day)
+        for i, enclosure_id in enumerate(enclosures):
+            staff_id = keepers[i % len(keepers)] if i % 2 == 0 else None
+            system.add_task(CleaningTask(enclosure_id, date), date=date, staff_id=staff_id)
+
+    for i in range(count // 10):
+        system.create_health_entry(f"Animal{i % 1000}", format_date(FIRST_DAY + i % DAYS), "Checkup",
+                                   "Routine checkup", i % 4, "None")
+    return system
+
+
+def best_time(action, repeat: int = 5) -> float:
+    """ Returns the fastest of several runs of action, in seconds. """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(count: int):
+    system = build_zoo(count)
+    store = SqliteStore()
+    save_time = best_time(lambda: store.save(system), repeat=1)
+    system.enclosures[0].cleanliness = 1
+    system.create_health_entry("Animal0", format_date(FIRST_DAY), "Injury", "Scratched leg", 2, "Bandaging")
+    update_time = best_time(lambda: store.save(system), repeat=1)
+
+    keeper = system.staff[0].id
+    day = format_date(FIRST_DAY + DAYS // 2)
+    month_start, month_end = format_date(FIRST_DAY + 30), format_date(FIRST_DAY + 59)
+    queries = {
+        "Tasks on one date": {"date": day},
+        "Keeper tasks, 30 days": {"staff_id": keeper, "start": month_start, "end": month_end},
+        "Unassigned on one date": {"date": day, "assigned": False},
+    }
+
+    print(f"\n{count} tasks (store saved in {save_time * 1000:.0f} ms, updated in {update_time * 1000:.0f} ms)")
+    print(f"  {'Query':<28} {'memory':>10} {'sqlite':>10}")
+    for label, query in queries.items():
+        memory = best_time(lambda: list(system.iter_tasks(**query)))
+        sqlite = best_time(lambda: list(store.iter_tasks(**query)))
+        print(f"  {label:<28} {memory * 1000:8.2f}ms {sqlite * 1000:8.2f}ms")
+
+    memory = best_time(lambda: [(name, entry) for name, entries in system.health_records.items()
+                                for entry in entries if entry.severity >= 3])
+    sqlite = best_time(lambda: list(store.iter_health_entries(min_severity=3)))
+    print(f"  {'Severe health entries':<28} {memory * 1000:8.2f}ms {sqlite * 1000:8.2f}ms")
+    store.close()
+
+
+def main(counts=(10_000, 100_000, 1_000_000)):
+    for count in counts:
+        run(count)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or (10_000, 100_000, 1_000_000))
@@ -0,0 +1,85 @@
+'''
+File: dates.py
+Description: This module provides the date layer used by the zoo system. Dates entered by users as DD/MM/YYYY
+             strings (or the keywords 'today' and 'now') are converted once into integer ordinal date keys
+             (days since 01/01/0001), which sort chronologically and are cheap to hash and compare. Parsing and
+             formatting results are memoised with a bounded cache, and the current date is cached until midnight.
+'''
+
+from datetime import date as _date, datetime, time as _time, timedelta
+from functools import lru_cache
+import time
+
+from exceptions import InvalidDateError
+
+DATE_FORMAT = "%d/%m/%Y"
+
+# Ordinal key used for tasks that have no scheduled date. Real dates start at ordinal 1, so it sorts first.
+UNSCHEDULED = 0
+UNSCHEDULED_LABEL = "UNSCHEDULED"
+# Ordinal key of the last date datetime can represent (31/12/9999).
+_MAX_DATE_KEY = _date.max.toordinal()
+
+_today_key = None
+_today_expires = 0.0
+
+
+def today_key() -> int:
+    """ Returns the ordinal key of the current date. The value is cached and refreshed after midnight. """
+    global _today_key, _today_expires
+
+    now = time.time()
+    if _today_key is None or now >= _today_expires:
+        today = _date.today()
+        _today_key = today.toordinal()
+        _today_expires = datetime.combine(today + timedelta(days=1), _time.min).timestamp()
+    return _today_key
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text: str) -> int:
+    """ Converts a DD/MM/YYYY date string into its ordinal date key.
+        Parameters:
+            - text: string
+                The date string to convert.
+        Returns:
+            - date_key: integer
+                The ordinal of the date. """
+    try:
+        return datetime.strptime(text, DATE_FORMAT).toordinal()
+    except ValueError:
+        raise InvalidDateError(f"Invalid date: '{text}'. Please use DD/MM/YYYY, e.g. 05/12/2025.")
+
+
+@lru_cache(maxsize=4096)
+def format_date(date_key: int) -> str:
+    """ Converts an ordinal date key back into a DD/MM/YYYY string, or 'UNSCHEDULED' for the unscheduled key. """
+    if date_key == UNSCHEDULED:
+        return UNSCHEDULED_LABEL
+    return _date.fromordinal(date_key).strftime(DATE_FORMAT)
+
+
+def to_date_key(value) -> int:
+    """ Converts user supplied date input into an ordinal date key.
+        Parameters:
+            - value: string, integer or None
+                A DD/MM/YYYY string, 'today'/'now', an existing ordinal key, or None for unscheduled.
+        Returns:
+            - date_key: integer
+                The ordinal date key. """
+    if value is None:
+        return UNSCHEDULED
+    if isinstance(value, int) and not isinstance(value, bool):
+        if value != UNSCHEDULED and not 1 <= value <= _MAX_DATE_KEY:
+            raise InvalidDateError(f"Invalid date key: {value}. Keys run from 1 to {_MAX_DATE_KEY}, "
+                                   f"or {UNSCHEDULED} for unscheduled.")
+        return value
+    if not isinstance(value, str):
+        raise TypeError("Date must be a string")
+
+    text = value.strip()
+    if text.lower() in ("today", "now"):
+        return today_key()
+    if text == UNSCHEDULED_LABEL:
+        return UNSCHEDULED
+    return parse_date(text)
@@ -21,10 +21,14 @@ class Animal(ABC):
            This class provides shared attributes and behaviours for all animals, including
            basic state information and core interactions such as eating, drinking, and sleeping. """
 
+    __slots__ = ("__name", "__age", "__profile", "__in_enclosure", "__ailment", "__hungry", "__thirsty",
+                 "__asleep", "__treatment", "__treated_by", "__observer")
+
     ANIMAL_DATA = animal_data
     FOOD_ITEMS = all_food_items
     ANIMALS = animals
     ENCLOSURES = all_enclosures
+    SPECIES_CATALOG = species_catalog
 
     @abstractmethod
     def __init__(self, name: str, species: str, age: int, enclosure: str, diet: list, sound: str):
@@ -38,11 +42,9 @@ class Animal(ABC):
                             The age of the animal object in years."""
 
         self.__name = name
-        self.__species = species
         self.__age = age
-        self.__enclosure = enclosure
-        self.__diet = diet
-        self.__sound = sound
+        # Species, enclosure, diet and sound live on one immutable record shared by every animal of the species.
+        self.__profile = intern_species_record(species, enclosure, diet, sound)
 
         self.__in_enclosure = None
         self.__ailment = False
@@ -51,6 +53,25 @@ class Animal(ABC):
         self.__asleep = False
         self.__treatment = False
         self.__treated_by = None
+        # The zoo system that registered this animal; notified of state changes it keeps indexes for.
+        self.__observer = None
+
+    @classmethod
+    def from_record(cls, name: str, record: SpeciesRecord, age: int):
+        """ Creates an animal object of this subclass from a species catalog record.
+            Parameters:
+                - name: string
+                    The name of the animal object.
+                - record: SpeciesRecord
+                    The catalog record of the species, providing enclosure, diet and sound.
+                - age: integer
+                    The age of the animal object in years.
+            Returns:
+                - animal: Animal
+                    The newly created animal object. """
+        if record.type != cls.__name__:
+            raise NotInDatabaseError(f"{record.species} is a {record.type} in the database, not a {cls.__name__}")
+        return cls(name, record.species, age, record.enclosure, record.diet, record.sound)
 
     def __str__(self):
         """ Returns a formatted string representation of the animal object."""
@@ -81,7 +102,7 @@ class Animal(ABC):
 
         return (f"-----------------------\n"
                 f"Name: {self.__name}\n"
-                f"Species: {self.__species}\n"
+                f"Species: {self.__profile.species}\n"
                 f"Age: {self.__age}\n"
                 f"In Enclosure: {enclosure}\n"
                 f"Status: {status_str}\n"
@@ -89,13 +110,22 @@ class Animal(ABC):
 
     def __repr__(self):
         """ Returns a concise string representation for debugging and internal displays. """
-        return f"{self.__name}: {self.__species}\n"
+        return f"{self.__name}: {self.__profile.species}\n"
 
     def __eq__(self, other):
         """ Determines equality between two animal objects based on matching name and species. """
-        if self.__species == other.species:
-            if self.__name == other.name:
-                return True
+        if not isinstance(other, Animal):
+            return NotImplemented
+        return self.key == other.key
+
+    def __hash__(self):
+        """ Returns a hash of the identity key, consistent with __eq__. """
+        return hash(self.key)
+
+    @property
+    def key(self):
+        """ Returns the stable identity key (name, species) of the animal object. """
+        return self.__name, self.__profile.species
 
     @property
     def name(self):
@@ -104,7 +134,11 @@ class Animal(ABC):
     @property
     def species(self):
         """ Returns the species of the animal object. """
-        return self.__species
+        return self.__profile.species
+    @property
+    def profile(self):
+        """ Returns the shared species record (enclosure, diet, sound) of the animal object. """
+        return self.__profile
     @property
     def hungry(self):
         """ Returns the hungry status of the animal object. """
@@ -120,16 +154,19 @@ class Animal(ABC):
     @treated_by.setter
     def treated_by(self, treated_by):
         """ Sets the ID of the Veterinarian treating the animal object. """
+        changed = treated_by != self.__treated_by
         self.__treated_by = treated_by
+        if changed and self.__observer is not None:
+            self.__observer.animal_treatment_changed(self, "treated_by")
 
     @property
     def enclosure(self):
-        """ Returns the ID of the Enclosure in which the animal object has to be stored in from database. """
-        return self.__enclosure
+        """ Returns the type of Enclosure in which the animal object has to be stored in from database. """
+        return self.__profile.enclosure
     @property
     def diet(self):
-        """ Returns a list of food items that the animal can eat from database. """
-        return self.__diet
+        """ Returns the frozenset of food items that the animal can eat from database. """
+        return self.__profile.diet
 
     @property
     def in_enclosure(self):
@@ -138,7 +175,18 @@ class Animal(ABC):
     @in_enclosure.setter
     def in_enclosure(self, in_enclosure):
         """ Sets the ID of the Enclosure in which the animal object is currently in. """
+        previous = self.__in_enclosure
         self.__in_enclosure = in_enclosure
+        if in_enclosure != previous and self.__observer is not None:
+            self.__observer.animal_enclosure_changed(self, previous)
+    @property
+    def observer(self):
+        """ Returns the zoo system observing the animal object, or None. """
+        return self.__observer
+    @observer.setter
+    def observer(self, observer):
+        """ Sets the zoo system to be notified when the animal object's state changes. """
+        self.__observer = observer
     @property
     def asleep(self):
         """ Returns True if the animal object is currently sleeping. """
@@ -152,30 +200,35 @@ class Animal(ABC):
         """ Sets the ailment status of the animal object. """
         if not isinstance(ailment, bool):
             raise TypeError (f"ailment: {ailment} must be a boolean")
+        changed = ailment != self.__ailment
         self.__ailment = ailment
+        if changed and self.__observer is not None:
+            self.__observer.animal_ailment_changed(self)
     @treatment.setter
     def treatment(self, treatment: bool):
         """ Sets the treatement status of the animal. """
+        changed = treatment != self.__treatment
         self.__treatment = treatment
+        if changed and self.__observer is not None:
+            self.__observer.animal_treatment_changed(self, "treatment")
     @property
     def age(self):
         """ Returns the age of the animal object. """
         return self.__age
-    @property
-    def enclosure(self):
-        """ Returns the ID of the Enclosure in which the animal object can be stored. """
-        return self.__enclosure
     @hungry.setter
     def hungry(self, hungry):
         """ Sets the hungry status of the animal object. """
+        changed = hungry != self.__hungry
         self.__hungry = hungry
+        if changed and self.__observer is not None:
+            self.__observer.animal_hunger_changed(self)
 
 
 
 
     def make_sound(self):
         """ Produces the characteristic sound of the animal object. """
-        sound = self.__sound
+        sound = self.__profile.sound
         print(f'{self.name}: "{sound}"\n')
 
     def can_eat(self, food: str):
@@ -186,7 +239,7 @@ class Animal(ABC):
         if self.__asleep == True:
             raise AnimalAsleepError (f"{self.name} cannot eat as is currently sleeping.")
 
-        return food in self.__diet
+        return food in self.__profile.diet
 
     def eat(self, food: str):
         """ Allows the animal object to eat and updates its hunger state. """
@@ -199,7 +252,7 @@ class Animal(ABC):
             print(f"{self.name} is not hungry right now.")
             return
 
-        self.__hungry = False
+        self.hungry = False
         print(f"{self.name} the {self.species.title()} eats {food}.")
 
     def drink(self):
@@ -16,6 +16,8 @@ class Bird(Animal):
         This class validates bird species against predefined data and provides
         behaviour specific to bird objects. """
 
+    __slots__ = ()
+
 
     def __init__(self, name: str, species: str, age: int, enclosure: str, diet: list, sound: str):
         """ Creates a Bird object and validates that the species exists in the bird database.
@@ -16,6 +16,8 @@ class Mammal(Animal):
         This class validates mammal species against predefined data and provides
         behaviours and attributes specific to mammals. """
 
+    __slots__ = ()
+
 
     def __init__(self, name: str, species: str, age: int, enclosure: str, diet: list, sound: str):
         """ Creates a Mammal object and validates that the species exists in the mammal database.
@@ -18,6 +18,8 @@ class Reptile(Animal):
         This class validates reptile species against predefined data and provides
         behaviours specific to reptiles. """
 
+    __slots__ = ()
+
 
     def __init__(self, name: str, species: str, age: int, enclosure: str, diet: list, sound: str):
         """ Creates a Reptile object and validates that the species exists in the reptile database.
@@ -10,6 +10,7 @@ This is my own work as defined by the University's Academic Integrity Policy.
 '''
 
 from domain.animals.animal import Animal
+from domain.ordered_set import OrderedSet
 from zoodata.zoo_data import *
 from exceptions import *
 
@@ -18,7 +19,11 @@ class Enclosure:
         This class models real habitat structures that store animal objects and
         provides behaviours related to habitat type, size, cleanliness, assigned
         keepers, and the animals currently stored in the enclosure. """
+
+    __slots__ = ("__contains", "__size", "__type", "__id_code", "__cleanliness", "__keepers", "__observer")
     ENCLOSURES = all_enclosures
+    ENCLOSURE_TYPES = enclosure_types
+    SQM_PER_ANIMAL = 10
 
     def __init__(self, size: int, env_type: str, id_code: str):
         """ Creates an Enclosure object and initialises enclosure attributes.
@@ -30,7 +35,7 @@ class Enclosure:
                 - id_code: string
                     The unique enclosure identification code."""
 
-        self.__contains = []
+        self.__contains = OrderedSet()
 
         if not isinstance(size, int):
             raise TypeError("size must be an integer representing square meters")
@@ -43,7 +48,7 @@ class Enclosure:
         if not isinstance(env_type, str):
             raise TypeError("env_type must be an string representing an environment type")
 
-        if env_type not in self.ENCLOSURES:
+        if env_type not in self.ENCLOSURE_TYPES:
             raise ValueError(f"Enviornment '{env_type}' cannot be found in data base")
 
 
@@ -51,6 +56,8 @@ class Enclosure:
         self.__id_code = id_code
         self.__cleanliness = 5
         self.__keepers = []
+        # The zoo system that registered this enclosure; notified when its cleanliness changes.
+        self.__observer = None
 
 
     def __str__(self):
@@ -79,13 +86,23 @@ class Enclosure:
         """ Returns a concise string representation of the enclosure object. """
         return f"Enclosure: {self.__id_code}"
 
+    def __eq__(self, other):
+        """ Determines equality between two enclosure objects based on their unique enclosure id. """
+        if not isinstance(other, Enclosure):
+            return NotImplemented
+        return self.__id_code == other.id
+
+    def __hash__(self):
+        """ Returns a hash of the enclosure id, consistent with __eq__. """
+        return hash(self.__id_code)
+
     @property
     def id(self):
         """ Returns the enclosure identification code. """
         return self.__id_code
     @property
     def contains(self):
-        """ Returns the list of animals currently stored in the enclosure. """
+        """ Returns the insertion-ordered set of animals currently stored in the enclosure. """
         return self.__contains
     @property
     def cleanliness(self):
@@ -98,7 +115,23 @@ class Enclosure:
             cleanliness = 0
         if cleanliness >= 5:
             cleanliness = 5
+        self.__set_cleanliness(cleanliness)
+
+    def __set_cleanliness(self, cleanliness):
+        """ Stores a new cleanliness value and notifies the observing zoo system of the change. """
+        previous = self.__cleanliness
         self.__cleanliness = cleanliness
+        if previous != cleanliness and self.__observer is not None:
+            self.__observer.enclosure_cleanliness_changed(self, previous)
+
+    @property
+    def observer(self):
+        """ Returns the zoo system observing the enclosure, or None. """
+        return self.__observer
+    @observer.setter
+    def observer(self, observer):
+        """ Sets the zoo system to be notified when the enclosure's cleanliness changes. """
+        self.__observer = observer
 
     @property
     def keepers(self):
@@ -116,6 +149,10 @@ class Enclosure:
     def size(self):
         """ Returns the size of the enclosure. """
         return self.__size
+    @property
+    def capacity(self):
+        """ Returns the number of animals the enclosure can house, allowing SQM_PER_ANIMAL square meters each. """
+        return self.__size // self.SQM_PER_ANIMAL
 
     def report(self):
         """ Prints a simple enclosure report including cleanliness and stored animals. """
@@ -135,8 +172,8 @@ class Enclosure:
         if animal.enclosure.lower() != self.__type.lower():
            raise IncompatibleEnclosureError ("animal needs different enclosure type")
 
-        if self.__contains != []:
-            contained = self.__contains[0]
+        if self.__contains:
+            contained = self.__contains.first()
             if contained.species != animal.species:
                 raise IncompatibleEnclosureError ("enclosure already storing different species")
 
@@ -144,10 +181,10 @@ class Enclosure:
 
     def store(self, animal: Animal):
         """ Stores an animal object inside the enclosure. """
-        self.__contains.append(animal)
+        self.__contains.add(animal)
 
     def be_cleaned(self):
         """ Increases the cleanliness level of the enclosure by one point. """
-        self.__cleanliness += 1
+        self.__set_cleanliness(self.__cleanliness + 1)
 
 
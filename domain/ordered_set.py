@@ -0,0 +1,60 @@
+'''
+File: ordered_set.py
+Description: This module defines the OrderedSet class used by the zoo system. The OrderedSet class is an
+             insertion-ordered, hash-based container used where domain objects hold collections of other
+             domain objects (animals in an enclosure, enclosures of a keeper, animals of a veterinarian).
+             It gives constant time membership tests and removal while keeping a stable display order.
+'''
+
+from collections.abc import MutableSet
+
+
+class OrderedSet(MutableSet):
+    """ An insertion-ordered set backed by a dictionary.
+        It also accepts the list-style append() and compares equal to a list or tuple holding the same
+        items in the same order, so it can replace the plain lists previously used by domain objects. """
+
+    __slots__ = ("__items",)
+
+    def __init__(self, items=()):
+        """ Creates an OrderedSet object from an optional iterable of hashable items.
+            Parameters:
+                - items: iterable (optional)
+                    The initial items, duplicates are kept once in first-seen order."""
+        self.__items = dict.fromkeys(items)
+
+    def __contains__(self, item):
+        return item in self.__items
+
+    def __iter__(self):
+        return iter(self.__items)
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __eq__(self, other):
+        """ Compares in order against lists and tuples, and as a set against other sets. """
+        if isinstance(other, (list, tuple)):
+            return list(self.__items) == list(other)
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self.__items))
+
+    def add(self, item):
+        """ Adds an item to the end of the set if it is not already present. """
+        self.__items[item] = None
+
+    def append(self, item):
+        """ List-style alias of add(). """
+        self.__items[item] = None
+
+    def discard(self, item):
+        """ Removes an item from the set if it is present. """
+        self.__items.pop(item, None)
+
+    def first(self):
+        """ Returns the earliest inserted item, or None if the set is empty. """
+        return next(iter(self.__items), None)
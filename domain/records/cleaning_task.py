@@ -16,6 +16,8 @@ from domain.records.task import Task
 
 class CleaningTask(Task):
 
+    __slots__ = ()
+
     def __init__(self, enclosure_id: str, date: str):
         if not enclosure_id:
             raise IncompleteTaskError("No Enclosure provided for cleaning task")
@@ -15,6 +15,8 @@ from domain.records.task import Task
 
 class FeedingTask(Task):
 
+    __slots__ = ("__animals",)
+
     def __init__(self, enclosure_id: str, animal_names: list, date: str):
         if animal_names is None and enclosure_id is None:
             raise IncompleteTaskError ("No Animal or Enclosure Indicated for Feeding Task")
@@ -29,3 +31,6 @@ class FeedingTask(Task):
     @property
     def animals(self):
         return list(self.__animals) if self.__animals is not None else []
+    @animals.setter
+    def animals(self, animal_names: list):
+        self.__animals = list(animal_names)
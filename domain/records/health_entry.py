@@ -11,10 +11,15 @@ Username: PIEBY002
 This is my own work as defined by the University's Academic Integrity Policy.
 '''
 
+from dates import format_date, to_date_key
+
 class Entry:
 
-    def __init__(self, date: str, issue: str, details: str, severity: int, treatment: str):
-        self.__date = date
+    __slots__ = ("__date", "__issue", "__details", "__severity", "__treatment")
+
+    def __init__(self, date, issue: str, details: str, severity: int, treatment: str):
+        # Stored as an ordinal date key so records sort chronologically; formatted only when displayed.
+        self.__date = to_date_key(date)
         self.__issue = issue
         self.__details = details
 
@@ -39,6 +44,9 @@ class Entry:
 
     @property
     def date(self):
+        return format_date(self.__date)
+    @property
+    def date_key(self):
         return self.__date
     @property
     def issue(self):
@@ -56,7 +64,7 @@ class Entry:
 
     def __str__(self):
         return (f"---- ENTRY ----\n"
-                f"Date: {self.__date}\n"
+                f"Date: {self.date}\n"
          f"Issue: {self.__issue}\n"
          f"Details: {self.__details}\n"
          f"Severity: {self.str_severity()}\n"
@@ -64,5 +72,5 @@ class Entry:
                 f"---- END OF ENTRY ----\n")
 
     def __repr__(self):
-        return (f"Date: {self.__date} | Issue: {self.__issue} | Severity: {self.str_severity()}\n")
+        return (f"Date: {self.date} | Issue: {self.__issue} | Severity: {self.str_severity()}\n")
 
@@ -0,0 +1,187 @@
+'''
+File: recurring_task.py
+Description: This module defines the RecurringTask class used by the zoo system. A RecurringTask is a template
+             for a Feeding, Cleaning or Treatment task that repeats every given number of days. Templates are
+             not stored in the schedule; the zoo system expands them into concrete task objects only for the
+             dates being queried.
+'''
+
+import re
+from datetime import date as _date
+
+from dates import format_date
+from exceptions import IncompleteTaskError, InvalidTaskTypeError
+from domain.records.cleaning_task import CleaningTask
+from domain.records.feeding_task import FeedingTask
+from domain.records.treatment_task import TreatmentTask
+
+
+# Task ids end in '-DD/MM', the day and month of the task's date.
+_ID_DATE = re.compile(r"-(\d{2})/(\d{2})$")
+
+
+class RecurringTask:
+    """ A class representing a recurring task template within the zoo system.
+        It stores the recurrence rule (first date, interval in days and optional last date), the target
+        enclosure or animal, and the staff member the generated tasks are assigned to. """
+
+    __slots__ = ("__id", "__type", "__enclosure_id", "__animal_names", "__start", "__every", "__end",
+                 "__staff_id")
+
+    TASK_TYPES = ("Feeding", "Cleaning", "Treatment")
+    # How many years past the start to search for an occurrence matching a task id, for templates with no end.
+    SEARCH_YEARS = 400
+
+    def __init__(self, template_id: str, task_type: str, start: int, every: int = 1, end: int = None,
+                 enclosure_id: str = None, animal_names=None, staff_id: str = None):
+        """ Creates a RecurringTask object.
+            Parameters:
+                - template_id: string
+                    The unique identifier of the template.
+                - task_type: string
+                    The type of task generated ('Feeding', 'Cleaning' or 'Treatment').
+                - start: integer
+                    The ordinal date key of the first occurrence.
+                - every: integer (optional)
+                    The number of days between occurrences, e.g. 1 for daily or 7 for weekly.
+                - end: integer (optional)
+                    The ordinal date key of the last possible occurrence, or None to repeat indefinitely.
+                - enclosure_id: string (optional)
+                    The enclosure targeted by Feeding and Cleaning tasks.
+                - animal_names: list or string (optional)
+                    The animal names for Feeding tasks, or a single animal name for Treatment tasks.
+                - staff_id: string (optional)
+                    The staff id generated tasks are assigned to."""
+
+        if task_type not in self.TASK_TYPES:
+            raise InvalidTaskTypeError(f"Invalid task type: {task_type}")
+        if not isinstance(every, int) or isinstance(every, bool):
+            raise TypeError("every must be an integer number of days")
+        if every < 1:
+            raise ValueError("every must be at least 1 day")
+        if end is not None and end < start:
+            raise ValueError("end date cannot be before the start date")
+        if task_type in ("Feeding", "Cleaning") and enclosure_id is None:
+            raise IncompleteTaskError(f"{task_type} requires enclosure ID.")
+        if task_type == "Feeding" and not animal_names:
+            raise IncompleteTaskError("Feeding requires a list of animal names.")
+        if task_type == "Treatment" and not isinstance(animal_names, str):
+            raise TypeError("Treatment requires a single animal name (string).")
+
+        self.__id = template_id
+        self.__type = task_type
+        self.__enclosure_id = enclosure_id
+        self.__animal_names = list(animal_names) if task_type == "Feeding" else animal_names
+        self.__start = start
+        self.__every = every
+        self.__end = end
+        self.__staff_id = staff_id
+
+    def __str__(self):
+        """ Returns a formatted string representation of the recurring task template. """
+        target = self.__enclosure_id if self.__type != "Treatment" else self.__animal_names
+        until = format_date(self.__end) if self.__end is not None else "no end date"
+        return (f"---- RECURRING TASK ----\n"
+                f"ID: {self.__id}\n"
+                f"Type: {self.__type}\n"
+                f"Target: {target}\n"
+                f"Every {self.__every} day(s) from {format_date(self.__start)} until {until}\n"
+                f"Assigned to: {self.__staff_id}\n"
+                f"------------------------\n")
+
+    def __repr__(self):
+        return f"RecurringTask: {self.__id}"
+
+    @property
+    def id(self):
+        return self.__id
+    @property
+    def type(self):
+        return self.__type
+    @property
+    def enclosure_id(self):
+        return self.__enclosure_id
+    @property
+    def animal_names(self):
+        return list(self.__animal_names) if self.__type == "Feeding" else self.__animal_names
+    @animal_names.setter
+    def animal_names(self, animal_names):
+        self.__animal_names = list(animal_names) if self.__type == "Feeding" else animal_names
+    @property
+    def start(self):
+        return self.__start
+    @property
+    def every(self):
+        return self.__every
+    @property
+    def end(self):
+        return self.__end
+    @property
+    def staff_id(self):
+        return self.__staff_id
+    @staff_id.setter
+    def staff_id(self, staff_id):
+        self.__staff_id = staff_id
+
+    def occurs_on(self, date_key: int) -> bool:
+        """ Returns True if the template generates a task on the given ordinal date key. """
+        if date_key < self.__start or (self.__end is not None and date_key > self.__end):
+            return False
+        return (date_key - self.__start) % self.__every == 0
+
+    def build(self, date_key: int):
+        """ Creates the concrete task object this template generates for an ordinal date key. """
+        date = format_date(date_key)
+        if self.__type == "Feeding":
+            task = FeedingTask(self.__enclosure_id, list(self.__animal_names), date)
+        elif self.__type == "Cleaning":
+            task = CleaningTask(self.__enclosure_id, date)
+        else:
+            task = TreatmentTask(self.__animal_names, date)
+        task.assigned_to = self.__staff_id
+        task.assigned = self.__staff_id is not None
+        return task
+
+    def occurrence_for(self, task_id: str, date_key: int = None):
+        """ Finds the occurrence of this template that generates a task with the given id.
+            Task ids hold the day and month of the task's date but not the year.
+            Parameters:
+                - task_id: string
+                    The id of the generated task.
+                - date_key: integer (optional)
+                    The ordinal date key of the occurrence. If not provided, the earliest occurrence whose task
+                    has the id is returned.
+            Returns:
+                - date_key: integer or None
+                    The ordinal date key of the matching occurrence, or None if the template never generates it. """
+        match = _ID_DATE.search(task_id)
+        if match is None or self.build(self.__start).id[:-6] != task_id[:match.start()]:
+            return None
+
+        if date_key is not None:
+            if self.occurs_on(date_key) and self.build(date_key).id == task_id:
+                return date_key
+            return None
+
+        day, month = int(match.group(1)), int(match.group(2))
+        first_year = _date.fromordinal(self.__start).year
+        last_year = _date.fromordinal(self.__end).year if self.__end is not None else first_year + self.SEARCH_YEARS
+        for year in range(first_year, last_year + 1):
+            try:
+                candidate = _date(year, month, day).toordinal()
+            except ValueError:
+                continue
+            if self.occurs_on(candidate):
+                return candidate
+        return None
+
+    def occurrences_between(self, first: int, last: int):
+        """ Returns the ordinal date keys of the occurrences between two date keys, inclusive. """
+        if first < self.__start:
+            first = self.__start
+        else:
+            # Round up to the next day on the template's interval.
+            first += -(first - self.__start) % self.__every
+        if self.__end is not None:
+            last = min(last, self.__end)
+        return range(first, last + 1, self.__every)
@@ -16,6 +16,9 @@ from abc import ABC, abstractmethod
 
 class Task(ABC):
 
+    __slots__ = ("__type", "__enclosure_id", "__animal_id", "__date", "__assigned", "__assigned_to", "__complete",
+                 "__id")
+
     def __init__(self, task_type: str, enclosure_id: str = None, animal_id: str = None, date: str = None):
         self.__type = task_type
         self.__enclosure_id = enclosure_id
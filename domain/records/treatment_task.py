@@ -16,6 +16,8 @@ from exceptions import IncompleteTaskError
 
 class TreatmentTask(Task):
 
+    __slots__ = ()
+
     def __init__(self, animal_id: str, date: str):
         if not animal_id:
             raise IncompleteTaskError("No Animal provided for treatment task")
@@ -19,6 +19,8 @@ class Staff:
         This class provides shared attributes and behaviours for all staff roles.
         Subclasses extend this to model specific staff roles such as Keeper and Veterinarian"""
 
+    __slots__ = ("__name", "__age", "__gender", "__birthday", "__id", "__role", "__tasks", "__observer")
+
     def __init__(self, name: str, age: int, gender: str, birthday: str, id: str):
         """ Creates a Staff object and initialises shared staff attributes.
             Parameters:
@@ -49,6 +51,7 @@ class Staff:
         self.__id = id
         self.__role = None
         self.__tasks = []
+        self.__observer = None
 
     @property
     def id(self):
@@ -72,6 +75,14 @@ class Staff:
         self.__role = role
         return
     @property
+    def observer(self):
+        """ Returns the zoo system observing this staff member, or None. """
+        return self.__observer
+    @observer.setter
+    def observer(self, observer):
+        """ Sets the zoo system to be notified when this staff member starts or stops work. """
+        self.__observer = observer
+    @property
     def tasks(self):
         """ Returns the tasks assigned to this staff member. """
         return self.__tasks
@@ -90,6 +101,16 @@ class Staff:
 
 
 
+    def __eq__(self, other):
+        """ Determines equality between two staff members based on their unique staff id. """
+        if not isinstance(other, Staff):
+            return NotImplemented
+        return self.__id == other.id
+
+    def __hash__(self):
+        """ Returns a hash of the staff id, consistent with __eq__. """
+        return hash(self.__id)
+
     def __repr__(self):
         """ Returns a concise string representation used for debugging and internal display. """
         role = "Staff Member" if self.__role is None else self.__role
@@ -11,6 +11,7 @@ This is my own work as defined by the University's Academic Integrity Policy.
 from domain.staff.staff import Staff
 from domain.enclosures.enclosure import Enclosure
 from domain.animals.animal import Animal
+from domain.ordered_set import OrderedSet
 from exceptions import *
 
 class Keeper(Staff):
@@ -20,6 +21,8 @@ class Keeper(Staff):
         It stores information about assigned enclosures and the enclosure the
         keeper is currently working in. """
 
+    __slots__ = ("__assigned_enclosures", "__working_enclosure")
+
     def __init__(self, name, age, gender, birthday, id):
         """ Creates a Keeper object and initialises keeper-specific attributes.
             Parameters:
@@ -36,7 +39,7 @@ class Keeper(Staff):
 
         super().__init__(name, age, gender, birthday, id)
         self.role = "Keeper"
-        self.__assigned_enclosures = []
+        self.__assigned_enclosures = OrderedSet()
         self.__working_enclosure = None
 
     def __str__(self):
@@ -50,13 +53,13 @@ class Keeper(Staff):
 
     @property
     def assigned_enclosures(self):
-        """ Returns the list of enclosures assigned to this keeper. """
+        """ Returns the insertion-ordered set of enclosures assigned to this keeper. """
         return self.__assigned_enclosures
 
     @assigned_enclosures.setter
     def assigned_enclosures(self, assigned_enclosures):
-        """ Updates the list of enclosures assigned to this keeper. """
-        self.__assigned_enclosures = assigned_enclosures
+        """ Updates the enclosures assigned to this keeper. """
+        self.__assigned_enclosures = OrderedSet(assigned_enclosures)
 
     @property
     def working_enclosure(self):
@@ -66,7 +69,10 @@ class Keeper(Staff):
     @working_enclosure.setter
     def working_enclosure(self, working_enclosure):
         """ Updates the enclosure that this keeper is currently working on. """
+        changed = working_enclosure is not self.__working_enclosure
         self.__working_enclosure = working_enclosure
+        if changed and self.observer is not None:
+            self.observer.staff_work_changed(self)
 
     def accept_assignment (self, enclosure: Enclosure):
         """ Assigns an enclosure to this keeper unless it is already assigned.
@@ -76,7 +82,7 @@ class Keeper(Staff):
         if enclosure in self.__assigned_enclosures:
             raise DuplicateError (f"Enclosure {enclosure} already assigned to this Keeper")
 
-        self.__assigned_enclosures.append(enclosure)
+        self.__assigned_enclosures.add(enclosure)
 
     def get_assigned_enclosure(self, enclosure_id: str):
         """ Retrieves an assigned enclosure based on an enclosure id.
@@ -87,7 +93,7 @@ class Keeper(Staff):
                 - enclosure: Enclosure or None
                     The assigned enclosure object if found, otherwise None. """
 
-        if self.__assigned_enclosures == []:
+        if not self.__assigned_enclosures:
             raise NoAssignedEnclosuresError
 
         for enclosure in self.__assigned_enclosures:
@@ -103,7 +109,7 @@ class Keeper(Staff):
                     The identifier of the assigned enclosure to work in."""
         enclosure = self.get_assigned_enclosure(enclosure_id)
         if enclosure is None: raise EnclosureNotAvailableError
-        self.__working_enclosure = enclosure
+        self.working_enclosure = enclosure
 
     def clean_enclosure(self):
         """ Cleans the enclosure the keeper is currently working in. """
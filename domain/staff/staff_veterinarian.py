@@ -12,6 +12,7 @@ This is my own work as defined by the University's Academic Integrity Policy.
 from domain.staff.staff import Staff
 from domain.animals.animal import Animal
 from domain.records.health_entry import Entry
+from domain.ordered_set import OrderedSet
 from exceptions import *
 
 class Veterinarian(Staff):
@@ -19,6 +20,8 @@ class Veterinarian(Staff):
         This class manages veterinarian-specific responsibilities, including
         treating animals. """
 
+    __slots__ = ("__assigned_animals", "__working_animal")
+
     def __init__(self, name, age, gender, birthday, id):
         """ Creates a Veterinarian object and initialises veterinarian-specific attributes.
             Parameters:
@@ -34,7 +37,7 @@ class Veterinarian(Staff):
                     The unique identification code of the veterinarian."""
         super().__init__(name, age, gender, birthday, id)
         self.role = "Veterinarian"
-        self.__assigned_animals = []
+        self.__assigned_animals = OrderedSet()
         self.__working_animal = None
 
     def __str__(self):
@@ -49,13 +52,13 @@ class Veterinarian(Staff):
 
     @property
     def assigned_animals(self):
-        """ Returns the list of animals assigned to this veterinarian. """
+        """ Returns the insertion-ordered set of animals assigned to this veterinarian. """
         return self.__assigned_animals
 
     @assigned_animals.setter
     def assigned_animals(self, assigned_animals):
-        """ Updates the list of animals assigned to this veterinarian. """
-        self.__assigned_animals = assigned_animals
+        """ Updates the animals assigned to this veterinarian. """
+        self.__assigned_animals = OrderedSet(assigned_animals)
 
     @property
     def working_animal(self):
@@ -65,21 +68,24 @@ class Veterinarian(Staff):
     @working_animal.setter
     def working_animal(self, working_animal):
         """ Updates the animal currently being treated by this veterinarian. """
+        changed = working_animal is not self.__working_animal
         self.__working_animal = working_animal
+        if changed and self.observer is not None:
+            self.observer.staff_work_changed(self)
 
     def accept_assignment(self, animal: Animal):
         """ Assigns an animal to this veterinarian for potential treatment.
             Parameters:
                 - animal: Animal
                     The animal object being assigned."""
-        self.__assigned_animals.append(animal)
+        self.__assigned_animals.add(animal)
 
     def get_assigned_animal(self, animal_name: str):
         """ Retrieves an assigned animal based on its name.
             Parameters:
                 - animal_name: string
                     The name of the animal to retrieve."""
-        if self.__assigned_animals == []:
+        if not self.__assigned_animals:
             raise NoAssignedAnimalsError
 
         for animal in self.__assigned_animals:
@@ -104,10 +110,10 @@ class Veterinarian(Staff):
         if previous_animal != None:
             self.stop_treating_animal()
 
-        self.__working_animal = new_animal
+        self.working_animal = new_animal
 
         new_animal.treatment = True
-        self.__working_animal.treated_by = self.id
+        new_animal.treated_by = self.id
 
         print(f"{self.id} is treating {animal_name}.")
 
@@ -117,10 +123,10 @@ class Veterinarian(Staff):
 
         if self.__working_animal.ailment:
             print(f"{self.id} has stopped treating {self.__working_animal.name} but animal still in need of medical attention.")
-            self.__working_animal = None
+            self.working_animal = None
         else:
             print(f"{self.id} has stopped treating {self.__working_animal.name}")
-            self.__working_animal = None
+            self.working_animal = None
 
     def heal_animal(self):
         self.__working_animal.ailment = False
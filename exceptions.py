@@ -105,3 +105,9 @@ class AnimalHealthyError(Exception):
 
 class NotInDatabaseError(Exception):
     pass
+
+class SnapshotError(Exception):
+    pass
+
+class JournalError(Exception):
+    pass
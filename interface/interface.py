@@ -12,6 +12,7 @@ This is my own work as defined by the University's Academic Integrity Policy."""
 
 
 from exceptions import *
+from dates import format_date
 from system.zoo_system import ZooSystem
 
 
@@ -35,8 +36,8 @@ class Interface:
                 - age: integer
                     The age of animal object in years."""
         try:
-            self.__system.add_animal(type, name, species, age)
-            print (f"Animal added!\n{self.__system.animals[-1]}")
+            new_animal = self.__system.add_animal(type, name, species, age)
+            print (f"Animal added!\n{new_animal}")
         except ValueError as e:
             print (f"Animal cannot be added: {e}\n")
         except TypeError as e:
@@ -45,6 +46,20 @@ class Interface:
             print (f"Animal cannot be added: {e}\n")
 
 
+    def add_animals(self, records, atomic: bool = True):
+        """ Adds many animal objects to the zoo system at once and displays a summary to the user.
+            Parameters:
+                - records: iterable
+                    Rows of (type, name, species, age), as sequences or dicts with those keys.
+                - atomic: bool (optional)
+                    If True, no animals are added unless every row is valid."""
+        try:
+            report = self.__system.add_animals(records, atomic)
+        except (TypeError, ValueError) as e:
+            print(f"Animals cannot be added: {e}\n")
+            return
+        print(f"{report}\n")
+
     def remove_animal(self, animal_name: str):
         """ Removes an animal object from the zoo system and displays confirmation to the user.
             Parameters:
@@ -73,8 +88,8 @@ class Interface:
                 - role: string (optional)
                     The staff role indicating subclass (e.g. 'Keeper', 'Veterinarian')."""
         try:
-            self.__system.add_staff(name, age, gender, birthday, role)
-            print (f"Staff Member added {self.__system.staff[-1]}")
+            new_staff = self.__system.add_staff(name, age, gender, birthday, role)
+            print (f"Staff Member added {new_staff}")
         except ValueError as e:
             print (f"Staff Member cannot be added: {e}\n")
         except TypeError as e:
@@ -83,6 +98,22 @@ class Interface:
             print (f"Staff Member cannot be added: {e}\n")
 
 
+    def add_staff_bulk(self, records, atomic: bool = True, format: str = None):
+        """ Adds many staff member objects to the zoo system at once and displays a summary to the user.
+            Parameters:
+                - records: iterable or text stream
+                    Rows of (name, age, gender, birthday, role), or an open CSV / JSON Lines file of them.
+                - atomic: bool (optional)
+                    If True, no staff are added unless every row is valid.
+                - format: string (optional)
+                    'csv' or 'jsonl' when reading from a stream."""
+        try:
+            report = self.__system.add_staff_bulk(records, atomic, format)
+        except ValueError as e:
+            print(f"Staff cannot be added: {e}\n")
+            return
+        print(f"{report}\n")
+
     def remove_staff(self, staff_id: str):
         """ Removes a staff member from the zoo system and displays confirmation to the user.
             Parameters:
@@ -113,9 +144,9 @@ class Interface:
                     The environmental type of enclosure object."""
 
         try:
-            self.__system.add_enclosure(size, type)
+            new_enclosure = self.__system.add_enclosure(size, type)
             print (f"Enclosure added!\n"
-                   f"{self.__system.enclosures[-1]}")
+                   f"{new_enclosure}")
         except ValueError as e:
             print (f"Enclosure cannot be added: {e}\n")
         except TypeError as e:
@@ -170,6 +201,25 @@ class Interface:
         print(f"All Animals in {enclosure_id}:{animals_str}")
 
 
+    def show_ailing_animals(self, staff_id: str = None):
+        """ Displays the animal objects currently in need of medical attention.
+            Parameters:
+                - staff_id: string (optional)
+                    Limits the report to the animals a Keeper or Veterinarian looks after."""
+        try:
+            ailing = self.__system.get_ailing_animals(staff_id)
+        except (NoSuchStaffError, InvalidStaffRoleError) as e:
+            print(f"Cannot perform health check: {e}\n")
+            return
+
+        prefix = f"{staff_id}: " if staff_id else ""
+        if not ailing:
+            print(f"{prefix}No animals need medical attention!\n")
+            return
+        for animal in ailing:
+            print(f"{prefix}{animal.name} is in need of medical attention!")
+        print()
+
     def show_all_enclosures(self):
         """ Displays all animal objects currently stored within a specific enclosure.
             Parameters:
@@ -181,6 +231,20 @@ class Interface:
         enclosures_display = "\n".join(enclosures_str)
         print(f"All Enclosures:\n{enclosures_display}")
 
+    def show_dirtiest_enclosures(self, k: int = 5):
+        """ Displays the enclosure objects most in need of cleaning, dirtiest first.
+            Parameters:
+                - k: integer
+                    The maximum number of enclosure objects to display."""
+        try:
+            enclosures = self.__system.get_dirtiest_enclosures(k)
+        except (TypeError, ValueError) as e:
+            print(f"Cannot show enclosures: {e}\n")
+            return
+
+        lines = [f"{enclosure.id}: {enclosure.cleanliness}/5" for enclosure in enclosures]
+        print("Dirtiest Enclosures:\n" + "\n".join(lines) + "\n")
+
     def show_enclosure(self, enclosure_id: str):
         """ Displays a single enclosure object based on the provided enclosure id.
             Parameters:
@@ -250,6 +314,18 @@ class Interface:
         except IncompatibleEnclosureError as e:
             print(f"Cannot assign animal to enclosure: {e}\n")
 
+    def place_unhoused_animals(self, apply: bool = True):
+        """ Places every animal object without an enclosure into a compatible enclosure and displays a summary.
+            Parameters:
+                - apply: bool (optional)
+                    If False, the placement plan is only displayed and nothing is moved."""
+        plan, unplaced = self.__system.place_unhoused_animals(apply)
+        verb = "Placed" if apply else "Would place"
+        print(f"{verb} {len(plan)} animal(s).")
+        if unplaced:
+            print(f"No room for {len(unplaced)} animal(s): {', '.join(unplaced)}")
+        print()
+
     def assign_enclosure_to_keeper(self, enclosure_id: str, keeper_id: str):
         """ Assigns an enclosure object to a keeper staff member and displays confirmation to the user.
             Parameters:
@@ -296,7 +372,8 @@ class Interface:
             print(f"Cannot assign animal to Veterinarian: {e}\n")
 
 
-    def display_schedule(self, date: str = None, status: str = None, assigned:bool = None, staff_id:str = None):
+    def display_schedule(self, date: str = None, status: str = None, assigned:bool = None, staff_id:str = None,
+                         start: str = None, end: str = None):
         """ Displays scheduled task objects based on the provided filtering options.
             Parameters:
                 - date: string (optional)
@@ -306,14 +383,24 @@ class Interface:
                 - assigned: boolean (optional)
                     Whether to filter by assignment state.
                 - staff_id: string (optional)
-                    The staff id used to filter tasks by assigned staff member."""
+                    The staff id used to filter tasks by assigned staff member.
+                - start: string (optional)
+                    The first date of a range of days to display, e.g. a weekly view.
+                - end: string (optional)
+                    The last date of a range of days to display."""
 
-        tasks = list(self.__system.iter_tasks(date=date, status=status, assigned=assigned, staff_id=staff_id))
+        try:
+            tasks = list(self.__system.iter_tasks(date=date, status=status, assigned=assigned, staff_id=staff_id,
+                                                  start=start, end=end))
+        except InvalidDateError as e:
+            print(f"Cannot display schedule: {e}\n")
+            return
         if not tasks:
             print ("No tasks matching this selection can be found.\n")
             return
 
-        if staff_id and not date and not status and assigned is None:
+        staff_view = staff_id and not (date or start or end or status) and assigned is None
+        if staff_view:
             print(f"\n=== TASKS FOR STAFF: {staff_id} ===")
 
         current_date = None
@@ -324,8 +411,8 @@ class Interface:
             if task_date != current_date:
                 current_date = task_date
 
-                if not (staff_id and not date and not status and assigned is None):
-                    print(f"\n=== Schedule for: {task_date} ===")
+                if not staff_view:
+                    print(f"\n=== Schedule for: {format_date(task_date)} ===")
                 current_status = None
 
             if task_status != current_status:
@@ -360,6 +447,22 @@ class Interface:
             print(f"Cannot schedule tasks: {e}\n")
 
 
+    def schedule_horizon(self, start: str, days: int, kinds=ZooSystem.TASK_KINDS):
+        """ Creates automatic tasks for every day of a date range and displays a report to the user.
+            Parameters:
+                - start: string
+                    The first date of the range.
+                - days: integer
+                    The number of days to schedule.
+                - kinds: iterable of strings (optional)
+                    The task types to create ('Feeding', 'Cleaning' and/or 'Treatment')."""
+        try:
+            added = self.__system.schedule_horizon(start, days, kinds)
+        except (TypeError, ValueError, InvalidDateError, InvalidTaskTypeError) as e:
+            print(f"Cannot create schedule: {e}\n")
+            return
+        print(f"Created {len(added)} task(s) over {days} day(s) starting {start}\n")
+
     def create_task_manually(self, task_type:str, enclosure_id = None, animal_names:list = None, date = None):
         """ Creates a new task object manually and displays a confirmation message to the user.
             Parameters:
@@ -377,6 +480,33 @@ class Interface:
         except IncompleteTaskError as e:
             print(f"Cannot create task: {e}\n")
 
+    def create_recurring_task(self, task_type: str, start: str, every: int = 1, end: str = None,
+                              enclosure_id: str = None, animal_names=None, staff_id: str = None):
+        """ Creates a recurring task template and displays a confirmation message to the user.
+            Parameters:
+                - task_type: string
+                    The task type to repeat ('Feeding', 'Cleaning' or 'Treatment').
+                - start: string
+                    The date of the first occurrence.
+                - every: integer (optional)
+                    The number of days between occurrences.
+                - end: string (optional)
+                    The last date an occurrence may fall on.
+                - enclosure_id: string (optional)
+                    The enclosure id associated with the task.
+                - animal_names: list or string (optional)
+                    The animal names for feeding tasks, or the animal name for a treatment.
+                - staff_id: string (optional)
+                    The staff member the tasks are assigned to."""
+        try:
+            template = self.__system.add_recurring_task(task_type, start, every, end, enclosure_id, animal_names,
+                                                        staff_id)
+            print(f"Recurring Task Created Successfully!\n{template}")
+        except (IncompleteTaskError, InvalidTaskTypeError, InvalidDateError, InvalidStaffRoleError,
+                InvalidTaskAssignmentError, NoSuchEnclosureError, NoSuchAnimalError, NoSuchStaffError,
+                TypeError, ValueError) as e:
+            print(f"Cannot create recurring task: {e}\n")
+
     def assign_task (self, staff_id, task_id):
         """ Assigns task to staff
             Parameters:
@@ -400,6 +530,22 @@ class Interface:
         except NoSuchTaskError as e:
             print(f"Cannot assign task: {e}\n")
 
+    def auto_assign_tasks(self, date: str = None):
+        """ Assigns a date's unassigned tasks to eligible staff members and displays a summary to the user.
+            Parameters:
+                - date: string (optional)
+                    The date of tasks to assign."""
+        try:
+            assignments, unassigned = self.__system.auto_assign_tasks(date)
+        except InvalidDateError as e:
+            print(f"Cannot assign tasks: {e}\n")
+            return
+
+        print(f"Assigned {len(assignments)} task(s).")
+        if unassigned:
+            print(f"No eligible staff for: {', '.join(unassigned)}")
+        print()
+
     def complete_task(self, staff_id, task_id):
         """ Represents a staff member marking a task as complete in the system.
         Parameters:
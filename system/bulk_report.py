@@ -0,0 +1,68 @@
+'''
+File: bulk_report.py
+Description: This module defines the BulkReport class returned by the zoo system's bulk intake methods.
+             A BulkReport records which objects were added and which input rows were rejected, and why.
+'''
+
+
+class BulkReport:
+    """ A class representing the outcome of a bulk intake operation.
+        It stores the objects that were committed to the zoo system and the errors raised by rejected rows. """
+
+    def __init__(self, kind: str):
+        """ Creates an empty BulkReport object.
+            Parameters:
+                - kind: string
+                    A plural description of the objects being added, e.g. 'animals'."""
+        self.__kind = kind
+        self.__added = []
+        self.__errors = []
+        self.__committed = False
+
+    def __str__(self):
+        """ Returns a formatted summary of the bulk operation, listing each rejected row. """
+        lines = [self.summary()]
+        for row, label, error in self.__errors:
+            lines.append(f"  Row {row} ({label}): {error}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"BulkReport({self.__kind}: {len(self.__added)} added, {len(self.__errors)} errors)"
+
+    @property
+    def added(self):
+        """ Returns the list of objects added to the zoo system. """
+        return self.__added
+    @property
+    def errors(self):
+        """ Returns the list of (row number, row label, exception) tuples for rejected rows. """
+        return self.__errors
+    @property
+    def committed(self):
+        """ Returns True if the batch was committed to the zoo system. """
+        return self.__committed
+    @committed.setter
+    def committed(self, committed: bool):
+        """ Sets whether the batch was committed to the zoo system. """
+        self.__committed = committed
+    @property
+    def ok(self):
+        """ Returns True if no rows were rejected. """
+        return not self.__errors
+
+    def add_error(self, row: int, label, error: Exception):
+        """ Records a rejected input row.
+            Parameters:
+                - row: integer
+                    The zero-based position of the row in the input.
+                - label: string
+                    A short identifier for the row, e.g. the animal's name.
+                - error: Exception
+                    The exception raised while validating the row."""
+        self.__errors.append((row, label, error))
+
+    def summary(self):
+        """ Returns a one line summary of the bulk operation. """
+        if not self.__committed:
+            return f"No {self.__kind} added: {len(self.__errors)} row(s) rejected."
+        return f"{len(self.__added)} {self.__kind} added, {len(self.__errors)} row(s) rejected."
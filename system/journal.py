@@ -0,0 +1,455 @@
+'''
+File: journal.py
+Description: This module provides the append-only mutation journal used to make a ZooSystem durable between
+             snapshots. Each public mutating ZooSystem method is marked with the journaled decorator. Before the
+             method runs, its arguments are written and flushed to the journal as one JSON line with an
+             increasing sequence number. If the method then raises, a 'failed' record naming that sequence
+             number follows, and replay expects the call to fail again. Dates are resolved first, so 'today'
+             replays as the day it was recorded. Changes made directly to animals, enclosures and staff (hunger,
+             ailment, treatment, cleanliness, and the animal or enclosure a staff member is working on) reach the
+             journal through the zoo system's observer hooks, just after the attribute is assigned. Only the outermost call is recorded; tasks scheduled inside
+             schedule_horizon, for example, are recreated when that call is replayed.
+             To recover, load the last snapshot and replay the journal records with a higher sequence number
+             than the one stored in the snapshot. Once the journal grows past a size threshold, it is folded
+             into a fresh snapshot. The snapshot is written and the journal trimmed on a background thread, so
+             recovery time stays bounded.
+'''
+
+import functools
+import inspect
+import io
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from dates import format_date, to_date_key
+from exceptions import InvalidDateError, JournalError
+from domain.records.cleaning_task import CleaningTask
+from domain.records.feeding_task import FeedingTask
+from domain.records.treatment_task import TreatmentTask
+from system import snapshot
+
+DEFAULT_COMPACT_BYTES = 4 * 1024 * 1024
+
+# Names of the ZooSystem methods marked with journaled; replay refuses to call anything else.
+_OPERATIONS = set()
+# Fields that may be set by 'set' records, per target type.
+_SETTABLE_FIELDS = {"animal": ("hungry", "ailment", "treatment", "treated_by", "in_enclosure"), "enclosure": ("cleanliness",),
+                    "staff": ("working_animal", "working_enclosure")}
+
+
+def journaled(*date_params: str, materialise: tuple = ()):
+    """ Marks a ZooSystem method as a mutation to be recorded in the system's journal.
+        Parameters:
+            - date_params: strings
+                Names of parameters holding dates. They are resolved to DD/MM/YYYY strings before the call,
+                so relative dates such as 'today' replay as the date they were recorded on.
+            - materialise: tuple (optional)
+                Names of parameters that may be one-shot iterables or text streams. They are read in full
+                before the call so the same records can be both applied and journaled. """
+    def decorate(method):
+        signature = inspect.signature(method)
+        name = method.__name__
+        _OPERATIONS.add(name)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            journal = self.journal
+            if journal is None or not journal.recording:
+                return method(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            arguments = dict(bound.arguments)
+            del arguments["self"]
+            for param in date_params:
+                arguments[param] = _resolve_date(arguments.get(param))
+            for param, value in arguments.items():
+                # One-shot iterators would be used up by encoding, so they are read into lists first.
+                if param in materialise or hasattr(value, "__next__"):
+                    arguments[param] = _materialise(value)
+            # Encoded before the call, as the method may modify objects passed to it (e.g. assigning a task).
+            try:
+                record = _encode(arguments)
+            except TypeError:
+                record = None
+
+            with journal.mutation():
+                if record is not None:
+                    seq = journal.record(name, record)
+                    try:
+                        return method(self, **arguments)
+                    except Exception:
+                        journal.record_failure(seq)
+                        raise
+                result = method(self, **arguments)
+            # Arguments the journal cannot encode never change what the call does. A call that succeeds with
+            # them is made durable by folding the system into a fresh snapshot instead.
+            journal.compact()
+            return result
+        return wrapper
+    return decorate
+
+
+def _resolve_date(value):
+    """ Returns a date argument as a DD/MM/YYYY string. Invalid values are left for the method to reject. """
+    if value is None:
+        return None
+    try:
+        return format_date(to_date_key(value))
+    except (TypeError, ValueError, InvalidDateError):
+        return value
+
+
+def _materialise(value):
+    """ Reads a text stream into a fresh StringIO, or a one-shot iterable into a list. """
+    if hasattr(value, "read"):
+        return io.StringIO(value.read())
+    if value is not None and not isinstance(value, (list, tuple, dict, str)):
+        return list(value)
+    return value
+
+
+def _encode(value):
+    """ Converts an argument into a JSON compatible value. Tuples, sets and dictionaries that JSON cannot hold
+        as they are are tagged so _decode rebuilds the same type. Raises TypeError for values it cannot encode. """
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(item) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        return {"__frozenset__" if isinstance(value, frozenset) else "__set__": [_encode(item) for item in value]}
+    if isinstance(value, dict):
+        if all(isinstance(key, str) and not key.startswith("__") for key in value):
+            return {key: _encode(item) for key, item in value.items()}
+        return {"__items__": [[_encode(key), _encode(item)] for key, item in value.items()]}
+    if isinstance(value, io.StringIO):
+        return {"__stream__": value.getvalue()}
+    if isinstance(value, (CleaningTask, FeedingTask, TreatmentTask)):
+        return {"__task__": value.type, "enclosure_id": value.enclosure_id, "animal_id": value.animal_id,
+                "animals": getattr(value, "animals", None), "date": value.date}
+    if hasattr(value, "__iter__"):
+        # Other iterables (ranges, dictionary views, ...) are recorded as the items they hold.
+        return [_encode(item) for item in value]
+    raise TypeError(f"Cannot journal a value of type {type(value).__name__}")
+
+
+def _decode(value):
+    """ Rebuilds an argument value encoded by _encode. """
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "__stream__" in value:
+        return io.StringIO(value["__stream__"])
+    if "__tuple__" in value:
+        return tuple(_decode(item) for item in value["__tuple__"])
+    if "__set__" in value:
+        return {_decode(item) for item in value["__set__"]}
+    if "__frozenset__" in value:
+        return frozenset(_decode(item) for item in value["__frozenset__"])
+    if "__items__" in value:
+        return {_decode(key): _decode(item) for key, item in value["__items__"]}
+    if "__task__" in value:
+        date = value["date"]
+        if value["__task__"] == "Feeding":
+            return FeedingTask(value["enclosure_id"], value["animals"], date)
+        if value["__task__"] == "Cleaning":
+            return CleaningTask(value["enclosure_id"], date)
+        return TreatmentTask(value["animal_id"], date)
+    return {key: _decode(item) for key, item in value.items()}
+
+
+class Journal:
+    """ A class representing the write-ahead journal of a ZooSystem object.
+        It appends one JSON line per mutation, fsyncs in configurable batches, replays the records missing from
+        the last snapshot, and compacts itself into a fresh snapshot once it grows past a size threshold. """
+
+    def __init__(self, system, path: str, snapshot_path: str, sync_every: int = 1,
+                 compact_bytes: int = DEFAULT_COMPACT_BYTES):
+        """ Opens (or creates) a journal file and attaches it to a zoo system.
+            A record left half-written by a crash at the end of the file is discarded.
+            Parameters:
+                - system: ZooSystem
+                    The zoo system whose mutations are recorded.
+                - path: string
+                    The journal file.
+                - snapshot_path: string
+                    The snapshot file written by compaction.
+                - sync_every: integer (optional)
+                    The number of records written between fsync calls. 1 syncs every record; 0 leaves
+                    syncing to sync() and close().
+                - compact_bytes: integer (optional)
+                    The journal size in bytes that triggers compaction, or None to compact only on request."""
+
+        if not isinstance(sync_every, int) or sync_every < 0:
+            raise ValueError("sync_every must be a non-negative integer")
+        if compact_bytes is not None and (not isinstance(compact_bytes, int) or compact_bytes < 1):
+            raise ValueError("compact_bytes must be a positive integer or None")
+        if system.journal is not None:
+            raise JournalError("The zoo system already has a journal attached")
+
+        self.__system = system
+        self.__path = path
+        self.__snapshot_path = snapshot_path
+        self.__sync_every = sync_every
+        self.__compact_bytes = compact_bytes
+        self.__lock = threading.RLock()
+        # Nesting depth of journaled calls per thread; only calls made at depth 0 are recorded.
+        self.__local = threading.local()
+        self.__unsynced = 0
+        self.__compactor = None
+        self.__compaction_error = None
+
+        records = self.__read_records()
+        last_seq = records[-1]["seq"] if records else 0
+        self.__seq = max(system.journal_seq, last_seq)
+        self.__file = open(path, "ab")
+        system.journal = self
+
+    def __repr__(self):
+        return f"Journal({self.__path!r}, seq={self.__seq})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    @property
+    def seq(self):
+        """ Returns the sequence number of the last record written. """
+        return self.__seq
+    @property
+    def size(self):
+        """ Returns the current size of the journal file in bytes. """
+        with self.__lock:
+            return self.__file.tell()
+    @property
+    def recording(self):
+        """ Returns True if a mutation made now on the calling thread would be recorded. Calls made inside
+            another journaled call, or during replay, are not. """
+        return getattr(self.__local, "depth", 0) == 0
+
+    @contextmanager
+    def mutation(self):
+        """ Holds the journal lock for the duration of a journaled call and suppresses nested records. """
+        with self.__lock:
+            self.__local.depth = getattr(self.__local, "depth", 0) + 1
+            try:
+                yield
+            finally:
+                self.__local.depth -= 1
+        self.__maybe_compact()
+
+    def record(self, op: str, arguments: dict) -> int:
+        """ Appends the record of a ZooSystem method call that is about to run.
+            Parameters:
+                - op: string
+                    The name of the method.
+                - arguments: dictionary
+                    The JSON encoded arguments of the call, by parameter name.
+            Returns:
+                - seq: integer
+                    The sequence number of the record."""
+        with self.__lock:
+            self.__write({"op": op, "args": arguments})
+            return self.__seq
+
+    def record_failure(self, seq: int):
+        """ Appends a record marking an earlier recorded call as having raised an exception.
+            Parameters:
+                - seq: integer
+                    The sequence number of the failed call's record."""
+        with self.__lock:
+            self.__write({"op": "failed", "ref": seq})
+
+    def record_change(self, target: str, target_id: str, field: str, value):
+        """ Appends the record of a change made directly to an animal, enclosure or staff object. Changes made
+            while a journaled call is running are part of that call and are not recorded separately.
+            Parameters:
+                - target: string
+                    'animal', 'enclosure' or 'staff'.
+                - target_id: string
+                    The animal name, enclosure id or staff id.
+                - field: string
+                    The attribute that changed.
+                - value: any
+                    The new value of the attribute."""
+        if not self.recording:
+            return
+        with self.__lock:
+            self.__write({"op": "set", "target": target, "id": target_id, "field": field, "value": value})
+        self.__maybe_compact()
+
+    def __write(self, record: dict):
+        """ Numbers a record and appends it to the journal file as one JSON line. The sequence number only
+            advances once the line has been written. """
+        seq = self.__seq + 1
+        line = json.dumps({"seq": seq, **record}, separators=(",", ":"))
+        self.__file.write(line.encode("utf-8") + b"\n")
+        self.__file.flush()
+        self.__seq = seq
+        self.__system.journal_seq = seq
+        self.__unsynced += 1
+        if self.__sync_every and self.__unsynced >= self.__sync_every:
+            self.sync()
+
+    def sync(self):
+        """ Forces every record written so far onto disk. """
+        with self.__lock:
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+            self.__unsynced = 0
+
+    def __read_records(self):
+        """ Returns every record in the journal file. A half-written final line is cut off the file. """
+        if not os.path.exists(self.__path):
+            return []
+        with open(self.__path, "rb") as file:
+            lines = file.read().split(b"\n")
+
+        records = []
+        intact = 0
+        # The text after the last newline is either empty or a record the writer never finished.
+        for number, line in enumerate(lines[:-1], start=1):
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                if number < len(lines) - 1:
+                    raise JournalError(f"Journal record on line {number} is corrupt")
+                break
+            intact += len(line) + 1
+        if intact != os.path.getsize(self.__path):
+            os.truncate(self.__path, intact)
+        return records
+
+    def replay(self):
+        """ Applies every journal record not already contained in the zoo system, in sequence order.
+            Calls that raised when they were recorded are replayed too, so any changes they made before failing
+            are repeated, and must raise again. The final record may belong to a call that was still running
+            when the process stopped; it is kept if it succeeds and ignored if it raises.
+            Returns:
+                - count: integer
+                    The number of records applied. """
+        system = self.__system
+        count = 0
+        with self.mutation():
+            self.__file.flush()
+            records = self.__read_records()
+            failed = {record["ref"] for record in records if record["op"] == "failed"}
+            for number, record in enumerate(records, start=1):
+                seq = record["seq"]
+                if seq <= system.journal_seq:
+                    continue
+                if record["op"] != "failed":
+                    try:
+                        self.__apply(record)
+                    except JournalError:
+                        raise
+                    except Exception as e:
+                        if seq not in failed and number < len(records):
+                            raise JournalError(f"Cannot replay journal record {seq} ({record['op']}): {e}") from e
+                    else:
+                        if seq in failed:
+                            raise JournalError(f"Journal record {seq} ({record['op']}) failed when recorded but "
+                                               "succeeded on replay")
+                    count += 1
+                system.journal_seq = seq
+        return count
+
+    def __apply(self, record: dict):
+        """ Applies one journal record to the zoo system. """
+        system = self.__system
+        op = record["op"]
+        if op == "set":
+            if record["field"] not in _SETTABLE_FIELDS.get(record["target"], ()):
+                raise JournalError(f"Cannot set {record['target']}.{record['field']}")
+            value = record["value"]
+            if record["target"] == "animal":
+                target = system.get_animal(record["id"])
+            elif record["target"] == "enclosure":
+                target = system.get_enclosure(record["id"])
+            else:
+                target = system.get_staff(record["id"])
+                # Staff work on animal and enclosure objects, which are recorded by name and id.
+                if value is not None:
+                    value = system.get_animal(value) if record["field"] == "working_animal" \
+                        else system.get_enclosure(value)
+            setattr(target, record["field"], value)
+        elif op in _OPERATIONS:
+            getattr(system, op)(**_decode(record["args"]))
+        else:
+            raise JournalError(f"Unknown journal operation: {op}")
+
+    def __maybe_compact(self):
+        """ Starts a background compaction if the journal has crossed its size threshold. """
+        if self.__compact_bytes is None or self.size < self.__compact_bytes:
+            return
+        if self.__compactor is not None and self.__compactor.is_alive():
+            return
+        self.compact(background=True)
+
+    def compact(self, background: bool = False):
+        """ Folds the journal into a fresh snapshot and removes the records the snapshot contains.
+            The snapshot is serialised straight away, so it matches the system exactly as it is now. Writing
+            it to disk and trimming the journal can then run on a background thread while mutations continue.
+            Parameters:
+                - background: boolean (optional)
+                    If True, returns as soon as the snapshot has been serialised."""
+        self.wait()
+        with self.__lock:
+            data = snapshot.dumps(self.__system)
+            offset = self.__file.tell()
+        if background:
+            self.__compactor = threading.Thread(target=self.__finish_compaction, args=(data, offset),
+                                                name="zoo-journal-compaction", daemon=True)
+            self.__compactor.start()
+        else:
+            self.__finish_compaction(data, offset)
+
+    def __finish_compaction(self, data: bytes, offset: int):
+        """ Writes the snapshot, then rewrites the journal keeping only the records appended after offset.
+            If the process stops between the two steps, replay skips the records the snapshot already holds. """
+        try:
+            snapshot.write(data, self.__snapshot_path)
+            with self.__lock:
+                self.__file.flush()
+                with open(self.__path, "rb") as file:
+                    file.seek(offset)
+                    tail = file.read()
+                temp_path = f"{self.__path}.tmp"
+                with open(temp_path, "wb") as file:
+                    file.write(tail)
+                    file.flush()
+                    os.fsync(file.fileno())
+                self.__file.close()
+                os.replace(temp_path, self.__path)
+                self.__file = open(self.__path, "ab")
+                self.__unsynced = 0
+        except OSError as e:
+            if threading.current_thread() is not self.__compactor:
+                raise
+            # Raised from wait() on the thread that owns the journal.
+            self.__compaction_error = e
+
+    def wait(self):
+        """ Waits for a running background compaction to finish, raising JournalError if it failed. """
+        compactor = self.__compactor
+        if compactor is not None and compactor is not threading.current_thread():
+            compactor.join()
+        if self.__compaction_error is not None:
+            error, self.__compaction_error = self.__compaction_error, None
+            raise JournalError(f"Journal compaction failed: {error}") from error
+
+    def close(self):
+        """ Waits for compaction, syncs the journal to disk and detaches it from the zoo system. """
+        self.wait()
+        with self.__lock:
+            if self.__file.closed:
+                return
+            self.sync()
+            self.__file.close()
+            self.__system.journal = None
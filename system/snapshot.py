@@ -0,0 +1,140 @@
+'''
+File: snapshot.py
+Description: This module saves and loads complete ZooSystem snapshots. A snapshot is a short header (magic bytes and
+             a format version) followed by a pickle of the ZooSystem object graph. Every animal, enclosure, staff
+             member, task and string is written once; later references to it are encoded as integer memo ids.
+             Shared species records are written as catalog references and re-interned on load. Loading uses a
+             restricted unpickler that can only create the zoo's own classes and a few builtin containers.
+'''
+
+import gc
+import io
+import os
+import pickle
+import struct
+from collections import OrderedDict, defaultdict
+
+from exceptions import SnapshotError
+from domain.animals.animal_bird import Bird
+from domain.animals.animal_mammal import Mammal
+from domain.animals.animal_reptile import Reptile
+from domain.enclosures.enclosure import Enclosure
+from domain.ordered_set import OrderedSet
+from domain.records.cleaning_task import CleaningTask
+from domain.records.feeding_task import FeedingTask
+from domain.records.health_entry import Entry
+from domain.records.recurring_task import RecurringTask
+from domain.records.treatment_task import TreatmentTask
+from domain.staff.staff import Staff
+from domain.staff.staff_keeper import Keeper
+from domain.staff.staff_veterinarian import Veterinarian
+from zoodata.zoo_data import SpeciesRecord, intern_species_record
+
+MAGIC = b"ZOOSNAP"
+VERSION = 1
+HEADER = struct.Struct("<7sH")
+
+_ALLOWED_CLASSES = (Mammal, Bird, Reptile, Enclosure, OrderedSet, Staff, Keeper, Veterinarian, CleaningTask,
+                    FeedingTask, TreatmentTask, RecurringTask, Entry, OrderedDict, defaultdict)
+_ALLOWED_GLOBALS = {(cls.__module__, cls.__qualname__): cls for cls in _ALLOWED_CLASSES}
+_ALLOWED_GLOBALS.update({
+    ("builtins", "set"): set,
+    ("builtins", "frozenset"): frozenset,
+    ("builtins", "dict"): dict,
+    ("builtins", "list"): list,
+    ("zoodata.zoo_data", "intern_species_record"): intern_species_record,
+})
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """ A pickler that writes species records as calls to intern_species_record. """
+
+    def reducer_override(self, obj):
+        if type(obj) is SpeciesRecord:
+            return intern_species_record, (obj.species, obj.enclosure, obj.diet, obj.sound)
+        return NotImplemented
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """ An unpickler that refuses to load anything other than the zoo system's own classes. """
+
+    def find_class(self, module, name):
+        if (module, name) == ("system.zoo_system", "ZooSystem"):
+            # Imported here to avoid a circular import with system.zoo_system.
+            from system.zoo_system import ZooSystem
+            return ZooSystem
+        cls = _ALLOWED_GLOBALS.get((module, name))
+        if cls is None:
+            raise SnapshotError(f"Snapshot refers to a forbidden object: {module}.{name}")
+        return cls
+
+
+def dumps(system) -> bytes:
+    """ Serialises a ZooSystem object into snapshot bytes.
+        Parameters:
+            - system: ZooSystem
+                The zoo system to serialise.
+        Returns:
+            - data: bytes
+                The versioned snapshot. """
+    buffer = io.BytesIO()
+    buffer.write(HEADER.pack(MAGIC, VERSION))
+    _SnapshotPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(system)
+    return buffer.getvalue()
+
+
+def loads(data: bytes):
+    """ Rebuilds a ZooSystem object from snapshot bytes.
+        Parameters:
+            - data: bytes
+                The versioned snapshot produced by dumps.
+        Returns:
+            - system: ZooSystem
+                The restored zoo system. """
+    if len(data) < HEADER.size:
+        raise SnapshotError("Snapshot is truncated")
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("Not a zoo system snapshot")
+    if version != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version} (expected {VERSION})")
+
+    from system.zoo_system import ZooSystem
+
+    unpickler = _SnapshotUnpickler(io.BytesIO(memoryview(data)[HEADER.size:]))
+    # Loading creates hundreds of thousands of container objects and none of them are garbage, so the cyclic
+    # collector is paused; otherwise its repeated full passes over the growing graph dominate the load time.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        system = unpickler.load()
+    except (pickle.UnpicklingError, EOFError, AttributeError, TypeError, ValueError) as e:
+        raise SnapshotError(f"Snapshot is corrupt: {e}")
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if not isinstance(system, ZooSystem):
+        raise SnapshotError("Snapshot does not contain a zoo system")
+    return system
+
+
+def save(system, path: str):
+    """ Writes a snapshot of a ZooSystem object to a file. The file is replaced atomically, so a crash while
+        saving leaves the previous snapshot intact. """
+    write(dumps(system), path)
+
+
+def write(data: bytes, path: str):
+    """ Atomically writes snapshot bytes produced by dumps to a file. """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def load(path: str):
+    """ Reads a ZooSystem object from a snapshot file. """
+    with open(path, "rb") as file:
+        return loads(file.read())
@@ -0,0 +1,351 @@
+'''
+File: sqlite_store.py
+Description: This module provides an optional SQLite store for the zoo system, using the standard library sqlite3
+             module with a local database file or ':memory:'. SqliteStore.save writes the animals, enclosures,
+             staff, keeper and veterinarian assignments, scheduled tasks, recurring task templates and health
+             entries of a ZooSystem into indexed tables, in one transaction. The store then answers schedule and
+             health record queries with indexed SQL instead of Python scans. Its query methods take the same
+             arguments and return the same shapes as the matching ZooSystem methods.
+             The store is a read mirror, not a backing store: the ZooSystem object remains the source of truth
+             and the store is brought up to date by saving again. The first save on a connection rewrites every
+             table; later saves write only the rows added, changed or removed since the previous save.
+             iter_tasks returns the tasks stored in the schedule; occurrences of recurring templates are not
+             expanded, but the templates themselves are returned by get_recurring_tasks.
+'''
+
+import json
+import sqlite3
+from collections import namedtuple
+
+from dates import UNSCHEDULED, format_date, to_date_key
+from exceptions import NoSuchAnimalError
+from domain.records.health_entry import Entry
+from domain.records.recurring_task import RecurringTask
+
+# Read-only view of a stored task, with the same attribute names as the Task classes.
+TaskRecord = namedtuple("TaskRecord", ["id", "type", "date", "enclosure_id", "animal_id", "animals", "assigned_to",
+                                       "complete"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS enclosures (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    cleanliness INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS animals (
+    name TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    species TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    enclosure_id TEXT,
+    hungry INTEGER NOT NULL,
+    ailment INTEGER NOT NULL,
+    treated_by TEXT
+);
+CREATE TABLE IF NOT EXISTS staff (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    gender TEXT NOT NULL,
+    birthday TEXT NOT NULL,
+    role TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    date_key INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    assigned_to TEXT,
+    enclosure_id TEXT,
+    animal_id TEXT,
+    animals TEXT,
+    PRIMARY KEY (date_key, slot)
+);
+CREATE TABLE IF NOT EXISTS recurring_tasks (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    start_key INTEGER NOT NULL,
+    every INTEGER NOT NULL,
+    end_key INTEGER,
+    enclosure_id TEXT,
+    animal_names TEXT,
+    staff_id TEXT
+);
+CREATE TABLE IF NOT EXISTS keeper_enclosures (
+    staff_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    enclosure_id TEXT NOT NULL,
+    PRIMARY KEY (staff_id, position)
+);
+CREATE TABLE IF NOT EXISTS vet_animals (
+    staff_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    animal_name TEXT NOT NULL,
+    PRIMARY KEY (staff_id, position)
+);
+CREATE TABLE IF NOT EXISTS health_entries (
+    animal_name TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    date_key INTEGER NOT NULL,
+    issue TEXT NOT NULL,
+    details TEXT NOT NULL,
+    severity INTEGER NOT NULL,
+    treatment TEXT NOT NULL,
+    PRIMARY KEY (animal_name, number)
+);
+CREATE INDEX IF NOT EXISTS animals_by_enclosure ON animals (enclosure_id);
+CREATE INDEX IF NOT EXISTS staff_by_name ON staff (name);
+CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (status, date_key);
+CREATE INDEX IF NOT EXISTS tasks_by_assignee ON tasks (assigned_to, date_key);
+CREATE INDEX IF NOT EXISTS tasks_by_enclosure ON tasks (enclosure_id);
+CREATE INDEX IF NOT EXISTS health_by_severity ON health_entries (severity, date_key);
+"""
+
+# The primary key columns of each table, which are also the leading columns of its rows.
+KEYS = {
+    "enclosures": ("id",),
+    "animals": ("name",),
+    "staff": ("id",),
+    "keeper_enclosures": ("staff_id", "position"),
+    "vet_animals": ("staff_id", "position"),
+    "tasks": ("date_key", "slot"),
+    "recurring_tasks": ("id",),
+    "health_entries": ("animal_name", "number"),
+}
+TABLES = tuple(KEYS)
+
+
+class SqliteStore:
+    """ A class representing a SQLite database holding a copy of a zoo system's data.
+        It writes the registries, schedule and health records of a ZooSystem object into indexed tables and
+        runs schedule and health record queries against them. """
+
+    def __init__(self, path: str = ":memory:"):
+        """ Opens (or creates) a SQLite store.
+            Parameters:
+                - path: string (optional)
+                    The database file, or ':memory:' for a private in-memory database."""
+        self.__path = path
+        self.__connection = sqlite3.connect(path)
+        self.__connection.executescript(SCHEMA)
+        # The rows written by the last save (table -> primary key -> row), or None before the first save.
+        self.__saved = None
+
+    def __repr__(self):
+        return f"SqliteStore({self.__path!r})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    @property
+    def path(self):
+        return self.__path
+
+    def close(self):
+        """ Closes the database connection. """
+        self.__connection.close()
+
+    def save(self, system):
+        """ Brings the store up to date with the current state of a zoo system, in one transaction.
+            The first save on a connection replaces the contents of every table. Later saves compare the
+            system with the rows written last time, and only insert, update or delete the rows that differ.
+            Parameters:
+                - system: ZooSystem
+                    The zoo system to copy into the store."""
+        tables = self.__rows(system)
+        with self.__connection as connection:
+            for table, rows in tables.items():
+                previous = self.__saved.get(table) if self.__saved is not None else None
+                if previous is None:
+                    connection.execute(f"DELETE FROM {table}")
+                    changed = rows.values()
+                else:
+                    removed = [key for key in previous if key not in rows]
+                    where = " AND ".join(f"{column} = ?" for column in KEYS[table])
+                    connection.executemany(f"DELETE FROM {table} WHERE {where}", removed)
+                    changed = [row for key, row in rows.items() if previous.get(key) != row]
+                if changed:
+                    connection.executemany(self.__upsert(table), changed)
+        self.__saved = tables
+
+    def __upsert(self, table: str) -> str:
+        """ Returns the statement inserting a row into a table, or updating the row with the same key in place.
+            Updating in place keeps the rowid, and with it the order rows were first saved in. """
+        columns = [row[1] for row in self.__connection.execute(f"PRAGMA table_info({table})")]
+        keys = KEYS[table]
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column not in keys)
+        return (f"INSERT INTO {table} VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}")
+
+    @staticmethod
+    def __rows(system):
+        """ Returns the rows of every table for a zoo system, as dictionaries from primary key to row. """
+        def keyed(table, rows):
+            width = len(KEYS[table])
+            return {row[:width]: row for row in rows}
+
+        keepers = [s for s in system.staff if s.role == "Keeper"]
+        vets = [s for s in system.staff if s.role == "Veterinarian"]
+        return {
+            "enclosures": keyed("enclosures", ((e.id, e.type, e.size, e.cleanliness) for e in system.enclosures)),
+            "animals": keyed("animals", ((a.name, type(a).__name__, a.species, a.age, a.in_enclosure, a.hungry,
+                                          a.ailment, a.treated_by) for a in system.animals)),
+            "staff": keyed("staff", ((s.id, s.name, s.age, s.gender, s.birthday, s.role) for s in system.staff)),
+            "keeper_enclosures": keyed("keeper_enclosures", (
+                (s.id, position, e.id) for s in keepers for position, e in enumerate(s.assigned_enclosures))),
+            "vet_animals": keyed("vet_animals", (
+                (s.id, position, a.name) for s in vets for position, a in enumerate(s.assigned_animals))),
+            # Tasks are numbered within their date in the system's own iteration order, so ordering by date and
+            # slot reproduces it, and a change on one date leaves the rows of other dates untouched.
+            "tasks": keyed("tasks", (
+                (to_date_key(date), slot, task.id, task.type, status, task.assigned_to, task.enclosure_id,
+                 task.animal_id, json.dumps(task.animals) if task.type == "Feeding" else None)
+                for date, buckets in system.tasks_by_date.items()
+                for slot, (status, task) in enumerate((status, task) for status, groups in buckets.items()
+                                                      for tasks in groups.values() for task in tasks))),
+            "recurring_tasks": keyed("recurring_tasks", (
+                (r.id, r.type, r.start, r.every, r.end, r.enclosure_id, json.dumps(r.animal_names), r.staff_id)
+                for r in system.recurring_tasks)),
+            "health_entries": keyed("health_entries", (
+                (name, number, entry.date_key, entry.issue, entry.details, entry.severity, entry.treatment)
+                for name, entries in system.health_records.items() for number, entry in enumerate(entries))),
+        }
+
+    def count(self, table: str) -> int:
+        """ Returns the number of rows stored in one of the store's tables. """
+        if table not in TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        return self.__connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def iter_tasks(self, date: str = None, status: str = None, assigned: bool = None, staff_id: str = None,
+                   start: str = None, end: str = None):
+        """ Iterates through the stored tasks matching the filters, using the date and assignee indexes.
+            Tasks are yielded in the same order as ZooSystem.iter_tasks: chronologically, unscheduled last.
+            Parameters:
+                - date: string (optional)
+                    The date for filtering tasks.
+                - status: string (optional)
+                    The task status for filtering ('uncompleted' or 'completed').
+                - assigned: bool (optional)
+                    Whether to filter tasks by assignment state.
+                - staff_id: string (optional)
+                    The staff id to filter tasks by assigned staff member.
+                - start: string (optional)
+                    The first date of a date range to filter by, inclusive. Ignored when date is given.
+                - end: string (optional)
+                    The last date of a date range to filter by, inclusive. Ignored when date is given.
+            Returns:
+                - generator: yields tuples containing ordinal date key, status, assignment group, and TaskRecord. """
+
+        conditions = []
+        values = []
+        if date:
+            conditions.append("date_key = ?")
+            values.append(to_date_key(date))
+        elif start is not None or end is not None:
+            conditions.append("date_key != ?")
+            values.append(UNSCHEDULED)
+            if start is not None:
+                conditions.append("date_key >= ?")
+                values.append(to_date_key(start))
+            if end is not None:
+                conditions.append("date_key <= ?")
+                values.append(to_date_key(end))
+        if status:
+            conditions.append("status = ?")
+            values.append(status)
+        if staff_id is not None:
+            conditions.append("assigned_to = ?")
+            values.append(staff_id)
+        if assigned is not None:
+            conditions.append("assigned_to IS NOT NULL" if assigned else "assigned_to IS NULL")
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.__connection.execute(
+            "SELECT id, type, date_key, status, assigned_to, enclosure_id, animal_id, animals "
+            f"FROM tasks {where} ORDER BY date_key = {UNSCHEDULED}, date_key, slot", values)
+        for task_id, task_type, date_key, status, assigned_to, enclosure_id, animal_id, animals in rows:
+            task = TaskRecord(task_id, task_type, format_date(date_key), enclosure_id, animal_id,
+                              json.loads(animals) if animals is not None else [], assigned_to,
+                              status == "completed")
+            yield date_key, status, assigned_to if assigned_to is not None else "UNASSIGNED", task
+
+    def get_animal_health_record(self, animal_name: str):
+        """ Retrieves the stored health record entries of an animal, in chronological order.
+            Parameters:
+                - animal_name: string
+                    The name of the animal whose health records are being requested.
+            Returns:
+                - records: list[Entry]
+                    A list of Entry objects representing the animal's health history."""
+
+        if not isinstance(animal_name, str):
+            raise TypeError("Animal name must be a string")
+
+        rows = self.__connection.execute(
+            "SELECT date_key, issue, details, severity, treatment FROM health_entries "
+            "WHERE animal_name = ? ORDER BY date_key, number", (animal_name,)).fetchall()
+        if not rows:
+            raise NoSuchAnimalError(f"No health records exist for {animal_name}")
+        return [Entry(*row) for row in rows]
+
+    def iter_health_entries(self, min_severity: int = 0, start: str = None, end: str = None):
+        """ Iterates through the health entries of all animals at or above a severity, using the severity index.
+            Parameters:
+                - min_severity: integer (optional)
+                    The lowest severity (0-3) to include.
+                - start: string (optional)
+                    The first date to include.
+                - end: string (optional)
+                    The last date to include.
+            Returns:
+                - generator: yields (animal name, Entry) tuples in chronological order. """
+
+        if not isinstance(min_severity, int):
+            raise TypeError("min_severity must be an integer")
+
+        conditions = ["severity >= ?"]
+        values = [min_severity]
+        if start is not None:
+            conditions.append("date_key >= ?")
+            values.append(to_date_key(start))
+        if end is not None:
+            conditions.append("date_key <= ?")
+            values.append(to_date_key(end))
+        rows = self.__connection.execute(
+            "SELECT animal_name, date_key, issue, details, severity, treatment FROM health_entries "
+            f"WHERE {' AND '.join(conditions)} ORDER BY date_key, animal_name, number", values)
+        for animal_name, *entry in rows:
+            yield animal_name, Entry(*entry)
+
+    def get_animal_names_in_enclosure(self, enclosure_id: str):
+        """ Returns the names of the stored animals housed in an enclosure, using the enclosure index. """
+        rows = self.__connection.execute("SELECT name FROM animals WHERE enclosure_id = ? ORDER BY rowid",
+                                         (enclosure_id,))
+        return [name for (name,) in rows]
+
+    def get_keeper_enclosure_ids(self, staff_id: str):
+        """ Returns the ids of the enclosures a stored keeper is assigned to, in assignment order. """
+        rows = self.__connection.execute("SELECT enclosure_id FROM keeper_enclosures WHERE staff_id = ? "
+                                         "ORDER BY position", (staff_id,))
+        return [enclosure_id for (enclosure_id,) in rows]
+
+    def get_vet_animal_names(self, staff_id: str):
+        """ Returns the names of the animals a stored veterinarian is assigned to, in assignment order. """
+        rows = self.__connection.execute("SELECT animal_name FROM vet_animals WHERE staff_id = ? "
+                                         "ORDER BY position", (staff_id,))
+        return [animal_name for (animal_name,) in rows]
+
+    def get_recurring_tasks(self):
+        """ Returns the stored recurring task templates as RecurringTask objects, in creation order. """
+        rows = self.__connection.execute(
+            "SELECT id, type, start_key, every, end_key, enclosure_id, animal_names, staff_id "
+            "FROM recurring_tasks ORDER BY rowid")
+        return [RecurringTask(template_id, task_type, start, every, end, enclosure_id, json.loads(animal_names),
+                              staff_id)
+                for template_id, task_type, start, every, end, enclosure_id, animal_names, staff_id in rows]
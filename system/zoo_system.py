@@ -13,7 +13,17 @@ from collections import defaultdict
 from exceptions import *
 from domain.records.feeding_task import FeedingTask
 from domain.records.treatment_task import TreatmentTask
-from datetime import datetime
+from domain.records.recurring_task import RecurringTask
+from dates import UNSCHEDULED, format_date, to_date_key, today_key
+from domain.ordered_set import OrderedSet
+from system.bulk_report import BulkReport
+from system import snapshot
+from system.journal import DEFAULT_COMPACT_BYTES, Journal, journaled
+import bisect
+import os
+import csv
+import json
+from itertools import chain
 
 
 class ZooSystem:
@@ -22,6 +32,15 @@ class ZooSystem:
     FOOD_ITEMS = all_food_items
     ANIMALS = animals
     ENCLOSURES = all_enclosures
+    SPECIES_CATALOG = species_catalog
+    ENCLOSURE_TYPES = enclosure_types
+    ANIMAL_CLASSES = {'Mammal': Mammal, 'Bird': Bird, 'Reptile': Reptile}
+    CLEANLINESS_LEVELS = 6
+    STAFF_CLASSES = {None: Staff, 'keeper': Keeper, 'veterinarian': Veterinarian}
+    STAFF_FIELDS = ("name", "age", "gender", "birthday", "role")
+    TASK_KINDS = ("Feeding", "Cleaning", "Treatment")
+    # Days past today (or past the range start) up to which open-ended iter_tasks ranges expand recurring tasks.
+    RECURRING_HORIZON_DAYS = 365
 
     def __init__(self, zoo_name: str):
         """ Creates a ZooSystem object and initialises internal storage for all zoo data structures.
@@ -30,12 +49,85 @@ class ZooSystem:
                     The name of the zoo that this system represents."""
 
         self.__zoo_name = zoo_name
-        self.__enclosures = []
-        self.__animals = []
-        self.__staff = []
+        # Keyed registries (name -> Animal, id -> Enclosure, id -> Staff). Dicts keep insertion order.
+        self.__enclosures = {}
+        self.__animals = {}
+        self.__staff = {}
+        # Highest number issued per enclosure type and every enclosure id ever issued, so removed ids
+        # are never handed out again.
+        self.__enclosure_counters = {}
+        self.__issued_enclosure_ids = set()
+        # Staff id allocation: base id -> next collision number, every staff id ever issued, and
+        # (name, birthday) -> staff id for duplicate detection.
+        self.__staff_id_counters = {}
+        self.__issued_staff_ids = set()
+        self.__staff_by_identity = {}
+        # animal name -> id of the Veterinarian it is assigned to; an animal has at most one.
+        self.__vet_by_animal = {}
+        # ordinal date key -> {"uncompleted": {...}, "completed": {...}}; see dates.py for the key format.
         self.__tasks_by_date = {}
+        # Every date key in tasks_by_date, kept sorted so date ranges can be located with bisect.
+        self.__date_index = []
+        # Task ids carry the day and month but not the year, so a task is identified by its (date_key, task_id)
+        # key. key -> (date_key, state, owner_id, task), kept in step with every move inside tasks_by_date.
+        self.__task_locator = {}
+        # task_id -> {date_key: None} for every date a task with that id is scheduled on.
+        self.__task_dates_by_id = {}
+        # date_key -> set of task ids scheduled on that date (both uncompleted and completed).
+        self.__task_ids_by_date = defaultdict(set)
+        # Reverse indexes from an entity to the keys of the tasks that reference it.
+        self.__tasks_by_animal = defaultdict(dict)
+        self.__tasks_by_enclosure = defaultdict(dict)
+        self.__tasks_by_staff = defaultdict(dict)
+        # Keys of the tasks in the unassigned pool across all dates (key -> None, in insertion order).
+        self.__unassigned_tasks = {}
+        # Recurring task templates (template id -> RecurringTask), expanded only for the dates queried.
+        self.__recurring = {}
+        self.__recurring_count = 0
+        # Occurrences of recurring templates already stored in the schedule, as (template id, date key) pairs.
+        # Their generated ids are not compared, as a Feeding id changes when the template's animals change.
+        self.__materialised = set()
         self.__reported_issues = defaultdict(list)
         self.__health_records = defaultdict(list)
+        # Animals whose ailment flag is set, kept up to date by Animal.ailment through animal_ailment_changed.
+        self.__ailing = OrderedSet()
+        # enclosure_id -> hungry animals stored in that enclosure; fully fed enclosures have no entry.
+        self.__hungry_by_enclosure = {}
+        # enclosure_id -> animals whose in_enclosure refers to it, kept up to date by Animal.in_enclosure through
+        # animal_enclosure_changed.
+        self.__animals_by_enclosure = {}
+        # enclosure_id -> registration number, so enclosures found through other indexes can be put back in
+        # registry order.
+        self.__enclosure_positions = {}
+        self.__enclosure_sequence = 0
+        # Enclosures bucketed by cleanliness level 0-5, so the dirtiest can be found without a full scan.
+        self.__cleanliness_buckets = [OrderedSet() for _ in range(self.CLEANLINESS_LEVELS)]
+        # The attached write-ahead journal, and the sequence number of the last journal record applied.
+        self.__journal = None
+        self.__journal_seq = 0
+
+    def __getstate__(self):
+        """ Returns the state stored in snapshots. The attached journal holds an open file, so it is left out. """
+        state = self.__dict__.copy()
+        state["_ZooSystem__journal"] = None
+        return state
+
+    @property
+    def journal(self):
+        """ Returns the Journal object recording this system's mutations, or None. """
+        return self.__journal
+    @journal.setter
+    def journal(self, journal):
+        """ Sets the Journal object recording this system's mutations. """
+        self.__journal = journal
+    @property
+    def journal_seq(self):
+        """ Returns the sequence number of the last journal record contained in this system. """
+        return self.__journal_seq
+    @journal_seq.setter
+    def journal_seq(self, seq: int):
+        """ Sets the sequence number of the last journal record contained in this system. """
+        self.__journal_seq = seq
 
     @property
     def health_records(self):
@@ -44,23 +136,102 @@ class ZooSystem:
 
     @property
     def animals(self):
-        """ Returns the list of all animal objects stored in the zoo system. """
-        return self.__animals
+        """ Returns the list of all animal objects stored in the zoo system, in insertion order. """
+        return list(self.__animals.values())
 
     @property
     def staff(self):
-        """ Returns the list of all staff member objects in the zoo system. """
-        return self.__staff
+        """ Returns the list of all staff member objects in the zoo system, in insertion order. """
+        return list(self.__staff.values())
 
     @property
     def enclosures(self):
-        """ Returns the list of all enclosure objects stored in the zoo system. """
-        return self.__enclosures
+        """ Returns the list of all enclosure objects stored in the zoo system, in insertion order. """
+        return list(self.__enclosures.values())
 
     @property
     def tasks_by_date(self):
-        """ Returns the dictionary storing all scheduled task objects grouped by date. """
-        return self.__tasks_by_date
+        """ Returns the scheduled task objects grouped by date, keyed by DD/MM/YYYY strings for display.
+            Internally the schedule is keyed by ordinal date keys; the inner date slots are shared, not copied. """
+        return {format_date(date_key): slot for date_key, slot in self.__tasks_by_date.items()}
+
+    @staticmethod
+    def __task_animal_names(task):
+        """ Returns the names of the animals a task object refers to. """
+        if isinstance(task, FeedingTask):
+            return [name for name in task.animals if name != "All Animals"]
+        if task.animal_id is not None:
+            return [task.animal_id]
+        return []
+
+    def __index_task(self, date_key, state: str, owner_id: str, task):
+        """ Records where a task object currently lives in the schedule and which entities it refers to. """
+        self.__unindex_task(task)
+        key = (date_key, task.id)
+        self.__task_locator[key] = (date_key, state, owner_id, task)
+        self.__task_dates_by_id.setdefault(task.id, {})[date_key] = None
+        self.__task_ids_by_date[date_key].add(task.id)
+
+        for name in self.__task_animal_names(task):
+            self.__tasks_by_animal[name][key] = None
+        if task.enclosure_id is not None:
+            self.__tasks_by_enclosure[task.enclosure_id][key] = None
+        if owner_id != "UNASSIGNED":
+            self.__tasks_by_staff[owner_id][key] = None
+        else:
+            self.__unassigned_tasks[key] = None
+
+    def __unindex_task(self, task):
+        """ Forgets the schedule location and entity references of a task object. """
+        location = self.__locate(task)
+        if location is None:
+            return
+        date_key, _, owner_id, _ = location
+        key = (date_key, task.id)
+        del self.__task_locator[key]
+        self.__discard_reference(self.__task_dates_by_id, task.id, date_key)
+        self.__task_ids_by_date[date_key].discard(task.id)
+
+        for name in self.__task_animal_names(task):
+            self.__discard_reference(self.__tasks_by_animal, name, key)
+        if task.enclosure_id is not None:
+            self.__discard_reference(self.__tasks_by_enclosure, task.enclosure_id, key)
+        if owner_id != "UNASSIGNED":
+            self.__discard_reference(self.__tasks_by_staff, owner_id, key)
+        else:
+            self.__unassigned_tasks.pop(key, None)
+
+    def __locate(self, task):
+        """ Returns the schedule location of a task object, or None if that object is not in the schedule. """
+        for date_key in self.__task_dates_by_id.get(task.id, ()):
+            location = self.__task_locator[(date_key, task.id)]
+            if location[3] is task:
+                return location
+        return None
+
+    @staticmethod
+    def __discard_reference(index: dict, key: str, task_key):
+        """ Removes a task key from one entry of a reverse index, dropping the entry once it is empty. """
+        refs = index.get(key)
+        if refs is None:
+            return
+        refs.pop(task_key, None)
+        if not refs:
+            del index[key]
+
+    def __drop_task(self, location: tuple):
+        """ Removes a located task object from its schedule bucket and from every task index. """
+        date_key, state, owner_id, task = location
+        groups = self.__tasks_by_date[date_key][state]
+        groups[owner_id].remove(task)
+        if not groups[owner_id]:
+            del groups[owner_id]
+        self.__unindex_task(task)
+
+    def __referenced_tasks(self, index: dict, key: str):
+        """ Returns the (date_key, state, owner_id, task) locations of the tasks a reverse index lists under
+            a key. """
+        return [self.__task_locator[task_key] for task_key in list(index.get(key, ()))]
 
     def create_enclosure_code(self, type: str, size: int) -> str:
         """ A helper method used to generate a unique enclosure identification code for enclosures.
@@ -74,6 +245,11 @@ class ZooSystem:
                 - enclosure_id: string
                     The unique enclosure id for enclosure object. """
 
+        return self.__next_enclosure_code(type, size)[2]
+
+    def __next_enclosure_code(self, type: str, size: int):
+        """ Works out the next unused enclosure id for a type without reserving it.
+            Returns a (counter key, number, enclosure id) tuple. """
         words = type.split()
 
         code = words[0][:3].title()
@@ -86,12 +262,13 @@ class ZooSystem:
 
         id_code = f"{size}{code}"
 
-        count = 1
-        for enclosure in self.__enclosures:
-            if enclosure.type.lower() == type.lower():
-                count += 1
+        counter_key = type.strip().lower()
+        count = self.__enclosure_counters.get(counter_key, 0) + 1
+        # Different types can share a code prefix, so skip any number already taken by another type.
+        while f"{id_code}{count}" in self.__issued_enclosure_ids:
+            count += 1
 
-        return f"{id_code}{count}"
+        return counter_key, count, f"{id_code}{count}"
 
     def create_staff_id(self, staff_name: str, staff_birthday: str):
         """ A helper method used to generate a unique staff identification code for staff members.
@@ -121,6 +298,20 @@ class ZooSystem:
 
         return staff_id
 
+    def __next_staff_id(self, base_id: str, pending_counters: dict = None, pending_ids=()):
+        """ Works out the next unused staff id for a base id without reserving it. The first staff member
+            gets the base id; later ones sharing it get a numeric prefix, e.g. '2NarUzu98', '3NarUzu98'.
+            Ids reserved by a batch that has not been stored yet are passed in the pending arguments.
+            Returns a (number, staff id) tuple. """
+        number = self.__staff_id_counters.get(base_id, 1)
+        if pending_counters and base_id in pending_counters:
+            number = pending_counters[base_id]
+        staff_id = base_id if number == 1 else f"{number}{base_id}"
+        while staff_id in self.__issued_staff_ids or staff_id in pending_ids:
+            number += 1
+            staff_id = f"{number}{base_id}"
+        return number, staff_id
+
     def get_animal(self, animal_name: str):
         """ A helper method used to retrieve an Animal object from system storage based on animal.name string.
             Parameters:
@@ -132,11 +323,10 @@ class ZooSystem:
         if not isinstance(animal_name, str):
             raise TypeError("Animal name must be a string")
 
-        for i in self.__animals:
-            if i.name == animal_name:
-                return i
-
-        raise NoSuchAnimalError('No such animal exists at the Zoo')
+        animal = self.__animals.get(animal_name)
+        if animal is None:
+            raise NoSuchAnimalError('No such animal exists at the Zoo')
+        return animal
 
     def get_enclosure(self, enclosure_id: str):
         """ A helper method used to retrieve an Enclosure object from system storage based on enclosure.id string.
@@ -149,11 +339,10 @@ class ZooSystem:
         if not isinstance(enclosure_id, str):
             raise TypeError("Enclosure ID must be a string")
 
-        lookup_id = str(enclosure_id).strip()
-        for i in self.__enclosures:
-            if i.id == lookup_id:
-                return i
-        raise NoSuchEnclosureError('No such enclosure exists at the Zoo')
+        enclosure = self.__enclosures.get(enclosure_id.strip())
+        if enclosure is None:
+            raise NoSuchEnclosureError('No such enclosure exists at the Zoo')
+        return enclosure
 
     def get_staff(self, staff_id: str):
         """ A helper method used to retrieve a Staff object from system storage based on staff.id string.
@@ -166,32 +355,42 @@ class ZooSystem:
         if not isinstance(staff_id, str):
             raise TypeError("Staff ID must be a string")
 
-        lookup_id = str(staff_id).strip()
-        for staff in self.__staff:
-            if staff.id == lookup_id:
-                return staff
-
-        raise NoSuchStaffError('No such staff member exists at the Zoo')
+        staff = self.__staff.get(staff_id.strip())
+        if staff is None:
+            raise NoSuchStaffError('No such staff member exists at the Zoo')
+        return staff
 
+    @journaled()
     def add_enclosure(self, size: int, type: str):
         """ A helper method used to create and store a new Enclosure object in system storage.
             Parameters:
                 - size: integer
                     The size of enclosure object in square meters.
                 - type: string
-                    The environmental type of enclosure object."""
+                    The environmental type of enclosure object.
+            Returns:
+                - new_enclosure: Enclosure
+                    The Enclosure object that was created and stored."""
 
         if not isinstance(size, int) or not isinstance(type, str):
             raise TypeError("Enclosure size must be a integer and type a string")
         norm_type = type.strip().title()
 
-        if norm_type not in self.ENCLOSURES:
+        if norm_type not in self.ENCLOSURE_TYPES:
             raise NotInDatabaseError('No such enclosure exists at the Zoo')
 
-        id_code = self.create_enclosure_code(type, size)
+        counter_key, count, id_code = self.__next_enclosure_code(type, size)
         new_enclosure = Enclosure(size, type, id_code)
-        self.__enclosures.append(new_enclosure)
-
+        self.__enclosure_counters[counter_key] = count
+        self.__issued_enclosure_ids.add(id_code)
+        self.__enclosures[id_code] = new_enclosure
+        self.__enclosure_positions[id_code] = self.__enclosure_sequence
+        self.__enclosure_sequence += 1
+        new_enclosure.observer = self
+        self.__cleanliness_bucket(new_enclosure.cleanliness).add(new_enclosure)
+        return new_enclosure
+
+    @journaled()
     def add_animal(self, type: str, name: str, species: str, age: int):
         """ A helper method used to create and store a new Animal object of appropriate subclass.
             Parameters:
@@ -202,64 +401,92 @@ class ZooSystem:
                 - species: string
                     The species of animal object.
                 - age: integer
-                    The age of animal object in years """
+                    The age of animal object in years
+            Returns:
+                - new_animal: Animal
+                    The Animal object that was created and stored. """
+
+        new_animal = self.__build_animal(type, name, species, age)
+        self.__register_animal(new_animal)
+        return new_animal
 
+    def __build_animal(self, type: str, name: str, species: str, age: int, pending=()):
+        """ Validates animal details against the species catalog and creates, but does not store, the Animal
+            object. Names already used by stored animals or by the pending batch are rejected. """
         if not isinstance(type, str) or not isinstance(species, str) or not isinstance(name, str):
             raise TypeError("Species, name and type must be a string")
 
-        norm_type = " ".join(type.strip().split()).title()
-        norm_species = " ".join(species.strip().split()).title()
+        norm_type = normalise_name(type)
+        record = self.SPECIES_CATALOG.get(normalise_name(species))
 
-        if norm_type not in self.ANIMAL_TYPES:
+        if norm_type not in self.ANIMAL_CLASSES:
             raise NotInDatabaseError(f'Animal {type} not in database. Try Mammal, Reptile or Bird')
-        if norm_species not in self.ANIMALS:
+        if record is None:
             raise NotInDatabaseError(
                 f'Animal {species} not in database. Add {species} to database manually or try again')
         if not isinstance(age, int):
             raise TypeError(f'Age must be a number')
         if age < 0:
             raise ValueError(f'Age must be a positive number or 0 if newborn')
-        if not isinstance(species, str) or not isinstance(name, str) or not isinstance(type, str):
-            raise TypeError("Species, name and type must be a string")
+        if age > record.max_age:
+            raise ValueError(
+                f'{age} years of age for this species exceeds reasonable age of maximum {record.max_age} for this species.')
 
-        found = False
-        for group in self.ANIMAL_DATA:
-            if norm_species in group:
-                info = group[norm_species]
-                found = True
-                break
+        if name in self.__animals or name in pending:
+            raise DuplicateError(f"An Animal with this name already exists at the zoo, please choose another name.")
 
-        if not found:
-            raise NotInDatabaseError(
-                f'Animal {species} not in database. Add {species} to database manually or try again')
-        if age > info["max_age"]:
-            raise ValueError(
-                f'{age} years of age for this species exceeds reasonable age of maximum {info["max_age"]} for this species.')
+        return self.ANIMAL_CLASSES[norm_type].from_record(name, record, age)
 
-        for animal in self.__animals:
-            if animal.name == name:
-                raise DuplicateError(f"An Animal with this name already exists at the zoo, please choose another name.")
+    def __register_animal(self, animal):
+        """ Stores a newly created Animal object and starts observing its state. """
+        self.__animals[animal.name] = animal
+        animal.observer = self
+        self.animal_ailment_changed(animal)
+        if animal.in_enclosure is not None:
+            self.__animals_by_enclosure.setdefault(animal.in_enclosure, OrderedSet()).add(animal)
 
-        if norm_type == 'Mammal':
-            enclosure = info["enclosure"]
-            diet = info["diet"]
-            sound = info["sound"]
-            new_animal = Mammal(name, species, age, enclosure, diet, sound)
+    @journaled(materialise=("records",))
+    def add_animals(self, records, atomic: bool = True):
+        """ Creates and stores many Animal objects in one pass, validating every row before any are stored.
+            Parameters:
+                - records: iterable
+                    Rows of (type, name, species, age), either as sequences or as dicts with those keys.
+                - atomic: bool (optional)
+                    If True, nothing is stored unless every row is valid. If False, valid rows are stored and
+                    invalid rows are reported.
+            Returns:
+                - report: BulkReport
+                    The animals added and the errors raised by rejected rows. """
 
-        if norm_type == 'Bird':
-            enclosure = info["enclosure"]
-            diet = info["diet"]
-            sound = info["sound"]
-            new_animal = Bird(name, species, age, enclosure, diet, sound)
+        report = BulkReport("animals")
+        batch = {}
 
-        if norm_type == 'Reptile':
-            enclosure = info["enclosure"]
-            diet = info["diet"]
-            sound = info["sound"]
-            new_animal = Reptile(name, species, age, enclosure, diet, sound)
+        for row, values in enumerate(records):
+            label = values.get("name") if isinstance(values, dict) else None
+            try:
+                if isinstance(values, dict):
+                    fields = [values.get(key) for key in ("type", "name", "species", "age")]
+                else:
+                    fields = list(values)
+                if len(fields) != 4:
+                    raise TypeError("Animal rows need a type, name, species and age")
+                label = fields[1]
+                animal = self.__build_animal(*fields, pending=batch)
+            except (TypeError, ValueError, NotInDatabaseError, DuplicateError) as e:
+                report.add_error(row, label, e)
+                continue
+            batch[animal.name] = animal
 
-        self.__animals.append(new_animal)
+        if atomic and not report.ok:
+            return report
 
+        for animal in batch.values():
+            self.__register_animal(animal)
+        report.added.extend(batch.values())
+        report.committed = True
+        return report
+
+    @journaled()
     def add_staff(self, name: str, age: int, gender: str, birthday: str, role=None):
         """ Used to create and store a new Staff object or Staff subclass object.
             Parameters:
@@ -272,7 +499,22 @@ class ZooSystem:
                 - birthday: string
                     The birthday date of staff member object in string format.
                 - role: string (optional)
-                    The staff role indicating subclass ('keeper', 'veterinarian')."""
+                    The staff role indicating subclass ('keeper', 'veterinarian').
+            Returns:
+                - new_staff: Staff
+                    The Staff object that was created and stored."""
+
+        new_staff, base_id, number = self.__build_staff(name, age, gender, birthday, role)
+        self.__register_staff(new_staff, base_id, number)
+        return new_staff
+
+    def __build_staff(self, name: str, age: int, gender: str, birthday: str, role=None, date: str = None,
+                      pending: dict = None):
+        """ Validates staff details, allocates a staff id and creates, but does not store, the Staff object.
+            A pre-validated birthday can be passed as date, and a pending batch as a dict holding 'counters',
+            'ids' and 'identities' for staff not stored yet.
+            Returns a (staff, base id, id number) tuple. """
+        pending = pending or {}
 
         if not isinstance(name, str) or not isinstance(gender, str) or not isinstance(birthday, str):
             raise TypeError("Name, gender and birthday must be a string")
@@ -283,32 +525,133 @@ class ZooSystem:
         if " " not in name:
             raise ValueError(f"Staff name and surname (full name), separated by a space are required")
 
-        date = self.validate_date(birthday)
-        staff_id = self.create_staff_id(name, birthday)
-
-        for staff in self.__staff:
-
-            if staff.id == staff_id:
-                if staff.name == name and staff.birthday == birthday:
-                    raise DuplicateError(f"Staff {name} with birthday {birthday} already in the system")
+        if date is None:
+            date = self.validate_date(birthday)
+        if (name, date) in self.__staff_by_identity or (name, date) in pending.get("identities", ()):
+            raise DuplicateError(f"Staff {name} with birthday {birthday} already in the system")
+
+        staff_class = self.STAFF_CLASSES.get(role.strip().lower() if isinstance(role, str) else role)
+        if staff_class is None:
+            raise InvalidStaffRoleError('Invalid staff role (must be keeper or veterinarian)')
+
+        base_id = self.create_staff_id(name, birthday)
+        number, staff_id = self.__next_staff_id(base_id, pending.get("counters"), pending.get("ids", ()))
+
+        return staff_class(name, age, gender, date, staff_id), base_id, number
+
+    def __register_staff(self, staff, base_id: str, number: int):
+        """ Stores a newly created Staff object and reserves its staff id. """
+        self.__staff_id_counters[base_id] = number + 1
+        self.__issued_staff_ids.add(staff.id)
+        self.__staff_by_identity[(staff.name, staff.birthday)] = staff.id
+        self.__staff[staff.id] = staff
+        staff.observer = self
+
+    @journaled(materialise=("records",))
+    def add_staff_bulk(self, records, atomic: bool = True, format: str = None):
+        """ Creates and stores many Staff objects in one pass, validating every row before any are stored.
+            Parameters:
+                - records: iterable or text stream
+                    Rows of (name, age, gender, birthday, role) as sequences or dicts with those keys, or an open
+                    CSV (with a header row) or JSON Lines stream of such records.
+                - atomic: bool (optional)
+                    If True, nothing is stored unless every row is valid. If False, valid rows are stored and
+                    invalid rows are reported.
+                - format: string (optional)
+                    'csv' or 'jsonl' for streams. Detected from the first line when not given.
+            Returns:
+                - report: BulkReport
+                    The staff added and the errors raised by rejected rows. """
+
+        report = BulkReport("staff")
+        rows = []
+        for row, values in enumerate(self.__read_staff_records(records, format)):
+            try:
+                if isinstance(values, Exception):
+                    raise values
+                if isinstance(values, dict):
+                    fields = [values.get(key) for key in self.STAFF_FIELDS]
                 else:
-                    staff_id = "2" + staff.id
-
-        if role != None:
-
-            if role.lower().strip() not in ['keeper', 'veterinarian']:
-                raise InvalidStaffRoleError('Invalid staff role (must be keeper or veterinarian)')
-
-            if role.lower().strip() == 'keeper':
-                new_staff = Keeper(name, age, gender, date, staff_id)
-            if role.lower().strip() == 'veterinarian':
-                new_staff = Veterinarian(name, age, gender, date, staff_id)
-
+                    fields = list(values) + [None] * (len(self.STAFF_FIELDS) - len(values))
+                if len(fields) != len(self.STAFF_FIELDS) or fields[0] is None:
+                    raise TypeError("Staff rows need a name, age, gender, birthday and optional role")
+            except (TypeError, ValueError) as e:
+                report.add_error(row, None, e)
+                continue
+            rows.append((row, fields))
+
+        # Validate each distinct birthday once for the whole batch. Invalid birthdays keep only the error
+        # message, so each rejected row gets its own exception.
+        dates = {}
+        invalid_dates = {}
+        for _, fields in rows:
+            birthday = fields[3]
+            if isinstance(birthday, str) and birthday not in dates and birthday not in invalid_dates:
+                try:
+                    dates[birthday] = self.validate_date(birthday)
+                except InvalidDateError as e:
+                    invalid_dates[birthday] = str(e)
+
+        pending = {"counters": {}, "ids": set(), "identities": set()}
+        batch = []
+        for row, (name, age, gender, birthday, role) in rows:
+            try:
+                if isinstance(birthday, str) and birthday in invalid_dates:
+                    raise InvalidDateError(invalid_dates[birthday])
+                date = dates.get(birthday) if isinstance(birthday, str) else None
+                staff, base_id, number = self.__build_staff(name, age, gender, birthday, role, date, pending)
+            except (TypeError, ValueError, InvalidDateError, InvalidStaffRoleError, DuplicateError) as e:
+                report.add_error(row, name, e)
+                continue
+            pending["counters"][base_id] = number + 1
+            pending["ids"].add(staff.id)
+            pending["identities"].add((staff.name, staff.birthday))
+            batch.append((staff, base_id, number))
+
+        report.errors.sort(key=lambda error: error[0])
+        if atomic and not report.ok:
+            return report
+
+        for staff, base_id, number in batch:
+            self.__register_staff(staff, base_id, number)
+            report.added.append(staff)
+        report.committed = True
+        return report
+
+    def __read_staff_records(self, records, format: str = None):
+        """ Yields staff records from an iterable, or parses them from a CSV or JSON Lines text stream.
+            Lines that cannot be parsed are yielded as the exception raised, so they are reported per row. """
+        if not hasattr(records, "read"):
+            yield from records
+            return
+
+        lines = (line for line in records if line.strip())
+        first = next(lines, None)
+        if first is None:
+            return
+        if format is None:
+            format = "jsonl" if first.lstrip().startswith("{") else "csv"
+        lines = chain([first], lines)
+
+        if format == "csv":
+            for values in csv.DictReader(lines):
+                values = {key.strip(): (value.strip() if isinstance(value, str) else value)
+                          for key, value in values.items() if key is not None}
+                age = values.get("age")
+                if isinstance(age, str) and age.lstrip("-").isdigit():
+                    values["age"] = int(age)
+                values["role"] = values.get("role") or None
+                yield values
+        elif format == "jsonl":
+            for line in lines:
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield ValueError(f"Invalid JSON line: {e}")
         else:
-            new_staff = Staff(name, age, gender, date, staff_id)
-
-        self.__staff.append(new_staff)
+            raise ValueError(f"Unsupported staff record format: '{format}'. Use 'csv' or 'jsonl'.")
 
+    @journaled()
     def remove_staff(self, staff_id: str):
         """ Used to remove a Staff object from system storage based on staff id string.
             Parameters:
@@ -326,27 +669,35 @@ class ZooSystem:
         if staff.role == "Keeper" and staff.working_enclosure is not None:
             raise CannotRemoveStaffError("Can not remove staff while staff is working in enclosure")
 
-        for enclosure in self.__enclosures:
-            if staff_id in enclosure.keepers:
-                enclosure.keepers.remove(staff_id)
-
-        for date, buckets in self.__tasks_by_date.items():
-            for status, groups in buckets.items():
-
-                if staff_id in groups:
-
-                    unassigned = groups.setdefault("UNASSIGNED", [])
-
-                    for task in groups[staff_id]:
-                        task.assigned = False
-                        task.assigned_to = None
-                        unassigned.append(task)
-
-                    del groups[staff_id]
-
-                    break
-        self.__staff.remove(staff)
-
+        if staff.role == "Keeper":
+            for enclosure in staff.assigned_enclosures:
+                if staff.id in enclosure.keepers:
+                    enclosure.keepers.remove(staff.id)
+        if staff.role == "Veterinarian":
+            for animal in staff.assigned_animals:
+                if self.__vet_by_animal.get(animal.name) == staff.id:
+                    del self.__vet_by_animal[animal.name]
+
+        for date_key, state, owner_id, task in self.__referenced_tasks(self.__tasks_by_staff, staff.id):
+            groups = self.__tasks_by_date[date_key][state]
+            groups[owner_id].remove(task)
+            if not groups[owner_id]:
+                del groups[owner_id]
+
+            groups.setdefault("UNASSIGNED", []).append(task)
+            task.assigned = False
+            task.assigned_to = None
+            self.__index_task(date_key, state, "UNASSIGNED", task)
+
+        for template in self.__recurring.values():
+            if template.staff_id == staff.id:
+                template.staff_id = None
+
+        self.__staff_by_identity.pop((staff.name, staff.birthday), None)
+        del self.__staff[staff.id]
+        staff.observer = None
+
+    @journaled()
     def remove_enclosure(self, enclosure_id: str):
         """Used to remove an Enclosure object from system storage based on enclosure id string.
                Parameters:
@@ -370,18 +721,23 @@ class ZooSystem:
             if keeper.working_enclosure == enclosure:
                 keeper.working_enclosure = None
 
-        for animal in self.__animals:
-            if animal.in_enclosure == enclosure_id:
-                animal.in_enclosure = None
+        for animal in list(self.__animals_by_enclosure.get(enclosure.id, ())):
+            animal.in_enclosure = None
+        self.__hungry_by_enclosure.pop(enclosure.id, None)
+
+        for location in self.__referenced_tasks(self.__tasks_by_enclosure, enclosure.id):
+            self.__drop_task(location)
 
-        for date, bucket in self.__tasks_by_date.items():
-            for state in ("uncompleted", "completed"):
-                groups = bucket[state]
-                for staff_id, tasks in list(groups.items()):
-                    groups[staff_id] = [t for t in tasks if not getattr(t, "enclosure_id", None) == enclosure_id]
+        for template in list(self.__recurring.values()):
+            if template.enclosure_id == enclosure.id:
+                del self.__recurring[template.id]
 
-        self.__enclosures.remove(enclosure)
+        enclosure.observer = None
+        self.__enclosure_positions.pop(enclosure.id, None)
+        self.__cleanliness_bucket(enclosure.cleanliness).discard(enclosure)
+        del self.__enclosures[enclosure.id]
 
+    @journaled()
     def remove_animal(self, animal_name: str):
         """ Used to remove an Animal object from system storage based on animal name string.
             Parameters:
@@ -396,45 +752,202 @@ class ZooSystem:
         if animal.treatment == True:
             raise CannotRemoveAnimalError('Can not remove animals in treatment')
 
-        for date_key, buckets in self.__tasks_by_date.items():
-            for status in ("uncompleted", "completed"):
-                groups = buckets[status]
-                for owner_id, tasks in list(groups.items()):
-                    new_tasks = []
-                    for task in tasks:
-                        if isinstance(task, TreatmentTask) and task.animal_id == animal_name:
-                            continue
-
-                        if isinstance(task, FeedingTask) and isinstance(task.animals, list):
-                            if animal_name in task.animals:
-                                task.animals = [n for n in task.animals if n != animal_name]
-                                if not task.animals:
-                                    continue
-                        new_tasks.append(task)
-
-                    if new_tasks:
-                        groups[owner_id] = new_tasks
-                    else:
-                        del groups[owner_id]
+        treating_vet = self.__staff.get(animal.treated_by) if animal.treated_by is not None else None
+        if treating_vet is not None and treating_vet.working_animal is animal:
+            raise CannotRemoveAnimalError("Can not remove animals in treatment")
+
+        for location in self.__referenced_tasks(self.__tasks_by_animal, animal_name):
+            date_key, state, owner_id, task = location
+            if isinstance(task, FeedingTask):
+                remaining = [n for n in task.animals if n != animal_name]
+                if remaining:
+                    self.__unindex_task(task)
+                    task.animals = remaining
+                    self.__index_task(date_key, state, owner_id, task)
+                    continue
+            self.__drop_task(location)
 
         if animal.in_enclosure:
             enclosure = self.get_enclosure(animal.in_enclosure)
             if animal in enclosure.contains:
                 enclosure.contains.remove(animal)
 
-        for staff in self.__staff:
-            if isinstance(staff, Veterinarian):
+        vet_id = self.__vet_by_animal.pop(animal_name, None)
+        if vet_id is not None:
+            vet = self.__staff[vet_id]
+            if animal in vet.assigned_animals:
+                vet.assigned_animals.remove(animal)
+
+        self.__health_records.pop(animal_name, None)
 
-                if staff.working_animal is animal:
-                    raise CannotRemoveAnimalError("Can not remove animals in treatment")
+        for template in list(self.__recurring.values()):
+            if template.type == "Treatment" and template.animal_names == animal.name:
+                del self.__recurring[template.id]
+            elif template.type == "Feeding" and animal.name in template.animal_names:
+                template.animal_names = [name for name in template.animal_names if name != animal.name]
+                if not template.animal_names:
+                    del self.__recurring[template.id]
+
+        animal.observer = None
+        self.__forget_enclosure(animal, animal.in_enclosure)
+        self.__ailing.discard(animal)
+        self.__forget_hunger(animal)
+        del self.__animals[animal.name]
+
+    def animal_treatment_changed(self, animal, field: str):
+        """ Observer hook called by a registered animal object when its treatment status or treating
+            veterinarian changes.
+            Parameters:
+                - animal: Animal
+                    The animal object whose treatment state changed.
+                - field: string
+                    The attribute that changed ('treatment' or 'treated_by'). """
+        if self.__journal is not None:
+            self.__journal.record_change("animal", animal.name, field, getattr(animal, field))
+
+    def animal_enclosure_changed(self, animal, previous):
+        """ Observer hook called by a registered animal object when the enclosure it refers to changes.
+            Parameters:
+                - animal: Animal
+                    The animal object whose in_enclosure changed.
+                - previous: string
+                    The enclosure id the animal referred to before, or None. """
+        self.__forget_enclosure(animal, previous)
+        if animal.in_enclosure is not None:
+            self.__animals_by_enclosure.setdefault(animal.in_enclosure, OrderedSet()).add(animal)
+        if self.__journal is not None:
+            self.__journal.record_change("animal", animal.name, "in_enclosure", animal.in_enclosure)
+
+    def __forget_enclosure(self, animal, enclosure_id):
+        """ Removes an animal object from the index of animals referring to an enclosure. """
+        residents = self.__animals_by_enclosure.get(enclosure_id)
+        if residents is not None:
+            residents.discard(animal)
+            if not residents:
+                del self.__animals_by_enclosure[enclosure_id]
+
+    def staff_work_changed(self, staff):
+        """ Observer hook called by a registered staff object when it starts or stops working on an animal
+            or in an enclosure.
+            Parameters:
+                - staff: Staff
+                    The Veterinarian or Keeper object whose current work changed. """
+        if self.__journal is None:
+            return
+        if staff.role == "Veterinarian":
+            animal = staff.working_animal
+            self.__journal.record_change("staff", staff.id, "working_animal", animal.name if animal else None)
+        elif staff.role == "Keeper":
+            enclosure = staff.working_enclosure
+            self.__journal.record_change("staff", staff.id, "working_enclosure", enclosure.id if enclosure else None)
+
+    def animal_ailment_changed(self, animal):
+        """ Observer hook called by a registered animal object when its ailment status changes.
+            Parameters:
+                - animal: Animal
+                    The animal object whose ailment status changed. """
+        if self.__journal is not None:
+            self.__journal.record_change("animal", animal.name, "ailment", animal.ailment)
+        if animal.ailment:
+            self.__ailing.add(animal)
+        else:
+            self.__ailing.discard(animal)
 
-                if animal in staff.assigned_animals:
-                    staff.assigned_animals.remove(animal)
+    def __cleanliness_bucket(self, cleanliness: int):
+        """ Returns the bucket for a cleanliness value. be_cleaned can raise cleanliness past 5, which shares
+            the cleanest bucket. """
+        return self.__cleanliness_buckets[min(max(cleanliness, 0), self.CLEANLINESS_LEVELS - 1)]
 
-        self.__health_records.pop(animal_name, None)
+    def enclosure_cleanliness_changed(self, enclosure, previous: int):
+        """ Observer hook called by a registered enclosure object when its cleanliness changes.
+            Parameters:
+                - enclosure: Enclosure
+                    The enclosure object whose cleanliness changed.
+                - previous: integer
+                    The cleanliness value before the change. """
+        if self.__journal is not None:
+            self.__journal.record_change("enclosure", enclosure.id, "cleanliness", enclosure.cleanliness)
+        self.__cleanliness_bucket(previous).discard(enclosure)
+        self.__cleanliness_bucket(enclosure.cleanliness).add(enclosure)
+
+    def get_dirtiest_enclosures(self, k: int, below: int = None):
+        """ Retrieves up to k enclosure objects in order of increasing cleanliness.
+            Parameters:
+                - k: integer
+                    The maximum number of enclosure objects to return.
+                - below: integer (optional)
+                    Only enclosures with a cleanliness lower than this value are returned.
+            Returns:
+                - enclosures: list[Enclosure]
+                    The dirtiest enclosure objects, dirtiest first. """
+        if not isinstance(k, int):
+            raise TypeError("k must be an integer")
+        if k < 0:
+            raise ValueError("k must be >= 0")
+
+        levels = self.CLEANLINESS_LEVELS if below is None else min(max(below, 0), self.CLEANLINESS_LEVELS)
+        dirtiest = []
+        for bucket in self.__cleanliness_buckets[:levels]:
+            for enclosure in bucket:
+                if len(dirtiest) == k:
+                    return dirtiest
+                dirtiest.append(enclosure)
+        return dirtiest
+
+    def animal_hunger_changed(self, animal):
+        """ Observer hook called by a registered animal object when its hungry status changes.
+            Parameters:
+                - animal: Animal
+                    The animal object whose hungry status changed. """
+        if self.__journal is not None:
+            self.__journal.record_change("animal", animal.name, "hungry", animal.hungry)
+        if animal.in_enclosure is None:
+            return
+        if animal.hungry:
+            self.__hungry_by_enclosure.setdefault(animal.in_enclosure, OrderedSet()).add(animal)
+        else:
+            self.__forget_hunger(animal)
+
+    def __forget_hunger(self, animal):
+        """ Removes an animal object from the hungry set of the enclosure it is stored in. """
+        hungry = self.__hungry_by_enclosure.get(animal.in_enclosure)
+        if hungry is None:
+            return
+        hungry.discard(animal)
+        if not hungry:
+            del self.__hungry_by_enclosure[animal.in_enclosure]
+
+    def get_hungry_animals(self, enclosure_id: str):
+        """ Retrieves the hungry animal objects stored within a specific enclosure.
+            Parameters:
+                - enclosure_id: string
+                    The enclosure id of enclosure object being checked.
+            Returns:
+                - animals: list[Animal]
+                    The hungry animal objects in the enclosure. """
+        self.get_enclosure(enclosure_id)
+        return list(self.__hungry_by_enclosure.get(enclosure_id, ()))
 
-        self.__animals.remove(animal)
+    def get_ailing_animals(self, staff_id: str = None):
+        """ Retrieves the animal objects currently in need of medical attention.
+            Parameters:
+                - staff_id: string (optional)
+                    Limits the result to animals in a Keeper's enclosures or assigned to a Veterinarian.
+            Returns:
+                - animals: list[Animal]
+                    The ailing animal objects, in the order they fell ill. """
+        if staff_id is None:
+            return list(self.__ailing)
 
+        staff = self.get_staff(staff_id)
+        if staff.role == "Keeper":
+            enclosure_ids = {enclosure.id for enclosure in staff.assigned_enclosures}
+            return [animal for animal in self.__ailing if animal.in_enclosure in enclosure_ids]
+        if staff.role == "Veterinarian":
+            return [animal for animal in self.__ailing if animal in staff.assigned_animals]
+        raise InvalidStaffRoleError("Only Keepers and Veterinarians perform health checks")
+
+    @journaled()
     def assign_animal_to_enclosure(self, animal_name: str, enclosure_id: str):
         """ Assigns an animal object to an enclosure object based on provided identifiers.
             Enclosure objects store real animal objects.
@@ -460,14 +973,73 @@ class ZooSystem:
             old = self.get_enclosure(animal.in_enclosure)
             if enclosure.can_store(animal):
                 if animal in old.contains:
+                    self.__forget_hunger(animal)
                     old.contains.remove(animal)
                     enclosure.store(animal)
                     animal.in_enclosure = enclosure.id
+                    self.animal_hunger_changed(animal)
                     return
 
         if enclosure.can_store(animal):
             enclosure.store(animal)
             animal.in_enclosure = enclosure.id
+            self.animal_hunger_changed(animal)
+
+    @journaled()
+    def place_unhoused_animals(self, apply: bool = True):
+        """ Assigns every animal object without an enclosure to a compatible enclosure in one batch.
+            Animals join enclosures already housing their species first, then empty enclosures of their type,
+            and no enclosure is filled beyond its capacity. Animals in treatment are not moved.
+            Parameters:
+                - apply: bool (optional)
+                    If True the placements are carried out; if False only the plan is returned.
+            Returns:
+                - result: tuple
+                    A tuple containing:
+                        (plan, unplaced), where plan maps animal names to enclosure ids and unplaced lists the
+                        names of animals for which no enclosure had room. """
+
+        # (enclosure type, species or None if empty) -> enclosures with free space, as [enclosure, free] pairs.
+        open_enclosures = defaultdict(list)
+        for enclosure in self.__enclosures.values():
+            free = enclosure.capacity - len(enclosure.contains)
+            if free > 0:
+                species = enclosure.contains.first().species if enclosure.contains else None
+                open_enclosures[(enclosure.type.lower(), species)].append([enclosure, free])
+        for candidates in open_enclosures.values():
+            candidates.reverse()
+
+        plan = {}
+        unplaced = []
+        for animal in self.__animals.values():
+            if animal.in_enclosure is not None or animal.treatment:
+                continue
+
+            env_type = animal.enclosure.lower()
+            candidates = open_enclosures.get((env_type, animal.species))
+            if not candidates:
+                empty = open_enclosures.get((env_type, None))
+                if not empty:
+                    unplaced.append(animal.name)
+                    continue
+                # An empty enclosure now belongs to this species for the rest of the batch.
+                candidates = open_enclosures[(env_type, animal.species)]
+                candidates.append(empty.pop())
+
+            slot = candidates[-1]
+            plan[animal.name] = slot[0].id
+            slot[1] -= 1
+            if slot[1] == 0:
+                candidates.pop()
+
+        if apply:
+            for animal_name, enclosure_id in plan.items():
+                animal = self.__animals[animal_name]
+                self.__enclosures[enclosure_id].store(animal)
+                animal.in_enclosure = enclosure_id
+                self.animal_hunger_changed(animal)
+
+        return plan, unplaced
 
     def get_enclosure_animals(self, enclosure_id: str):
         """ Retrieves all animal objects currently stored within a specific enclosure.
@@ -482,6 +1054,7 @@ class ZooSystem:
         animals = enclosure.contains
         return animals
 
+    @journaled()
     def assign_animal_to_vet(self, animal_name: str, staff_id: str):
         """ Assigns an animal object to a veterinarian staff member for monitoring or treatment.
             Veterinarians are assigned real animal objects.
@@ -499,18 +1072,16 @@ class ZooSystem:
         if vet.role != "Veterinarian":
             raise InvalidStaffRoleError('Can only assign Veterinarians to animals')
 
-        for staff_member in self.__staff:
-            if isinstance(staff_member, Veterinarian):
-                if animal in staff_member.assigned_animals:
-                    if staff_member.id == vet.id:
-
-                        raise DuplicateError(f"{animal.name} already assigned to {vet.id}")
-                    else:
-
-                        raise DuplicateError(f"{animal.name} is already assigned to veterinarian {staff_member.id}")
+        assigned_vet = self.__vet_by_animal.get(animal.name)
+        if assigned_vet == vet.id:
+            raise DuplicateError(f"{animal.name} already assigned to {vet.id}")
+        if assigned_vet is not None:
+            raise DuplicateError(f"{animal.name} is already assigned to veterinarian {assigned_vet}")
 
         vet.accept_assignment(animal)
+        self.__vet_by_animal[animal.name] = vet.id
 
+    @journaled()
     def assign_enclosure_to_keeper(self, enclosure_id: str, staff_id: str):
         """ Assigns an enclosure object to a keeper staff member for management and care duties.
             Keepers are assigned real enclosure objects.
@@ -544,18 +1115,11 @@ class ZooSystem:
         if not isinstance(date, str):
             raise TypeError("Date must be a string")
 
-        date_lower = date.strip().lower()
-        today = datetime.today().strftime("%d/%m/%Y")
-
-        if date_lower in ("today", "now"):
-            return today
-
-        try:
-            dt = datetime.strptime(date, "%d/%m/%Y")
-        except ValueError:
+        date_key = to_date_key(date)
+        if date_key == UNSCHEDULED:
             raise InvalidDateError(f"Invalid date: '{date}'. Please use DD/MM/YYYY, e.g. 05/12/2025.")
 
-        return dt.strftime("%d/%m/%Y")
+        return format_date(date_key)
 
     def get_date_key(self, date: str = None):
         """ A helper method that produces a standardised date key for scheduling purposes.
@@ -566,10 +1130,18 @@ class ZooSystem:
                 - date_key: string
                     A validated date key or 'UNSCHEDULED' if no date is provided. """
 
-        if date is None:
-            return "UNSCHEDULED"
+        return format_date(self.get_date_ordinal(date))
+
+    def get_date_ordinal(self, date=None):
+        """ A helper method that produces the internal ordinal date key used to store tasks and health records.
+            Parameters:
+                - date: string or integer (optional)
+                    A DD/MM/YYYY string, 'today'/'now', or an existing ordinal date key.
+            Returns:
+                - date_key: integer
+                    The ordinal of the date, or UNSCHEDULED (0) if no date is provided. """
 
-        return self.validate_date(date)
+        return to_date_key(date)
 
     def get_or_create_date_slot(self, date: str = None):
         """ Retrieves or creates a task storage slot associated with a specific date.
@@ -580,15 +1152,17 @@ class ZooSystem:
                         - slot: dict
                             A dictionary containing task buckets for 'uncompleted' and 'completed' tasks. """
 
-        date_key = self.get_date_key(date)
+        date_key = self.get_date_ordinal(date)
 
         if date_key not in self.__tasks_by_date:
             self.__tasks_by_date[date_key] = {
                 "uncompleted": {},
                 "completed": {}
             }
+            bisect.insort(self.__date_index, date_key)
         return self.__tasks_by_date[date_key]
 
+    @journaled("date")
     def add_task(self, task, date: str = None, staff_id: str = None):
         """ Adds a task object to the scheduling system under the specified date and staff assignment.
             Parameters:
@@ -599,6 +1173,10 @@ class ZooSystem:
                 - staff_id: string (optional)
                     The staff id for task assignment, or 'UNASSIGNED' if none is provided."""
 
+        date_key = self.get_date_ordinal(date)
+        if (date_key, task.id) in self.__task_locator:
+            raise DuplicateError(f"Task {task.id} is already scheduled on {format_date(date_key)}")
+
         slot = self.get_or_create_date_slot(date)
         bucket = slot["uncompleted"]
         key = staff_id if staff_id is not None else "UNASSIGNED"
@@ -607,131 +1185,300 @@ class ZooSystem:
         bucket[key].append(task)
         task.assigned_to = staff_id
         task.assigned = staff_id is not None
-
+        self.__index_task(date_key, "uncompleted", key, task)
+
+    def __feeding_candidates(self):
+        """ Returns (FeedingTask, arguments) pairs for every enclosure containing hungry animals, in registry
+            order. """
+        candidates = []
+        # Only enclosures with hungry animals have an entry, so fully fed enclosures are never visited.
+        for enclosure_id in sorted(self.__hungry_by_enclosure, key=self.__enclosure_positions.__getitem__):
+            hungry = self.__hungry_by_enclosure[enclosure_id]
+            contains = self.__enclosures[enclosure_id].contains
+            if len(hungry) == len(contains):
+                animals = ["All Animals"]
+            else:
+                animals = [animal.name for animal in contains if animal in hungry]
+            candidates.append((FeedingTask, (enclosure_id, animals)))
+        return candidates
+
+    def __cleaning_candidates(self):
+        """ Returns (CleaningTask, arguments) pairs for every enclosure requiring cleaning attention. """
+        need_cleaning = self.get_dirtiest_enclosures(len(self.__enclosures), below=3)
+        return [(CleaningTask, (enclosure.id,)) for enclosure in need_cleaning]
+
+    def __treatment_candidates(self):
+        """ Returns (TreatmentTask, arguments) pairs for every animal requiring medical attention. """
+        return [(TreatmentTask, (animal.name,)) for animal in self.__ailing]
+
+    def __schedule_candidates(self, candidates: list, date_keys):
+        """ Creates a task from every candidate on every given date, skipping tasks already scheduled that day.
+            A recurring template occurrence counts as scheduled when it has the same type and target.
+            Returns the list of task objects added. """
+        added = []
+        for date_key in date_keys:
+            date = format_date(date_key)
+            existing_ids = self.__task_ids_by_date.get(date_key, ())
+            recurring = {(task.type, task.enclosure_id, task.animal_id)
+                         for _, _, _, task in self.__iter_recurring_tasks(date_key)}
+            for task_class, arguments in candidates:
+                task = task_class(*arguments, date)
+                if task.id not in existing_ids and (task.type, task.enclosure_id, task.animal_id) not in recurring:
+                    self.add_task(task, date=date_key)
+                    added.append(task)
+        return added
+
+    @journaled("date")
     def schedule_feeding_auto(self, date: str = None):
         """ Automatically creates feeding tasks for enclosures containing hungry animals.
              Parameters:
                  - date: string (optional)
                      The date for which feeding tasks are to be scheduled."""
 
-        feeding_schedule = {}
-        for enclosure in self.__enclosures:
-            hungry = [animal.name for animal in enclosure.contains if animal.hungry]
-            if hungry:
-                feeding_schedule[enclosure.id] = hungry
-                if len(hungry) == len(enclosure.contains):
-                    feeding_schedule[enclosure.id] = ["All Animals"]
-
-        date_key = self.get_date_key(date)
-        existing_ids = set()
-        if date_key in self.__tasks_by_date:
-            for bucket in self.__tasks_by_date[date_key]["uncompleted"].values():
-                for t in bucket:
-                    existing_ids.add(t.id)
-            for bucket in self.__tasks_by_date[date_key]["completed"].values():
-                for t in bucket:
-                    existing_ids.add(t.id)
-
-        for enclosure_id, animals in feeding_schedule.items():
-            task = FeedingTask(enclosure_id, animals, date_key)
-            if task.id not in existing_ids:
-                self.add_task(task, date=date_key)
+        self.__schedule_candidates(self.__feeding_candidates(), [self.get_date_ordinal(date)])
 
+    @journaled("date")
     def schedule_cleaning_auto(self, date: str = None):
         """ Automatically creates cleaning tasks for enclosures requiring cleaning attention.
             Parameters:
                 - date: string (optional)
                     The date for which cleaning tasks are to be scheduled."""
-        need_cleaning = [enclosure for enclosure in self.__enclosures if enclosure.cleanliness < 3]
-
-        date_key = self.get_date_key(date)
-        existing_ids = set()
-        if date_key in self.__tasks_by_date:
-            for bucket in self.__tasks_by_date[date_key]["uncompleted"].values():
-                for t in bucket:
-                    existing_ids.add(t.id)
-            for bucket in self.__tasks_by_date[date_key]["completed"].values():
-                for t in bucket:
-                    existing_ids.add(t.id)
-
-        for enclosure in need_cleaning:
-            task = CleaningTask(enclosure.id, date_key)
-            if task.id not in existing_ids:
-                self.add_task(task, date=date)
 
+        self.__schedule_candidates(self.__cleaning_candidates(), [self.get_date_ordinal(date)])
+
+    @journaled("date")
     def schedule_treatment_auto(self, date: str = None):
         """ Automatically creates treatment tasks for animals requiring medical attention.
             Parameters:
                 - date: string (optional)
                     The date for which cleaning tasks are to be scheduled."""
-        need_treatment = [animal for animal in self.__animals if animal.ailment]
-
-        date_key = self.get_date_key(date)
-        existing_ids = set()
-        if date_key in self.__tasks_by_date:
-            for bucket in self.__tasks_by_date[date_key]["uncompleted"].values():
-                for t in bucket:
-                    existing_ids.add(t.id)
-            for bucket in self.__tasks_by_date[date_key]["completed"].values():
-                for t in bucket:
-                    existing_ids.add(t.id)
-
-        for animal in need_treatment:
-            task = TreatmentTask(animal.name, date_key)
-            if task.id not in existing_ids:
-                self.add_task(task, date=date)
-
-    def assign_task_to_staff(self, staff_id: str, task_id: str):
+
+        self.__schedule_candidates(self.__treatment_candidates(), [self.get_date_ordinal(date)])
+
+    @journaled("start")
+    def schedule_horizon(self, start: str, days: int, kinds=TASK_KINDS):
+        """ Automatically creates tasks for every day of a date range from a single snapshot of animal and
+            enclosure needs.
+            Parameters:
+                - start: string
+                    The first date of the range, in DD/MM/YYYY format or 'today'.
+                - days: integer
+                    The number of days to schedule, at least 1.
+                - kinds: iterable of strings (optional)
+                    The task types to create ('Feeding', 'Cleaning' and/or 'Treatment'). Defaults to all.
+            Returns:
+                - added: list[Task]
+                    The task objects that were added to the schedule. """
+
+        if not isinstance(days, int):
+            raise TypeError("Days must be an integer")
+        if days < 1:
+            raise ValueError("Days must be at least 1")
+
+        sources = {"Feeding": self.__feeding_candidates,
+                   "Cleaning": self.__cleaning_candidates,
+                   "Treatment": self.__treatment_candidates}
+        if isinstance(kinds, str):
+            kinds = [kinds]
+        candidates = []
+        for kind in dict.fromkeys(kind.strip().capitalize() for kind in kinds):
+            if kind not in sources:
+                raise InvalidTaskTypeError(f"Invalid task type: {kind}")
+            candidates.extend(sources[kind]())
+
+        first = self.get_date_ordinal(self.validate_date(start))
+        return self.__schedule_candidates(candidates, range(first, first + days))
+
+    @journaled("date")
+    def assign_task_to_staff(self, staff_id: str, task_id: str, date: str = None):
+        """ Assigns a scheduled task to a staff member whose role and assignments allow them to take it.
+            Parameters:
+                - staff_id: string
+                    The staff id of the staff member taking the task.
+                - task_id: string
+                    The id of the task to assign.
+                - date: string (optional)
+                    The scheduled date of the task, needed when the same id is scheduled in several years."""
         staff = self.get_staff(staff_id)
 
-        date_key, status, owner_id, task = self.find_task_in_schedule(task_id)
+        date_key, status, owner_id, task = self.find_task_in_schedule(task_id, date)
 
         if status != "uncompleted":
             raise InvalidTaskAssignmentError("Cannot assign a completed task")
-        if task.type in ("Feeding", "Cleaning") and staff.role != "Keeper":
+        self.__check_can_assign(staff, task.type, task.enclosure_id, task.animal_id)
+
+        self.__materialise(date_key, owner_id, task)
+        self.__move_to_staff(task, staff)
+        if task not in staff.tasks:
+            staff.tasks.append(task)
+
+    def __check_can_assign(self, staff, task_type: str, enclosure_id: str = None, animal_id: str = None):
+        """ Raises an error unless the staff member's role and assignments allow them to take a task. """
+        if task_type in ("Feeding", "Cleaning") and staff.role != "Keeper":
             raise InvalidStaffRoleError("Can only assign Keepers to feeding and cleaning tasks")
-        if task.type == "Treatment" and staff.role != "Veterinarian":
+        if task_type == "Treatment" and staff.role != "Veterinarian":
             raise InvalidStaffRoleError("Can only assign Veterinarians to Treatments")
 
-        if task.type in ("Feeding", "Cleaning"):
-            enclosure = self.get_enclosure(task.enclosure_id)
+        if task_type in ("Feeding", "Cleaning"):
+            enclosure = self.get_enclosure(enclosure_id)
             if enclosure not in staff.assigned_enclosures:
                 raise InvalidTaskAssignmentError(f"Keeper {staff.id} is not assigned to enclosure {enclosure.id}")
-        if task.type == "Treatment":
-            animal = self.get_animal(task.animal_id)
+        if task_type == "Treatment":
+            animal = self.get_animal(animal_id)
             if animal not in staff.assigned_animals:
                 raise InvalidTaskAssignmentError(f"Veterinarian {staff.id} is not assigned to animal {animal.name}")
 
-        slot = self.__tasks_by_date[date_key]
-        uncompleted = slot["uncompleted"]
+    def __move_to_staff(self, task, staff):
+        """ Moves an uncompleted task object into a staff member's bucket and records the assignment. """
+        date_key, _, owner_id, _ = self.__locate(task)
+        uncompleted = self.__tasks_by_date[date_key]["uncompleted"]
 
         uncompleted[owner_id].remove(task)
         if not uncompleted[owner_id]:
             del uncompleted[owner_id]
 
-        uncompleted.setdefault(staff_id, []).append(task)
+        uncompleted.setdefault(staff.id, []).append(task)
 
         task.assigned = True
-        task.assigned_to = staff_id
+        task.assigned_to = staff.id
+        self.__index_task(date_key, "uncompleted", staff.id, task)
+
+    @journaled("date")
+    def auto_assign_tasks(self, date: str = None):
+        """ Assigns the unassigned tasks of a date to eligible staff, balancing open task counts.
+            Feeding and Cleaning tasks go to Keepers assigned to the task's enclosure, and Treatment tasks to a
+            Veterinarian assigned to the animal. Among eligible staff the one with the fewest uncompleted tasks
+            is chosen. Unassigned occurrences of recurring templates on the date are included, and are stored
+            in the schedule when they are assigned.
+            Parameters:
+                - date: string (optional)
+                    The date of tasks to assign. Unscheduled tasks are assigned if no date is provided.
+            Returns:
+                - result: tuple
+                    A tuple containing:
+                        (assignments, unassigned), where assignments maps task ids to staff ids and unassigned lists
+                        the ids of tasks no eligible staff member was found for. """
+
+        date_key = self.get_date_ordinal(date)
+        slot = self.__tasks_by_date.get(date_key)
+        pool = list(slot["uncompleted"].get("UNASSIGNED", ())) if slot else []
+        # Unassigned occurrences of recurring templates are stored only once they are assigned.
+        pool.extend(task for _, _, _, task in self.__iter_recurring_tasks(date_key, assigned=False))
+
+        vets_by_animal = defaultdict(list)
+        if any(task.type == "Treatment" for task in pool):
+            for staff in self.__staff.values():
+                if staff.role == "Veterinarian":
+                    for animal in staff.assigned_animals:
+                        vets_by_animal[animal.name].append(staff)
+
+        open_counts = {}
+
+        def open_tasks(staff):
+            if staff.id not in open_counts:
+                open_counts[staff.id] = sum(1 for task_key in self.__tasks_by_staff.get(staff.id, ())
+                                            if self.__task_locator[task_key][1] == "uncompleted")
+            return open_counts[staff.id]
+
+        assignments = {}
+        unassigned = []
+        for task in pool:
+            if task.type == "Treatment":
+                candidates = vets_by_animal.get(task.animal_id, ())
+            else:
+                enclosure = self.__enclosures.get(task.enclosure_id)
+                keeper_ids = enclosure.keepers if enclosure is not None else ()
+                candidates = [self.__staff[keeper_id] for keeper_id in keeper_ids if keeper_id in self.__staff]
 
-        if task not in staff.tasks:
+            if not candidates:
+                unassigned.append(task.id)
+                continue
+
+            staff = min(candidates, key=open_tasks)
+            self.__materialise(date_key, "UNASSIGNED", task)
+            self.__move_to_staff(task, staff)
+            # Tasks in the unassigned pool have never been on this staff member's list.
             staff.tasks.append(task)
+            open_counts[staff.id] += 1
+            assignments[task.id] = staff.id
+
+        return assignments, unassigned
 
-    def iter_tasks(self, date: str = None, status: str = None, assigned: bool = None, staff_id: str = None):
+    def iter_tasks(self, date: str = None, status: str = None, assigned: bool = None, staff_id: str = None,
+                   start: str = None, end: str = None):
         """ Iterates through all task objects in the scheduling system with optional filtering.
+            Tasks are yielded in chronological order, with unscheduled tasks last.
             Parameters:
                 - date: string (optional)
-                    The date key for filtering tasks.
+                    The date for filtering tasks.
                 - status: string (optional)
                     The task status for filtering ('uncompleted' or 'completed').
                 - assigned: bool (optional)
                     Whether to filter tasks by assignment state.
                 - staff_id: string (optional)
                     The staff id to filter tasks by assigned staff member.
+                - start: string (optional)
+                    The first date of a date range to filter by, inclusive. Ignored when date is given.
+                - end: string (optional)
+                    The last date of a date range to filter by, inclusive. Ignored when date is given.
             Returns:
-                - generator: yields tuples containing date key, status, assignment group, and task object. """
-
-        date_keys = [self.get_date_key(date)] if date else self.__tasks_by_date.keys()
+                - generator: yields tuples containing ordinal date key, status, assignment group, and task object.
+                  Occurrences of recurring task templates are generated for the dates covered. Without an end
+                  date they are generated up to RECURRING_HORIZON_DAYS days past today (or past start, if later);
+                  stored tasks are always included whatever their date. """
+
+        if date:
+            date_keys = [self.get_date_ordinal(date)]
+        elif self.__recurring:
+            date_keys = self.__recurring_date_keys(start, end)
+        else:
+            whole_schedule = start is None and end is None
+            yield from self.__iter_stored_tasks(self.__date_keys_between(start, end), status, assigned, staff_id,
+                                                whole_schedule)
+            return
+
+        if not self.__recurring:
+            yield from self.__iter_stored_tasks(date_keys, status, assigned, staff_id)
+            return
+
+        for date_key in date_keys:
+            yield from self.__iter_stored_tasks([date_key], status, assigned, staff_id)
+            if status in (None, "uncompleted"):
+                yield from self.__iter_recurring_tasks(date_key, assigned, staff_id)
+
+    def __recurring_date_keys(self, start: str = None, end: str = None):
+        """ Returns the date keys in a range holding stored tasks or recurring occurrences, in iteration order.
+            An open end is bounded for recurring templates by RECURRING_HORIZON_DAYS. """
+        stored = self.__date_keys_between(start, end)
+        date_keys = {date_key for date_key in stored if date_key != UNSCHEDULED}
+
+        first = self.get_date_ordinal(start) if start is not None else 1
+        if end is not None:
+            last = self.get_date_ordinal(end)
+        else:
+            last = max(today_key(), first) + self.RECURRING_HORIZON_DAYS
+        for template in self.__recurring.values():
+            date_keys.update(template.occurrences_between(first, last))
+
+        date_keys = sorted(date_keys)
+        if UNSCHEDULED in stored:
+            date_keys.append(UNSCHEDULED)
+        return date_keys
+
+    def __iter_stored_tasks(self, date_keys, status: str = None, assigned: bool = None, staff_id: str = None,
+                            whole_schedule: bool = False):
+        """ Yields the task objects stored in the schedule on the given dates that match the filters. """
+
+        # Use the staff or unassigned-pool index when it holds fewer tasks than the days being scanned.
+        candidates = self.__owner_index(assigned, staff_id)
+        if candidates is not None:
+            if whole_schedule:
+                scan_size = len(self.__task_locator)
+            else:
+                scan_size = sum(len(self.__task_ids_by_date.get(date_key, ())) for date_key in date_keys)
+            if len(candidates) < scan_size:
+                yield from self.__iter_indexed_tasks(candidates, date_keys, status)
+                return
 
         for date in date_keys:
             if date not in self.__tasks_by_date:
@@ -755,6 +1502,139 @@ class ZooSystem:
                                 continue
                         yield date, st, group, task
 
+    def __iter_recurring_tasks(self, date_key: int, assigned: bool = None, staff_id: str = None):
+        """ Yields the tasks recurring templates generate on a date, skipping any already in the schedule.
+            The task objects are built on demand and are not stored. """
+        for template in self.__recurring.values():
+            if not template.occurs_on(date_key) or (template.id, date_key) in self.__materialised:
+                continue
+            if staff_id is not None and template.staff_id != staff_id:
+                continue
+            if assigned is not None and (template.staff_id is not None) != assigned:
+                continue
+            yield date_key, "uncompleted", template.staff_id or "UNASSIGNED", template.build(date_key)
+
+    def __find_recurring(self, task_id: str, date_key: int = None):
+        """ Finds the recurring template occurrence generating a task id that is not stored in the schedule.
+            Returns a (template, date key) tuple for the earliest match, or None. """
+        best = None
+        for template in self.__recurring.values():
+            occurrence = template.occurrence_for(task_id, date_key)
+            if occurrence is None or (template.id, occurrence) in self.__materialised:
+                continue
+            if best is None or occurrence < best[1]:
+                best = (template, occurrence)
+        return best
+
+    def __materialise(self, date_key: int, owner_id: str, task):
+        """ Stores a recurring task occurrence returned by find_task_in_schedule, once a mutating call has
+            validated it and is about to change it. Tasks already in the schedule are left as they are. """
+        if (date_key, task.id) in self.__task_locator:
+            return
+        template, _ = self.__find_recurring(task.id, date_key)
+        self.add_task(task, date=date_key, staff_id=None if owner_id == "UNASSIGNED" else owner_id)
+        self.__materialised.add((template.id, date_key))
+        if owner_id != "UNASSIGNED":
+            self.__staff[owner_id].tasks.append(task)
+
+    @property
+    def recurring_tasks(self):
+        """ Returns the list of recurring task templates. """
+        return list(self.__recurring.values())
+
+    @journaled("start", "end")
+    def add_recurring_task(self, task_type: str, start: str, every: int = 1, end: str = None,
+                           enclosure_id: str = None, animal_names=None, staff_id: str = None):
+        """ Creates a recurring task template, e.g. daily feeding or weekly cleaning. Its tasks are not stored in
+            the schedule until they are assigned or completed.
+            Parameters:
+                - task_type: string
+                    The type of task to repeat ('Feeding', 'Cleaning', or 'Treatment').
+                - start: string
+                    The date of the first occurrence.
+                - every: integer (optional)
+                    The number of days between occurrences.
+                - end: string (optional)
+                    The last date an occurrence may fall on. Repeats indefinitely if not provided.
+                - enclosure_id: string (optional)
+                    The enclosure for Feeding and Cleaning tasks.
+                - animal_names: list or string (optional)
+                    For Feeding: list of animal names. For Treatment: a single animal name string.
+                - staff_id: string (optional)
+                    The staff member the generated tasks are assigned to.
+            Returns:
+                - template: RecurringTask
+                    The recurring task template that was created."""
+
+        normalised_type = task_type.strip().capitalize()
+        if enclosure_id is not None:
+            self.get_enclosure(enclosure_id)
+        if normalised_type == "Treatment" and isinstance(animal_names, str):
+            self.get_animal(animal_names)
+        if staff_id is not None:
+            animal_id = animal_names if normalised_type == "Treatment" else None
+            self.__check_can_assign(self.get_staff(staff_id), normalised_type, enclosure_id, animal_id)
+
+        first = self.get_date_ordinal(self.validate_date(start))
+        last = self.get_date_ordinal(self.validate_date(end)) if end is not None else None
+
+        self.__recurring_count += 1
+        template = RecurringTask(f"Rec-{self.__recurring_count}", normalised_type, first, every, last,
+                                 enclosure_id, animal_names, staff_id)
+        self.__recurring[template.id] = template
+        return template
+
+    @journaled()
+    def remove_recurring_task(self, template_id: str):
+        """ Removes a recurring task template. Tasks it generated that are already stored are kept.
+            Parameters:
+                - template_id: string
+                    The id of the recurring task template to remove."""
+        if self.__recurring.pop(template_id, None) is None:
+            raise NoSuchTaskError(f"No recurring task found with ID: {template_id}")
+        self.__materialised = {key for key in self.__materialised if key[0] != template_id}
+
+    def __owner_index(self, assigned: bool = None, staff_id: str = None):
+        """ Returns the task keys matching an assignment filter from the secondary indexes, or None if the
+            filter combination is not covered by an index. """
+        if staff_id is not None:
+            if assigned is False:
+                return {}
+            return self.__tasks_by_staff.get(staff_id, {})
+        if assigned is False:
+            return self.__unassigned_tasks
+        return None
+
+    def __iter_indexed_tasks(self, task_keys, date_keys: list, status: str = None):
+        """ Yields the located tasks for a set of task keys that fall on the given dates, in the same order
+            as a scan of the schedule would: by date, then uncompleted before completed. """
+        positions = {date_key: position for position, date_key in enumerate(date_keys)}
+        state_order = {"uncompleted": 0, "completed": 1}
+
+        hits = []
+        for task_key in task_keys:
+            location = self.__task_locator[task_key]
+            if location[0] in positions and (status is None or location[1] == status):
+                hits.append(location)
+        hits.sort(key=lambda location: (positions[location[0]], state_order[location[1]]))
+        yield from hits
+
+    def __date_keys_between(self, start: str = None, end: str = None):
+        """ Returns the scheduled date keys between two dates in chronological order. Without a start or end,
+            all dated keys are returned followed by the unscheduled key, if present. """
+        first_dated = bisect.bisect_right(self.__date_index, UNSCHEDULED)
+
+        if start is None and end is None:
+            return self.__date_index[first_dated:] + self.__date_index[:first_dated]
+
+        low = first_dated
+        high = len(self.__date_index)
+        if start is not None:
+            low = max(low, bisect.bisect_left(self.__date_index, self.get_date_ordinal(start)))
+        if end is not None:
+            high = bisect.bisect_right(self.__date_index, self.get_date_ordinal(end))
+        return self.__date_index[low:high]
+
     def task_exists(self, check_task, date: str = None):
         """ A helper method that checks whether a task object already exists within the scheduling system.
             Parameters:
@@ -765,49 +1645,62 @@ class ZooSystem:
             Returns:
                 - exists: bool
                     True if the task exists, otherwise False. """
-        for _, _, _, task in self.iter_tasks(date=date, status=None):
-            if task.id == check_task.id:
-                return True
+        dates = self.__task_dates_by_id.get(check_task.id)
+        if not dates:
             return False
+        if date is None:
+            return True
+        return self.get_date_ordinal(date) in dates
 
-    def get_task_by_id(self, task_id: str):
-        """ Retrieves a task object from the scheduling system based on its unique task id.
+    def get_task_by_id(self, task_id: str, date: str = None):
+        """ Retrieves a task object from the scheduling system based on its task id.
             Parameters:
                 - task_id: string
-                    The unique task id of task object to be retrieved.
+                    The task id of task object to be retrieved.
+                - date: string (optional)
+                    The scheduled date of the task, needed when the same id is scheduled in several years.
             Returns:
                 - task: Task
                     The task object matching the provided task id. """
 
-        for _, _, _, task in self.iter_tasks():
-            if task.id == task_id:
-                return task
-        raise NoSuchTaskError(f"No task found with ID: {task_id}")
+        return self.find_task_in_schedule(task_id, date)[3]
 
-    def find_task_in_schedule(self, task_id: str):
+    def find_task_in_schedule(self, task_id: str, date: str = None):
         """A helper method used to locate a task object within the scheduling system
         based on its task ID.
 
         Parameters:
             - task_id: string
-                The unique identifier of the task being searched for.
+                The identifier of the task being searched for.
+            - date: string (optional)
+                The scheduled date of the task. Task ids hold the day and month but not the year, so without a
+                date the earliest scheduled task with the id is returned, and unscheduled tasks come last.
 
         Returns:
             - result: tuple
                 A tuple containing:
-                    (date_key, state, owner_id, task)"""
-
-        for date_key, slot in self.__tasks_by_date.items():
-            for state in ("uncompleted", "completed"):
-                if state not in slot:
-                    continue
-                for owner_id, tasks in slot[state].items():
-                    for task in tasks:
-                        if task.id == task_id:
-                            return date_key, state, owner_id, task
-
-        raise NoSuchTaskError(f"No task found with ID: {task_id}")
-
+                    (date_key, state, owner_id, task), where date_key is the ordinal date key."""
+
+        dates = self.__task_dates_by_id.get(task_id, ())
+        date_key = self.get_date_ordinal(date) if date is not None else None
+        if date_key is not None:
+            location = self.__task_locator.get((date_key, task_id)) if date_key in dates else None
+        elif dates:
+            location = self.__task_locator[(min(dates, key=lambda key: (key == UNSCHEDULED, key)), task_id)]
+        else:
+            location = None
+
+        if location is None:
+            # Occurrences of recurring templates are built on demand and left out of the schedule.
+            found = self.__find_recurring(task_id, date_key)
+            if found is not None:
+                template, occurrence = found
+                location = (occurrence, "uncompleted", template.staff_id or "UNASSIGNED", template.build(occurrence))
+        if location is None:
+            raise NoSuchTaskError(f"No task found with ID: {task_id}")
+        return location
+
+    @journaled("date")
     def create_task_manual(self, task_type: str, enclosure_id: str = None, animal_names=None, date: str = None):
         """Creates a new task object manually and adds it to the scheduling system.
 
@@ -827,42 +1720,46 @@ class ZooSystem:
                 The task object that was created and stored."""
 
         normalised_type = task_type.strip().capitalize()
-        date_key = self.get_date_key(date)
+        date_key = self.get_date_ordinal(date)
+        task_date = format_date(date_key)
 
         if normalised_type == "Feeding":
             if enclosure_id is None or not animal_names:
                 raise IncompleteTaskError("Feeding requires enclosure ID and a list of animal names.")
             if not isinstance(animal_names, list):
                 raise TypeError("animal_names must be a list for Feeding tasks.")
-            new_task = FeedingTask(enclosure_id, animal_names, date_key)
+            new_task = FeedingTask(enclosure_id, animal_names, task_date)
 
         elif normalised_type == "Cleaning":
             if enclosure_id is None:
                 raise IncompleteTaskError("Cleaning requires enclosure ID.")
-            new_task = CleaningTask(enclosure_id, date_key)
+            new_task = CleaningTask(enclosure_id, task_date)
 
         elif normalised_type == "Treatment":
             if not isinstance(animal_names, str):
                 raise TypeError("Treatment requires a single animal name (string).")
-            new_task = TreatmentTask(animal_names, date_key)
+            new_task = TreatmentTask(animal_names, task_date)
 
         else:
             raise IncompleteTaskError(f"Invalid task type: {task_type}")
 
-        if self.task_exists(new_task, date):
+        if self.task_exists(new_task, date_key):
             raise IncompleteTaskError("Task already exists.")
 
-        self.add_task(new_task, date=date)
+        self.add_task(new_task, date=date_key)
         return new_task
 
-    def complete_task(self, task_id: str):
+    @journaled("date")
+    def complete_task(self, task_id: str, date: str = None):
         """Marks an existing task as completed after validating all completion requirements.
 
            Parameters:
                - task_id: string
-                   The unique identifier of the task to complete."""
+                   The identifier of the task to complete.
+               - date: string (optional)
+                   The scheduled date of the task, needed when the same id is scheduled in several years."""
 
-        date_key, state, owner_id, task = self.find_task_in_schedule(task_id)
+        date_key, state, owner_id, task = self.find_task_in_schedule(task_id, date)
 
         if state != "uncompleted":
             raise InvalidTaskAssignmentError("Task is already completed.")
@@ -893,6 +1790,7 @@ class ZooSystem:
             if animal.ailment:
                 raise IncompleteTaskError(f"{animal.name}'s treatment is not finished.")
 
+        self.__materialise(date_key, owner_id, task)
         slot = self.__tasks_by_date[date_key]
         uncompleted = slot["uncompleted"]
         completed = slot["completed"]
@@ -903,8 +1801,10 @@ class ZooSystem:
 
         completed.setdefault(owner_id, []).append(task)
         task.mark_complete()
+        self.__index_task(date_key, "completed", owner_id, task)
 
 
+    @journaled("date")
     def create_health_entry(self, animal_name: str, date: str, issue: str, details: str, severity: int, treatment: str):
         """Creates a new health record entry for a given animal and adds it to its
         medical history.
@@ -941,10 +1841,12 @@ class ZooSystem:
             raise ValueError("Severity must be between 0 and 3")
 
         animal = self.get_animal(animal_name)
-        date_key = self.validate_date(date)
+        self.validate_date(date)
+        date_key = self.get_date_ordinal(date)
 
         log_entry = Entry(date_key, issue, details, severity, treatment)
-        self.__health_records[animal_name].append(log_entry)
+        # Records are kept in chronological order, so entries added out of order are inserted in place.
+        bisect.insort(self.__health_records[animal_name], log_entry, key=lambda entry: entry.date_key)
         return log_entry
 
 
@@ -966,3 +1868,47 @@ class ZooSystem:
             raise NoSuchAnimalError(f"No health records exist for {animal_name}")
 
         return self.__health_records[animal_name]
+
+
+    def save(self, path: str):
+        """ Saves the complete state of the zoo system to a versioned binary snapshot file.
+            Parameters:
+                - path: string
+                    The file to write. An existing snapshot at this path is replaced atomically."""
+        snapshot.save(self, path)
+
+    @classmethod
+    def load(cls, path: str):
+        """ Loads a zoo system from a snapshot file written by save.
+            Parameters:
+                - path: string
+                    The snapshot file to read.
+            Returns:
+                - system: ZooSystem
+                    The restored zoo system, with every registry, schedule and index as it was when saved."""
+        system = snapshot.load(path)
+        if not isinstance(system, cls):
+            raise SnapshotError(f"Snapshot does not contain a {cls.__name__}")
+        return system
+
+    @classmethod
+    def recover(cls, zoo_name: str, journal_path: str, snapshot_path: str, sync_every: int = 1,
+                compact_bytes: int = DEFAULT_COMPACT_BYTES):
+        """ Restores a zoo system from its last snapshot and journal, and keeps journaling its mutations.
+            Parameters:
+                - zoo_name: string
+                    The name of the zoo, used when no snapshot exists yet.
+                - journal_path: string
+                    The journal file. It is created if it does not exist.
+                - snapshot_path: string
+                    The snapshot file read on recovery and rewritten by compaction.
+                - sync_every: integer (optional)
+                    The number of journal records written between fsync calls; 0 syncs only on close.
+                - compact_bytes: integer (optional)
+                    The journal size in bytes that triggers compaction into a new snapshot, or None.
+            Returns:
+                - system: ZooSystem
+                    The restored zoo system, with the journal attached as system.journal."""
+        system = cls.load(snapshot_path) if os.path.exists(snapshot_path) else cls(zoo_name)
+        Journal(system, journal_path, snapshot_path, sync_every, compact_bytes).replay()
+        return system
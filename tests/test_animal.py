@@ -8,11 +8,12 @@ This is my own work as defined by the University's Academic Integrity Policy.
 '''
 
 
-
+import pytest
 from domain.animals.animal_mammal import Mammal
 from domain.animals.animal_bird import Bird
 from domain.animals.animal_reptile import Reptile
 from exceptions import *
+from zoodata.zoo_data import species_catalog
 
 @pytest.fixture
 def bird():
@@ -81,3 +82,34 @@ def test_move_error_if_asleep(bird, capsys):
     bird.sleep()
     with pytest.raises(AnimalAsleepError):
         bird.move()
+
+def test_animals_share_species_record(bird):
+    other = Bird("Kiwi", "macaw", 3, "tropical aviary", ["nuts", "fruit", "seeds"], "squawk")
+    assert other.profile is bird.profile
+    assert isinstance(bird.diet, frozenset)
+
+def test_catalog_animals_share_catalog_record():
+    simba = Mammal.from_record("Simba", species_catalog["Lion"], 5)
+    nala = Mammal.from_record("Nala", species_catalog["Lion"], 4)
+    assert simba.profile is species_catalog["Lion"]
+    assert nala.profile is simba.profile
+    assert simba.can_eat("meat") is True
+
+def test_from_record_rejects_other_type():
+    with pytest.raises(NotInDatabaseError):
+        Bird.from_record("Simba", species_catalog["Lion"], 5)
+
+def test_animal_uses_slots(bird):
+    assert not hasattr(bird, "__dict__")
+    with pytest.raises(AttributeError):
+        bird.colour = "blue"
+
+def test_animal_hash_matches_eq(bird):
+    twin = Bird("Blue", "macaw", 3, "tropical aviary", ["seeds"], "squawk")
+    other = Bird("Mikey", "macaw", 3, "tropical aviary", ["seeds"], "squawk")
+    assert twin == bird
+    assert hash(twin) == hash(bird)
+    assert other != bird
+    assert {bird, twin, other} == {bird, other}
+    assert bird.key == ("Blue", "macaw")
+    assert bird != "Blue"
@@ -0,0 +1,47 @@
+'''
+File: test_dates.py
+Description: This module contains unit tests for the date parsing and formatting helpers.
+'''
+
+import pytest
+from datetime import date
+from exceptions import InvalidDateError
+from dates import UNSCHEDULED, format_date, parse_date, to_date_key, today_key
+
+
+def test_parse_date_returns_ordinal():
+    assert parse_date("05/06/2020") == date(2020, 6, 5).toordinal()
+    assert parse_date("05/06/2020") < parse_date("04/07/2020") < parse_date("01/01/2021")
+
+def test_parse_date_is_cached():
+    parse_date.cache_clear()
+    parse_date("05/06/2020")
+    parse_date("05/06/2020")
+    info = parse_date.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.maxsize is not None
+
+def test_parse_date_raises():
+    for text in ("2025/12/05", "05-12-2025", "05/14/2025", "32/12/2025", "wrong"):
+        with pytest.raises(InvalidDateError):
+            parse_date(text)
+
+def test_format_date_round_trip():
+    assert format_date(parse_date("05/06/2020")) == "05/06/2020"
+    assert format_date(UNSCHEDULED) == "UNSCHEDULED"
+
+def test_to_date_key():
+    assert to_date_key(None) == UNSCHEDULED
+    assert to_date_key("  TODAY  ") == today_key() == date.today().toordinal()
+    assert to_date_key("now") == today_key()
+    assert to_date_key(737581) == 737581
+    assert to_date_key("05/06/2020") == parse_date("05/06/2020")
+
+    with pytest.raises(TypeError):
+        to_date_key(10.5)
+    assert to_date_key(UNSCHEDULED) == UNSCHEDULED
+    assert to_date_key(date.max.toordinal()) == date.max.toordinal()
+    for key in (-1, date.max.toordinal() + 1):
+        with pytest.raises(InvalidDateError):
+            to_date_key(key)
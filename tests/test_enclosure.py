@@ -97,3 +97,22 @@ class TestEnclosure:
         assert "Animals:" in out
         assert "Simba" in out
 
+
+    def test_uses_slots(self, enclosure):
+        assert not hasattr(enclosure, "__dict__")
+
+    def test_equal_ids_hash_alike(self, enclosure):
+        same = Enclosure(80, "Savannah", "50Sav1")
+        assert same == enclosure
+        assert hash(same) == hash(enclosure)
+        assert len({enclosure, same}) == 1
+
+    def test_contains_is_ordered_set(self, enclosure, lion):
+        lion2 = Mammal("Nala", "Lion", 10, "savannah", ["meat"], "Raur")
+        enclosure.store(lion)
+        enclosure.store(lion2)
+        enclosure.store(lion)
+        assert enclosure.contains == [lion, lion2]
+        enclosure.contains.remove(lion)
+        assert lion not in enclosure.contains
+        assert enclosure.contains == [lion2]
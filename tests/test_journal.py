@@ -0,0 +1,287 @@
+'''
+File: test_journal.py
+Description: This module contains unit tests for the ZooSystem mutation journal, its replay and its compaction.
+'''
+
+import io
+import json
+import os
+
+import pytest
+from exceptions import *
+from dates import format_date, today_key
+from system import journal as journal_module
+from system.zoo_system import ZooSystem
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "zoo.journal"), str(tmp_path / "zoo.snap")
+
+
+def read_ops(path):
+    with open(path) as file:
+        return [json.loads(line)["op"] for line in file]
+
+
+def populate(system):
+    e = system.add_enclosure(50, "Savannah")
+    system.add_animals(row for row in [("Mammal", "Nala", "Lion", 10), ("Mammal", "Mufasa", "Lion", 12)])
+    system.assign_animal_to_enclosure("Nala", e.id)
+    system.assign_animal_to_enclosure("Mufasa", e.id)
+    system.add_staff_bulk(io.StringIO("name,age,gender,birthday,role\n"
+                                      "Bob Keeper,30,Male,01/01/1995,Keeper\n"
+                                      "Naruto Uzumaki,20,Male,15/06/1998,Veterinarian\n"))
+    keeper, vet = system.staff
+    system.assign_enclosure_to_keeper(e.id, keeper.id)
+    system.assign_animal_to_vet("Nala", vet.id)
+    system.schedule_feeding_auto("today")
+    system.auto_assign_tasks("today")
+    system.get_animal("Nala").ailment = True
+    system.create_health_entry("Nala", "05/06/2020", "Injury", "Scratched leg", 2, "Bandaging")
+    system.add_recurring_task("Cleaning", "01/06/2020", every=7, enclosure_id=e.id, staff_id=keeper.id)
+    for animal in system.animals:
+        animal.eat("meat")
+    task_id = next(t.id for _, _, _, t in system.iter_tasks(date="today", staff_id=keeper.id))
+    system.complete_task(task_id)
+    return task_id
+
+
+def state(system):
+    return ([str(a) for a in system.animals], [str(e) for e in system.enclosures], [str(s) for s in system.staff],
+            [(d, s, g, t.id) for d, s, g, t in system.iter_tasks()],
+            {name: [str(e) for e in entries] for name, entries in system.health_records.items()},
+            [r.id for r in system.recurring_tasks], [a.name for a in system.get_ailing_animals()])
+
+
+def test_recover_replays_journal(paths):
+    journal_path, snapshot_path = paths
+    system = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    task_id = populate(system)
+    system.journal.close()
+    assert system.journal is None
+
+    recovered = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    assert state(recovered) == state(system)
+    assert recovered.find_task_in_schedule(task_id)[1] == "completed"
+    assert recovered.journal_seq == system.journal_seq
+    recovered.journal.close()
+
+
+def test_journal_records_outermost_calls(paths):
+    journal_path, snapshot_path = paths
+    system = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    e = system.add_enclosure(50, "Savannah")
+    e.cleanliness = 1
+    system.schedule_horizon("today", 3)
+    with pytest.raises(NoSuchAnimalError):
+        system.remove_animal("Nobody")
+    system.journal.close()
+
+    assert read_ops(journal_path) == ["add_enclosure", "set", "schedule_horizon", "remove_animal", "failed"]
+    with open(journal_path) as file:
+        records = [json.loads(line) for line in file]
+    assert [r["seq"] for r in records] == [1, 2, 3, 4, 5]
+    assert records[2]["args"] == {"start": format_date(today_key()), "days": 3}
+    assert records[4]["ref"] == 4
+
+    recovered = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    assert state(recovered) == state(system)
+    recovered.journal.close()
+
+
+def test_recover_replays_recurring_task_assignment(paths):
+    journal_path, snapshot_path = paths
+    system = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    e = system.add_enclosure(100, "Savannah")
+    system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    keeper = system.staff[0]
+    system.assign_enclosure_to_keeper(e.id, keeper.id)
+    system.add_recurring_task("Cleaning", "01/06/2020", every=7, enclosure_id=e.id)
+    assert "Cln-100Sav1-08/06" in [t.id for _, _, _, t in system.iter_tasks(start="01/06/2020", end="30/06/2020")]
+    system.assign_task_to_staff(keeper.id, "Cln-100Sav1-08/06")
+    with pytest.raises(InvalidTaskAssignmentError):
+        system.complete_task("Cln-100Sav1-15/06")
+    assert list(system.tasks_by_date) == ["08/06/2020"]
+    system.assign_task_to_staff(keeper.id, "Cln-100Sav1-15/06", "15/06/2020")
+    system.complete_task("Cln-100Sav1-15/06")
+    system.journal.close()
+
+    recovered = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    assert state(recovered) == state(system)
+    assert recovered.find_task_in_schedule("Cln-100Sav1-08/06")[2] == keeper.id
+    assert recovered.get_task_by_id("Cln-100Sav1-08/06") in recovered.staff[0].tasks
+    assert recovered.find_task_in_schedule("Cln-100Sav1-15/06")[1] == "completed"
+    recovered.journal.close()
+
+
+def test_recover_replays_staff_work(paths):
+    journal_path, snapshot_path = paths
+    system = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    populate(system)
+    keeper, vet = system.staff
+    e = system.enclosures[0]
+    vet.treat_animal("Nala")
+    with pytest.raises(CannotRemoveAnimalError):
+        system.remove_animal("Nala")
+    keeper.set_working_enclosure(e.id)
+    system.journal.close()
+
+    recovered = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    assert state(recovered) == state(system)
+    r_keeper, r_vet = recovered.staff
+    nala = recovered.get_animal("Nala")
+    assert r_vet.working_animal is nala
+    assert (nala.treatment, nala.treated_by) == (True, vet.id)
+    assert r_keeper.working_enclosure is recovered.enclosures[0]
+    with pytest.raises(CannotRemoveAnimalError):
+        recovered.remove_animal("Nala")
+
+    # Healing and stopping work are journaled too.
+    r_vet.heal_animal()
+    r_keeper.working_enclosure = None
+    recovered.journal.close()
+    again = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    assert again.staff[1].working_animal is None
+    assert again.staff[0].working_enclosure is None
+    nala = again.get_animal("Nala")
+    assert (nala.ailment, nala.treatment, nala.treated_by) == (False, False, None)
+    again.remove_animal("Nala")
+    again.journal.close()
+
+
+def test_replay_checks_recorded_failures(paths):
+    journal_path, snapshot_path = paths
+    # The last record belongs to a call still running when the process stopped, so its failure is ignored.
+    with open(journal_path, "w") as file:
+        file.write('{"seq":1,"op":"add_enclosure","args":{"size":50,"type":"Savannah"}}\n'
+                   '{"seq":2,"op":"remove_animal","args":{"animal_name":"Nobody"}}\n')
+    recovered = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    assert [e.id for e in recovered.enclosures] == ["50Sav1"]
+    recovered.journal.close()
+
+    # A call recorded as failed that succeeds on replay means the journal no longer matches the system.
+    with open(journal_path, "w") as file:
+        file.write('{"seq":1,"op":"add_enclosure","args":{"size":50,"type":"Savannah"}}\n'
+                   '{"seq":2,"op":"failed","ref":1}\n')
+    with pytest.raises(JournalError):
+        ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+
+
+def test_journal_accepts_any_argument_the_method_accepts(paths):
+    journal_path, snapshot_path = paths
+    system = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    system.add_enclosure(50, "Savannah").cleanliness = 1
+    assert len(system.schedule_horizon("01/01/2030", 3, kinds={"Cleaning"})) == 3
+    system.add_animals(("Mammal", name, "Lion", 5) for name in ("Nala", "Mufasa"))
+    system.journal.close()
+    assert read_ops(journal_path) == ["add_enclosure", "set", "schedule_horizon", "add_animals"]
+
+    recovered = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    assert state(recovered) == state(system)
+    recovered.journal.close()
+
+    value = {"kinds": frozenset({"Feeding"}), "row": ("Nala", 5), "keys": {1: {"__task__"}}, "days": range(2)}
+    assert journal_module._decode(json.loads(json.dumps(journal_module._encode(value)))) == \
+           {"kinds": frozenset({"Feeding"}), "row": ("Nala", 5), "keys": {1: {"__task__"}}, "days": [0, 1]}
+    with pytest.raises(TypeError):
+        journal_module._encode(object())
+
+
+def test_unencodable_arguments_fall_back_to_a_snapshot(paths, monkeypatch):
+    journal_path, snapshot_path = paths
+    system = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path, compact_bytes=None)
+    system.add_enclosure(50, "Savannah")
+
+    def refuse(value):
+        raise TypeError("Cannot journal this value")
+    monkeypatch.setattr(journal_module, "_encode", refuse)
+    system.add_enclosure(50, "Savannah")
+    monkeypatch.undo()
+    system.add_enclosure(50, "Savannah")
+    system.journal.close()
+
+    # The unrecorded call is in the snapshot, and sequence numbers have no gaps.
+    assert read_ops(journal_path) == ["add_enclosure"]
+    with open(journal_path) as file:
+        assert [json.loads(line)["seq"] for line in file] == [2]
+    recovered = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    assert [e.id for e in recovered.enclosures] == ["50Sav1", "50Sav2", "50Sav3"]
+    recovered.journal.close()
+
+
+def test_torn_final_record_is_discarded(paths):
+    journal_path, snapshot_path = paths
+    system = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    system.add_enclosure(50, "Savannah")
+    system.journal.close()
+    with open(journal_path, "ab") as file:
+        file.write(b'{"seq":2,"op":"add_enc')
+
+    recovered = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    assert [e.id for e in recovered.enclosures] == ["50Sav1"]
+    recovered.add_enclosure(50, "Savannah")
+    recovered.journal.close()
+    assert read_ops(journal_path) == ["add_enclosure", "add_enclosure"]
+
+
+def test_corrupt_record_raises(paths):
+    journal_path, snapshot_path = paths
+    with open(journal_path, "w") as file:
+        file.write('garbage\n{"seq":2,"op":"add_enclosure","args":{"size":50,"type":"Savannah"}}\n')
+    with pytest.raises(JournalError):
+        ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+
+
+def test_replay_rejects_unknown_operations(paths):
+    journal_path, snapshot_path = paths
+    with open(journal_path, "w") as file:
+        file.write('{"seq":1,"op":"save","args":{"path":"elsewhere"}}\n')
+    with pytest.raises(JournalError):
+        ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+
+
+def test_sync_batching(paths, monkeypatch):
+    journal_path, snapshot_path = paths
+    synced = []
+    monkeypatch.setattr(journal_module.os, "fsync", synced.append)
+    system = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path, sync_every=3)
+    for _ in range(7):
+        system.add_enclosure(50, "Savannah")
+    assert len(synced) == 2
+    # Records are flushed even when they are not yet synced.
+    assert len(read_ops(journal_path)) == 7
+    system.journal.close()
+    assert len(synced) == 3
+
+
+def test_compaction_folds_journal_into_snapshot(paths):
+    journal_path, snapshot_path = paths
+    system = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path, compact_bytes=500)
+    populate(system)
+    system.journal.wait()
+    assert os.path.exists(snapshot_path)
+    assert system.journal.size < 1000
+    assert ZooSystem.load(snapshot_path).journal_seq > 0
+    system.journal.close()
+
+    recovered = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    assert state(recovered) == state(system)
+    recovered.journal.close()
+
+
+def test_replay_skips_records_already_in_snapshot(paths):
+    journal_path, snapshot_path = paths
+    system = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path, compact_bytes=None)
+    system.add_enclosure(50, "Savannah")
+    system.add_enclosure(50, "Savannah")
+    # A crash after the snapshot was written but before the journal was trimmed.
+    system.save(snapshot_path)
+    system.add_enclosure(50, "Savannah")
+    system.journal.close()
+
+    recovered = ZooSystem.recover("Sue's Zoo", journal_path, snapshot_path)
+    assert [e.id for e in recovered.enclosures] == ["50Sav1", "50Sav2", "50Sav3"]
+    recovered.journal.compact()
+    assert read_ops(journal_path) == []
+    recovered.journal.close()
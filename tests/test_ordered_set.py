@@ -0,0 +1,32 @@
+'''
+File: test_ordered_set.py
+Description: This module contains unit tests for OrderedSet objects.
+'''
+
+import pytest
+from domain.ordered_set import OrderedSet
+
+
+def test_keeps_insertion_order_without_duplicates():
+    items = OrderedSet(["b", "a", "b"])
+    items.add("c")
+    items.append("a")
+    assert list(items) == ["b", "a", "c"]
+    assert len(items) == 3
+    assert items.first() == "b"
+
+def test_equality_with_lists_and_sets():
+    items = OrderedSet([1, 2])
+    assert items == [1, 2]
+    assert items != [2, 1]
+    assert items == {2, 1}
+    assert OrderedSet() == []
+
+def test_remove_and_discard():
+    items = OrderedSet([1, 2, 3])
+    items.remove(2)
+    items.discard(5)
+    assert items == [1, 3]
+    with pytest.raises(KeyError):
+        items.remove(2)
+    assert OrderedSet().first() is None
@@ -0,0 +1,108 @@
+'''
+File: test_snapshot.py
+Description: This module contains unit tests for saving and loading ZooSystem snapshots.
+'''
+
+import pickle
+
+import pytest
+from exceptions import *
+from system import snapshot
+from system.zoo_system import ZooSystem
+from zoodata.zoo_data import species_catalog
+
+
+@pytest.fixture
+def system():
+    system = ZooSystem("Sue's Zoo")
+    e = system.add_enclosure(50, "Savannah")
+    system.add_animal("Mammal", "Nala", "Lion", 10)
+    system.add_animal("Mammal", "Mufasa", "Lion", 12)
+    system.assign_animal_to_enclosure("Nala", e.id)
+    system.assign_animal_to_enclosure("Mufasa", e.id)
+    system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    system.add_staff("Naruto Uzumaki", 20, "Male", "15/06/1998", role="Veterinarian")
+    keeper, vet = system.staff
+    system.assign_enclosure_to_keeper(e.id, keeper.id)
+    system.assign_animal_to_vet("Nala", vet.id)
+    system.schedule_feeding_auto("06/06/2020")
+    system.schedule_cleaning_auto("06/06/2020")
+    system.auto_assign_tasks("06/06/2020")
+    system.create_health_entry("Nala", "05/06/2020", "Injury", "Scratched leg", 2, "Bandaging")
+    system.add_recurring_task("Cleaning", "01/06/2020", every=7, enclosure_id=e.id, staff_id=keeper.id)
+    return system
+
+
+def test_save_and_load_round_trip(system, tmp_path):
+    path = tmp_path / "zoo.snap"
+    system.save(str(path))
+    loaded = ZooSystem.load(str(path))
+
+    assert [a.name for a in loaded.animals] == ["Nala", "Mufasa"]
+    assert [s.id for s in loaded.staff] == [s.id for s in system.staff]
+    assert list(loaded.tasks_by_date) == list(system.tasks_by_date)
+    assert [t.id for _, _, _, t in loaded.iter_tasks(date="06/06/2020")] == \
+           [t.id for _, _, _, t in system.iter_tasks(date="06/06/2020")]
+    assert [str(e) for e in loaded.get_animal_health_record("Nala")] == \
+           [str(e) for e in system.get_animal_health_record("Nala")]
+    assert [r.id for r in loaded.recurring_tasks] == [r.id for r in system.recurring_tasks]
+
+    # References are restored as shared objects, not copies.
+    e = loaded.enclosures[0]
+    keeper = loaded.staff[0]
+    assert list(e.contains)[0] is loaded.get_animal("Nala")
+    assert e in keeper.assigned_enclosures
+    assert loaded.get_animal("Nala").profile is species_catalog["Lion"]
+
+
+def test_loaded_system_stays_consistent(system, tmp_path):
+    path = tmp_path / "zoo.snap"
+    system.save(str(path))
+    loaded = ZooSystem.load(str(path))
+    keeper = loaded.staff[0]
+
+    loaded.get_animal("Mufasa").ailment = True
+    assert [a.name for a in loaded.get_ailing_animals()] == ["Mufasa"]
+    assert system.get_ailing_animals() == []
+
+    for animal in loaded.animals:
+        animal.eat("meat")
+    assert loaded.get_hungry_animals(loaded.enclosures[0].id) == []
+    assert len(system.get_hungry_animals(system.enclosures[0].id)) == 2
+
+    task_id = next(t.id for _, _, _, t in loaded.iter_tasks(date="06/06/2020", staff_id=keeper.id))
+    loaded.complete_task(task_id)
+    assert loaded.find_task_in_schedule(task_id)[1] == "completed"
+    assert system.find_task_in_schedule(task_id)[1] == "uncompleted"
+
+    loaded.add_enclosure(50, "Savannah")
+    assert loaded.enclosures[-1].id == "50Sav2"
+
+
+def test_save_replaces_existing_file(system, tmp_path):
+    path = tmp_path / "zoo.snap"
+    path.write_bytes(b"old")
+    system.save(str(path))
+    assert path.read_bytes().startswith(snapshot.MAGIC)
+    assert not (tmp_path / "zoo.snap.tmp").exists()
+
+
+def test_load_rejects_bad_header(system):
+    data = snapshot.dumps(system)
+    with pytest.raises(SnapshotError):
+        snapshot.loads(b"NOTSNAP" + data[7:])
+    with pytest.raises(SnapshotError):
+        snapshot.loads(snapshot.HEADER.pack(snapshot.MAGIC, snapshot.VERSION + 1) + data[snapshot.HEADER.size:])
+    with pytest.raises(SnapshotError):
+        snapshot.loads(data[:4])
+    with pytest.raises(SnapshotError):
+        snapshot.loads(data[:len(data) // 2])
+
+
+def test_load_rejects_forbidden_objects():
+    payload = pickle.dumps(print)
+    with pytest.raises(SnapshotError):
+        snapshot.loads(snapshot.HEADER.pack(snapshot.MAGIC, snapshot.VERSION) + payload)
+    payload = pickle.dumps(["not", "a", "zoo"])
+    with pytest.raises(SnapshotError):
+        snapshot.loads(snapshot.HEADER.pack(snapshot.MAGIC, snapshot.VERSION) + payload)
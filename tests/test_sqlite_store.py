@@ -0,0 +1,160 @@
+'''
+File: test_sqlite_store.py
+Description: This module contains unit tests for the SQLite store and its indexed schedule and health queries.
+'''
+
+import sqlite3
+
+import pytest
+from exceptions import *
+from system.sqlite_store import SqliteStore
+from system.zoo_system import ZooSystem
+
+
+@pytest.fixture
+def system():
+    system = ZooSystem("Sue's Zoo")
+    e = system.add_enclosure(50, "Savannah")
+    system.add_animal("Mammal", "Nala", "Lion", 10)
+    system.add_animal("Mammal", "Mufasa", "Lion", 12)
+    system.add_animal("Mammal", "Simba", "Lion", 2)
+    system.assign_animal_to_enclosure("Nala", e.id)
+    system.assign_animal_to_enclosure("Mufasa", e.id)
+    system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    system.add_staff("Naruto Uzumaki", 20, "Male", "15/06/1998", role="Veterinarian")
+    keeper, vet = system.staff
+    system.assign_enclosure_to_keeper(e.id, keeper.id)
+    system.assign_animal_to_vet("Nala", vet.id)
+    system.get_animal("Nala").ailment = True
+    system.schedule_horizon("05/06/2020", 3)
+    system.create_task_manual("Cleaning", enclosure_id=e.id)
+    system.auto_assign_tasks("06/06/2020")
+    system.create_health_entry("Nala", "07/06/2020", "Injury", "Scratched leg", 2, "Bandaging")
+    system.create_health_entry("Nala", "05/06/2020", "Checkup", "Routine", 0, "None")
+    system.create_health_entry("Mufasa", "06/06/2020", "Illness", "Fever", 3, "Antibiotics")
+    return system
+
+
+@pytest.fixture
+def store(system):
+    with SqliteStore() as store:
+        store.save(system)
+        yield store
+
+
+def ids(rows):
+    return [(date_key, status, group, task.id) for date_key, status, group, task in rows]
+
+
+def test_save_copies_every_table(system, store):
+    assert store.count("animals") == 3
+    assert store.count("enclosures") == 1
+    assert store.count("staff") == 2
+    assert store.count("tasks") == len(list(system.iter_tasks()))
+    assert store.count("health_entries") == 3
+    assert store.count("keeper_enclosures") == 1
+    assert store.count("vet_animals") == 1
+    assert store.get_animal_names_in_enclosure(system.enclosures[0].id) == ["Nala", "Mufasa"]
+
+    with pytest.raises(ValueError):
+        store.count("sqlite_master")
+
+
+def test_iter_tasks_matches_zoo_system(system, store):
+    keeper, vet = system.staff
+    queries = [{}, {"date": "06/06/2020"}, {"date": "UNSCHEDULED"}, {"start": "06/06/2020"},
+               {"start": "05/06/2020", "end": "06/06/2020"}, {"status": "uncompleted"},
+               {"assigned": True}, {"assigned": False}, {"staff_id": keeper.id},
+               {"date": "06/06/2020", "staff_id": vet.id}]
+    for query in queries:
+        assert ids(store.iter_tasks(**query)) == ids(system.iter_tasks(**query)), query
+
+    _, _, _, task = next(store.iter_tasks(date="06/06/2020", staff_id=vet.id))
+    assert task.type == "Treatment"
+    assert task.animal_id == "Nala"
+    assert task.date == "06/06/2020"
+    assert task.assigned_to == vet.id
+    assert task.complete is False
+
+
+def test_save_replaces_previous_contents(system, store):
+    task_id = next(t.id for _, _, _, t in system.iter_tasks(date="06/06/2020", staff_id=system.staff[1].id))
+    system.get_animal("Nala").ailment = False
+    system.complete_task(task_id)
+    system.remove_animal("Simba")
+    store.save(system)
+
+    assert store.count("animals") == 2
+    assert ids(store.iter_tasks(status="completed")) == ids(system.iter_tasks(status="completed"))
+    _, _, _, task = next(store.iter_tasks(status="completed"))
+    assert task.complete is True
+
+
+def test_health_queries(system, store):
+    assert [str(e) for e in store.get_animal_health_record("Nala")] == \
+           [str(e) for e in system.get_animal_health_record("Nala")]
+    assert [(name, e.severity) for name, e in store.iter_health_entries(min_severity=2)] == \
+           [("Mufasa", 3), ("Nala", 2)]
+    assert [name for name, _ in store.iter_health_entries(start="06/06/2020", end="06/06/2020")] == ["Mufasa"]
+
+    with pytest.raises(NoSuchAnimalError):
+        store.get_animal_health_record("Simba")
+    with pytest.raises(TypeError):
+        store.get_animal_health_record(5)
+    with pytest.raises(InvalidDateError):
+        list(store.iter_tasks(date="2020/06/06"))
+
+
+def test_file_store_persists(system, tmp_path):
+    path = str(tmp_path / "zoo.db")
+    with SqliteStore(path) as store:
+        store.save(system)
+    with SqliteStore(path) as store:
+        assert ids(store.iter_tasks()) == ids(system.iter_tasks())
+
+
+def test_save_writes_only_changed_rows(system, tmp_path):
+    path = str(tmp_path / "zoo.db")
+    with SqliteStore(path) as store:
+        store.save(system)
+        # Marks a row behind the store's back; a save that rewrote every row would undo it.
+        with sqlite3.connect(path) as raw:
+            raw.execute("UPDATE staff SET age = 99 WHERE role = 'Veterinarian'")
+        system.get_animal("Simba").hungry = False
+        system.add_enclosure(80, "Aquarium")
+        system.create_health_entry("Simba", "08/06/2020", "Checkup", "Routine", 1, "None")
+        store.save(system)
+
+        assert store.count("enclosures") == 2
+        assert [(name, e.severity) for name, e in store.iter_health_entries(start="08/06/2020")] == [("Simba", 1)]
+        assert ids(store.iter_tasks()) == ids(system.iter_tasks())
+        with sqlite3.connect(path) as raw:
+            assert raw.execute("SELECT age FROM staff WHERE role = 'Veterinarian'").fetchone() == (99,)
+            assert raw.execute("SELECT hungry FROM animals WHERE name = 'Simba'").fetchone() == (0,)
+        # Saving keeps the original row order.
+        assert store.get_animal_names_in_enclosure(system.enclosures[0].id) == ["Nala", "Mufasa"]
+
+
+def test_save_copies_assignments_and_recurring_tasks(system, store):
+    keeper, vet = system.staff
+    e = system.enclosures[0]
+    assert store.get_keeper_enclosure_ids(keeper.id) == [e.id]
+    assert store.get_vet_animal_names(vet.id) == ["Nala"]
+    assert store.get_recurring_tasks() == []
+
+    daily = system.add_recurring_task("Feeding", "01/06/2020", enclosure_id=e.id, animal_names=["All Animals"])
+    weekly = system.add_recurring_task("Cleaning", "01/06/2020", every=7, end="30/06/2020", enclosure_id=e.id,
+                                       staff_id=keeper.id)
+    system.assign_animal_to_vet("Mufasa", vet.id)
+    second = system.add_enclosure(80, "Aquarium")
+    system.assign_enclosure_to_keeper(second.id, keeper.id)
+    store.save(system)
+
+    assert [str(r) for r in store.get_recurring_tasks()] == [str(daily), str(weekly)]
+    assert store.get_recurring_tasks()[1].occurs_on(weekly.end - 1)
+    assert store.get_keeper_enclosure_ids(keeper.id) == [e.id, second.id]
+    assert store.get_vet_animal_names(vet.id) == ["Nala", "Mufasa"]
+
+    system.remove_recurring_task(daily.id)
+    store.save(system)
+    assert [r.id for r in store.get_recurring_tasks()] == [weekly.id]
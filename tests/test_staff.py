@@ -59,3 +59,5 @@ def test_repr_without_role(staff):
 def test_str_without_role(staff):
     assert str(staff) == "ID: PetPar01 | Role: None"
 
+def test_staff_uses_slots(staff):
+    assert not hasattr(staff, "__dict__")
@@ -9,6 +9,7 @@ This is my own work as defined by the University's Academic Integrity Policy.
 '''
 
 
+import io
 import pytest
 from domain.enclosures.enclosure import Enclosure
 from exceptions import *
@@ -48,9 +49,8 @@ def test_enclosure_code(system):
     assert code4 == "20TroAvi1"
 
 def test_enclosure_code_same_type(system):
-    e1 = Enclosure(50, "Savannah", "50Sav1")
-    e2 = Enclosure(50, "Savannah", "50Sav2")
-    system.enclosures.extend([e1,e2])
+    system.add_enclosure(50, "Savannah")
+    system.add_enclosure(50, "Savannah")
     code = system.create_enclosure_code("Savannah", 50)
     assert code == "50Sav3"
 
@@ -67,40 +67,49 @@ def test_create_id_raises(system):
         system.create_staff_id("Zendaya", "15/06/1998")
 
 
-class FakeAnimal:
-    def __init__(self, name):
-        self.name = name
-class FakeStaff:
-    def __init__(self, id):
-        self.id = id
-
-
 def test_get_animal(system):
-    a = FakeAnimal("Simba")
-    system.animals.append(a)
-    assert system.get_animal("Simba") == a
+    a = system.add_animal("Mammal", "Simba", "Lion", 5)
+    assert system.get_animal("Simba") is a
     with pytest.raises(NoSuchAnimalError):
         system.get_animal("Zendaya")
     with pytest.raises(TypeError):
         system.get_animal(50)
 
 def test_get_staff(system):
-    a = FakeStaff("NarUzu98")
-    system.staff.append(a)
-    assert system.get_staff("NarUzu98") == a
+    a = system.add_staff("Naruto Uzumaki", 20, "Male", "15/06/1998")
+    assert system.get_staff("NarUzu98") is a
     with pytest.raises(NoSuchStaffError):
         system.get_staff("Zendaya")
     with pytest.raises(TypeError):
         system.get_staff(50)
 
-def test_get_enclosure(system, enclosure):
-    system.enclosures.append(enclosure)
+def test_get_enclosure(system):
+    enclosure = system.add_enclosure(50, "Savannah")
     assert system.get_enclosure("50Sav1") is enclosure
     with pytest.raises(NoSuchEnclosureError):
         system.get_enclosure("Zendaya")
     with pytest.raises(TypeError):
         system.get_enclosure(50)
 
+def test_registries_keep_insertion_order(system):
+    system.add_enclosure(50, "Savannah")
+    system.add_enclosure(20, "Tropical Aviary")
+    system.add_animal("Mammal", "Nala", "Lion", 10)
+    system.add_animal("Bird", "Blue", "Macaw", 5)
+    system.add_animal("Mammal", "Mufasa", "Lion", 12)
+
+    assert [e.id for e in system.enclosures] == ["50Sav1", "20TroAvi1"]
+    assert [a.name for a in system.animals] == ["Nala", "Blue", "Mufasa"]
+
+    system.remove_animal("Blue")
+    assert [a.name for a in system.animals] == ["Nala", "Mufasa"]
+    with pytest.raises(NoSuchAnimalError):
+        system.get_animal("Blue")
+
+    system.animals.clear()
+    assert len(system.animals) == 2
+
+
 def test_add_enclosure(system):
     assert system.enclosures == []
 
@@ -172,6 +181,30 @@ def test_add_animal_raises(system):
 
 
 
+def test_add_animal_uses_species_catalog(system):
+    a = system.add_animal("  mammal ", "Simba", "  lion ", 5)
+    assert a.species == "Lion"
+    assert a.enclosure == "Savannah"
+    assert a.diet == species_catalog["Lion"].diet
+
+    with pytest.raises(NotInDatabaseError):
+        system.add_animal("Bird", "Leo", "Lion", 5)
+    with pytest.raises(NotInDatabaseError):
+        system.add_animal("Reptile", "Blue", "Macaw", 5)
+    with pytest.raises(ValueError):
+        system.add_animal("Mammal", "Old", "Lion", species_catalog["Lion"].max_age + 1)
+    assert [animal.name for animal in system.animals] == ["Simba"]
+
+def test_species_catalog_records():
+    record = species_catalog["Sea Lion"]
+    assert record.type == "Mammal"
+    assert record.enclosure == "Coastal Pool"
+    assert isinstance(record.diet, frozenset)
+    assert set(species_catalog) == set(animals)
+    with pytest.raises(AttributeError):
+        record.max_age = 100
+
+
 def test_add_staff(system):
     assert system.staff == []
     system.add_staff("Peter Parker", 18, "Male", "01/12/2007")
@@ -315,6 +348,24 @@ def test_assign_animal_to_vet_raises(system):
         system.assign_animal_to_vet("Nala", vet2.id)
 
 
+def test_vet_assignment_released_on_removal(system):
+    system.add_animal("Mammal", "Nala", "Lion", 10)
+    system.add_staff("Naruto Uzumaki", 20, "Male", "15/06/1998", role="Veterinarian")
+    system.add_staff("Sakura Haruno", 22, "Female", "12/03/1999", role="Veterinarian")
+
+    a = system.animals[0]
+    vet1 = system.staff[0]
+    vet2 = system.staff[1]
+
+    system.assign_animal_to_vet("Nala", vet1.id)
+    system.remove_staff(vet1.id)
+    system.assign_animal_to_vet("Nala", vet2.id)
+    assert a in vet2.assigned_animals
+
+    system.remove_animal("Nala")
+    assert a not in vet2.assigned_animals
+
+
 def test_assign_enclosure_to_keeper(system):
     system.add_enclosure(50, "Savannah")
     system.add_enclosure(100, "Savannah")
@@ -515,4 +566,150 @@ def test_remove_enclosure_raises(system):
     system.assign_animal_to_enclosure("Nala", "50Sav1")
 
     with pytest.raises(CannotRemoveEnclosureError):
-        system.remove_enclosure("50Sav1")
\ No newline at end of file
+        system.remove_enclosure("50Sav1")
+
+def test_enclosure_code_never_reused(system):
+    system.add_enclosure(100, "Savannah")
+    system.add_enclosure(100, "Savannah")
+    third = system.add_enclosure(100, "Savannah")
+    assert third.id == "100Sav3"
+
+    system.remove_enclosure("100Sav1")
+    fourth = system.add_enclosure(100, "Savannah")
+    assert fourth.id == "100Sav4"
+    assert len({e.id for e in system.enclosures}) == 3
+
+    system.remove_enclosure("100Sav4")
+    assert system.create_enclosure_code("Savannah", 100) == "100Sav5"
+
+def test_enclosure_code_bulk(system):
+    ids = {system.add_enclosure(10, "Savannah").id for _ in range(2000)}
+    assert len(ids) == 2000
+    assert "10Sav2000" in ids
+
+def test_staff_ids_stay_unique(system):
+    first = system.add_staff("Naruto Uzumaki", 20, "Male", "15/06/1998")
+    second = system.add_staff("Narumi Uzuki", 30, "Female", "01/01/1998", role="Keeper")
+    third = system.add_staff("Naruki Uzura", 40, "Male", "02/02/1998", role="Veterinarian")
+    assert [first.id, second.id, third.id] == ["NarUzu98", "2NarUzu98", "3NarUzu98"]
+
+    system.remove_staff(second.id)
+    fourth = system.add_staff("Narumi Uzuki", 30, "Female", "01/01/1998")
+    assert fourth.id == "4NarUzu98"
+
+    with pytest.raises(DuplicateError):
+        system.add_staff("Narumi Uzuki", 31, "Female", "01/01/1998")
+
+def test_staff_ids_bulk(system):
+    ids = {system.add_staff(f"Sam Seasonal{i}", 20, "Male", f"{i % 28 + 1:02d}/01/1990").id
+           for i in range(2000)}
+    assert len(ids) == 2000
+    assert len(system.staff) == 2000
+
+def test_add_animals_commits_valid_batch(system):
+    report = system.add_animals([
+        ("Mammal", "Nala", "Lion", 10),
+        {"type": "Mammal", "name": "Mufasa", "species": "lion", "age": 12},
+        ("Bird", "Zazu", "Owl", 3),
+    ])
+    assert report.ok
+    assert report.committed
+    assert [a.name for a in report.added] == ["Nala", "Mufasa", "Zazu"]
+    assert [a.name for a in system.animals] == ["Nala", "Mufasa", "Zazu"]
+    assert report.summary() == "3 animals added, 0 row(s) rejected."
+
+def test_add_animals_atomic_rejects_whole_batch(system):
+    system.add_animal("Mammal", "Nala", "Lion", 10)
+    report = system.add_animals([
+        ("Mammal", "Simba", "Lion", 1),
+        ("Mammal", "Nala", "Lion", 4),
+        ("Mammal", "Scar", "Dragon", 4),
+        ("Mammal", "Simba", "Lion", 2),
+        ("Mammal", "Kiara"),
+    ])
+    assert not report.committed
+    assert [(row, label) for row, label, _ in report.errors] == [(1, "Nala"), (2, "Scar"), (3, "Simba"), (4, None)]
+    assert [type(e) for _, _, e in report.errors] == [DuplicateError, NotInDatabaseError, DuplicateError, TypeError]
+    assert [a.name for a in system.animals] == ["Nala"]
+
+def test_add_animals_partial(system):
+    report = system.add_animals([("Mammal", "Simba", "Lion", 1), ("Mammal", "Old", "Lion", 500)], atomic=False)
+    assert report.committed
+    assert [a.name for a in system.animals] == ["Simba"]
+    assert len(report.errors) == 1
+    assert isinstance(report.errors[0][2], ValueError)
+
+def test_add_staff_bulk_from_records(system):
+    report = system.add_staff_bulk([
+        ("Naruto Uzumaki", 20, "Male", "15/06/1998", "Keeper"),
+        {"name": "Narumi Uzuki", "age": 30, "gender": "Female", "birthday": "01/01/1998", "role": "veterinarian"},
+        ("Sakura Haruno", 22, "Female", "12/03/1999"),
+    ])
+    assert report.committed and report.ok
+    assert [s.id for s in system.staff] == ["NarUzu98", "2NarUzu98", "SakHar99"]
+    assert [s.role for s in system.staff] == ["Keeper", "Veterinarian", None]
+
+def test_add_staff_bulk_reports_bad_rows(system):
+    system.add_staff("Naruto Uzumaki", 20, "Male", "15/06/1998")
+    report = system.add_staff_bulk([
+        ("Sakura Haruno", 22, "Female", "12/03/1999"),
+        ("Naruto Uzumaki", 20, "Male", "15/06/1998"),
+        ("Kakashi Hatake", 35, "Male", "31/02/1985"),
+        ("Sasuke Uchiha", 20, "Male", "23/07/1998", "Ninja"),
+        ("Sakura Haruno", 22, "Female", "12/03/1999"),
+    ])
+    assert not report.committed
+    assert [type(e) for _, _, e in report.errors] == [DuplicateError, InvalidDateError, InvalidStaffRoleError,
+                                                      DuplicateError]
+    assert len(system.staff) == 1
+
+    report = system.add_staff_bulk([("Sakura Haruno", 22, "Female", "12/03/1999"), ("Zendaya", 18, "F", "01/12/2006")],
+                                   atomic=False)
+    assert report.committed
+    assert [row for row, _, _ in report.errors] == [1]
+    assert len(system.staff) == 2
+
+    # Rows sharing an invalid birthday each get their own exception.
+    report = system.add_staff_bulk([("Kakashi Hatake", 35, "Male", "31/02/1985"),
+                                    ("Might Guy", 35, "Male", "31/02/1985")])
+    first, second = [e for _, _, e in report.errors]
+    assert first is not second
+    assert str(first) == str(second)
+
+def test_add_staff_bulk_from_streams(system):
+    csv_stream = io.StringIO("name,age,gender,birthday,role\n"
+                             "Naruto Uzumaki,20,Male,15/06/1998,Keeper\n"
+                             "Sakura Haruno,22,Female,12/03/1999,\n")
+    report = system.add_staff_bulk(csv_stream)
+    assert report.ok
+    assert [s.role for s in report.added] == ["Keeper", None]
+
+    jsonl_stream = io.StringIO('{"name": "Kakashi Hatake", "age": 35, "gender": "Male", "birthday": "07/09/1985", '
+                               '"role": "Veterinarian"}\n'
+                               'not json\n')
+    report = system.add_staff_bulk(jsonl_stream, atomic=False)
+    assert [s.id for s in report.added] == ["KakHat85"]
+    assert [row for row, _, _ in report.errors] == [1]
+
+def test_place_unhoused_animals(system):
+    small = system.add_enclosure(20, "Savannah")
+    big = system.add_enclosure(30, "Savannah")
+    system.add_animal("Mammal", "Zara", "Zebra", 4)
+    system.assign_animal_to_enclosure("Zara", small.id)
+    for name in ("Nala", "Mufasa", "Simba", "Kiara"):
+        system.add_animal("Mammal", name, "Lion", 5)
+    system.add_animal("Mammal", "Zed", "Zebra", 3)
+
+    plan, unplaced = system.place_unhoused_animals(apply=False)
+    assert plan == {"Nala": big.id, "Mufasa": big.id, "Simba": big.id, "Zed": small.id}
+    assert unplaced == ["Kiara"]
+    assert system.get_animal("Nala").in_enclosure is None
+
+    system.place_unhoused_animals()
+    assert [a.name for a in big.contains] == ["Nala", "Mufasa", "Simba"]
+    assert system.get_animal("Zed").in_enclosure == small.id
+    assert system.get_animal("Kiara").in_enclosure is None
+    assert system.get_hungry_animals(big.id) == list(big.contains)
+    assert big.capacity == 3
+
+    assert system.place_unhoused_animals() == ({}, ["Kiara"])
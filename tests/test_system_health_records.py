@@ -111,3 +111,59 @@ def test_get_animal_health_record(system_with_lions):
     with pytest.raises(NoSuchAnimalError):
         system.get_animal_health_record("Simba")
 
+
+def test_health_records_stay_chronological(system_with_lions):
+    system = system_with_lions
+
+    late = system.create_health_entry("Nala", "03/02/2020", "Fever", "Hot", 1, "Rest")
+    early = system.create_health_entry("Nala", "01/01/2020", "Injury", "Leg", 2, "Bandage")
+    middle = system.create_health_entry("Nala", "15/01/2020", "Cough", "Dry", 1, "Syrup")
+
+    assert system.get_animal_health_record("Nala") == [early, middle, late]
+    assert early.date == "01/01/2020"
+    assert early.date_key < middle.date_key < late.date_key
+
+def test_ailing_animals_follow_ailment_setter(system_with_lions):
+    system = system_with_lions
+    nala = system.get_animal("Nala")
+    mufasa = system.get_animal("Mufasa")
+
+    assert system.get_ailing_animals() == []
+
+    mufasa.ailment = True
+    nala.ailment = True
+    nala.ailment = True
+    assert system.get_ailing_animals() == [mufasa, nala]
+
+    mufasa.ailment = False
+    assert system.get_ailing_animals() == [nala]
+
+    system.schedule_treatment_auto("06/06/2020")
+    assert [t.animal_id for _, _, _, t in system.iter_tasks(date="06/06/2020")] == ["Nala"]
+
+    system.remove_animal("Nala")
+    assert system.get_ailing_animals() == []
+    assert nala.observer is None
+
+def test_ailing_animals_for_staff(system_with_lions):
+    system = system_with_lions
+    system.add_staff("Pet Parker", 30, "Male", "01/01/1995", role="Veterinarian")
+    vet = system.staff[0]
+    system.assign_animal_to_vet("Nala", vet.id)
+
+    system.get_animal("Nala").ailment = True
+    system.get_animal("Mufasa").ailment = True
+
+    assert [a.name for a in system.get_ailing_animals(vet.id)] == ["Nala"]
+
+    savannah = system.enclosures[0]
+    aquarium = system.add_enclosure(50, "Aquarium")
+    system.assign_animal_to_enclosure("Mufasa", savannah.id)
+    system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    keeper = system.staff[1]
+    system.assign_enclosure_to_keeper(aquarium.id, keeper.id)
+    assert system.get_ailing_animals(keeper.id) == []
+    system.assign_enclosure_to_keeper(savannah.id, keeper.id)
+    assert [a.name for a in system.get_ailing_animals(keeper.id)] == ["Mufasa"]
+    with pytest.raises(NoSuchStaffError):
+        system.get_ailing_animals("Nobody")
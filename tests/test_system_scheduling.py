@@ -13,6 +13,7 @@ import pytest
 from exceptions import *
 from system.zoo_system import ZooSystem
 from datetime import datetime
+from dates import UNSCHEDULED, format_date, parse_date, today_key
 from domain.records.cleaning_task import CleaningTask
 from domain.records.feeding_task import FeedingTask
 from domain.records.treatment_task import TreatmentTask
@@ -128,6 +129,17 @@ def test_add_task(system):
     assert nar_id in slot["uncompleted"]
     assert task in slot["uncompleted"][nar_id]
 
+def test_add_task_rejects_duplicate_on_same_date(system):
+    first = CleaningTask("50Sav1", "05/06/2020")
+    system.add_task(first, date="05/06/2020")
+    with pytest.raises(DuplicateError):
+        system.add_task(CleaningTask("50Sav1", "05/06/2020"), date="05/06/2020")
+
+    assert system.get_task_by_id("Cln-50Sav1-05/06") is first
+    assert system.tasks_by_date["05/06/2020"]["uncompleted"] == {"UNASSIGNED": [first]}
+    # The same id a year later is a different task.
+    system.add_task(CleaningTask("50Sav1", "05/06/2021"), date="05/06/2021")
+
 def test_add_many_tasks(system):
     system.add_staff("Peter Parker", 22, "Male", "10/10/2002", role="Keeper")
     pet_id = system.staff[0].id
@@ -271,6 +283,25 @@ def test_schedule_feeding_auto_none_hungry(system_with_lions_assigned):
 
     assert "06/06/2020" not in system.tasks_by_date
 
+def test_schedule_feeding_auto_registry_order(system_with_lions_assigned):
+    system = system_with_lions_assigned
+    e = system.enclosures[0]
+    other = system.add_enclosure(60, "Savannah")
+    system.add_animal("Mammal", "Simba", "Lion", 2)
+    system.add_animal("Mammal", "Kiara", "Lion", 1)
+    system.assign_animal_to_enclosure("Simba", e.id)
+    system.assign_animal_to_enclosure("Kiara", other.id)
+    for a in system.animals:
+        a.hungry = False
+
+    # Enclosures and animals become hungry in the reverse of their registry order.
+    for name in ("Kiara", "Simba", "Nala"):
+        system.get_animal(name).hungry = True
+    system.schedule_feeding_auto("06/06/2020")
+
+    tasks = [t for _, _, _, t in system.iter_tasks(date="06/06/2020")]
+    assert [(t.enclosure_id, t.animals) for t in tasks] == [(e.id, ["Nala", "Simba"]), (other.id, ["All Animals"])]
+
 def test_schedule_feeding_auto_no_duplicates(system_with_lions_assigned):
     system = system_with_lions_assigned
     e = system.enclosures[0]
@@ -520,4 +551,499 @@ def test_complete_feeding_task_named_and_all(system_with_lions_assigned):
     assert keeper.id not in slot_all["uncompleted"]
     assert keeper.id in slot_all["completed"]
     assert task_all in slot_all["completed"][keeper.id]
-    assert task_all.complete is True
\ No newline at end of file
+    assert task_all.complete is True
+
+def test_find_task_in_schedule_tracks_moves(system_with_savannah):
+    system = system_with_savannah
+    e = system.enclosures[0]
+    e.cleanliness = 2
+    system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    keeper = system.staff[0]
+    system.assign_enclosure_to_keeper(e.id, keeper.id)
+
+    system.schedule_cleaning_auto("05/06/2020")
+    task = system.get_task_by_id("Cln-50Sav1-05/06")
+    assert system.find_task_in_schedule(task.id) == (parse_date("05/06/2020"), "uncompleted", "UNASSIGNED", task)
+
+    system.assign_task_to_staff(keeper.id, task.id)
+    assert system.find_task_in_schedule(task.id) == (parse_date("05/06/2020"), "uncompleted", keeper.id, task)
+
+    e.cleanliness = 4
+    system.complete_task(task.id)
+    assert system.find_task_in_schedule(task.id) == (parse_date("05/06/2020"), "completed", keeper.id, task)
+
+def test_find_task_in_schedule_forgets_removed_tasks(system_with_lions):
+    system = system_with_lions
+    system.get_animal("Nala").ailment = True
+    system.schedule_treatment_auto("06/06/2020")
+    assert system.get_task_by_id("Tr-Nala-06/06").animal_id == "Nala"
+
+    system.remove_animal("Nala")
+
+    with pytest.raises(NoSuchTaskError):
+        system.get_task_by_id("Tr-Nala-06/06")
+    with pytest.raises(NoSuchTaskError):
+        system.complete_task("Tr-Nala-06/06")
+
+def test_task_exists(system):
+    task = CleaningTask("50Sav1", "05/06/2020")
+    assert system.task_exists(task) is False
+    system.add_task(task, date="05/06/2020")
+    assert system.task_exists(task) is True
+    assert system.task_exists(task, "05/06/2020") is True
+    assert system.task_exists(task, "06/06/2020") is False
+
+def test_auto_schedulers_skip_existing_and_removed_ids(system_with_lions_assigned):
+    system = system_with_lions_assigned
+    e = system.enclosures[0]
+    e.cleanliness = 1
+    system.get_animal("Nala").ailment = True
+
+    system.schedule_feeding_auto("05/06/2020")
+    system.schedule_cleaning_auto("05/06/2020")
+    system.schedule_treatment_auto("05/06/2020")
+    first = {t.id for _, _, _, t in system.iter_tasks(date="05/06/2020")}
+    assert first == {"Fd-50Sav1-1-05/06", "Cln-50Sav1-05/06", "Tr-Nala-05/06"}
+
+    system.schedule_feeding_auto("05/06/2020")
+    system.schedule_cleaning_auto("05/06/2020")
+    system.schedule_treatment_auto("05/06/2020")
+    assert len(list(system.iter_tasks(date="05/06/2020"))) == 3
+
+    system.get_animal("Nala").ailment = False
+    system.remove_animal("Nala")
+    system.get_animal("Mufasa").ailment = True
+    system.schedule_treatment_auto("05/06/2020")
+    ids = {t.id for _, _, _, t in system.iter_tasks(date="05/06/2020")}
+    assert "Tr-Nala-05/06" not in ids
+    assert "Tr-Mufasa-05/06" in ids
+
+def test_remove_enclosure_drops_only_its_tasks(system):
+    system.add_enclosure(50, "Savannah")
+    system.add_enclosure(60, "Savannah")
+    t1 = CleaningTask("50Sav1", "05/06/2020")
+    t2 = CleaningTask("60Sav2", "05/06/2020")
+    t3 = CleaningTask("50Sav1", "06/06/2020")
+    for task in (t1, t2, t3):
+        system.add_task(task, date=task.date)
+
+    system.remove_enclosure("50Sav1")
+
+    remaining = [t for _, _, _, t in system.iter_tasks()]
+    assert remaining == [t2]
+    assert system.tasks_by_date["06/06/2020"]["uncompleted"] == {}
+
+def test_remove_animal_prunes_named_feeding_tasks(system_with_lions):
+    system = system_with_lions
+    task = FeedingTask("50Sav1", ["Nala", "Mufasa"], "05/06/2020")
+    solo = FeedingTask("50Sav1", ["Nala"], "06/06/2020")
+    system.add_task(task, date="05/06/2020")
+    system.add_task(solo, date="06/06/2020")
+
+    system.remove_animal("Nala")
+
+    assert task.animals == ["Mufasa"]
+    assert system.get_task_by_id(task.id) is task
+    assert solo not in [t for _, _, _, t in system.iter_tasks()]
+
+    system.remove_animal("Mufasa")
+    assert list(system.iter_tasks()) == []
+
+def test_remove_staff_unassigns_all_their_tasks(system_with_savannah):
+    system = system_with_savannah
+    e = system.enclosures[0]
+    keeper = system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    system.assign_enclosure_to_keeper(e.id, keeper.id)
+
+    done = CleaningTask(e.id, "05/06/2020")
+    open_task = CleaningTask(e.id, "06/06/2020")
+    system.add_task(done, date="05/06/2020", staff_id=keeper.id)
+    system.add_task(open_task, date="06/06/2020", staff_id=keeper.id)
+    system.complete_task(done.id)
+
+    system.remove_staff(keeper.id)
+
+    assert system.find_task_in_schedule(done.id)[1:3] == ("completed", "UNASSIGNED")
+    assert system.find_task_in_schedule(open_task.id)[1:3] == ("uncompleted", "UNASSIGNED")
+    assert list(system.iter_tasks(staff_id=keeper.id)) == []
+
+def test_same_task_id_in_different_years(system_with_savannah):
+    system = system_with_savannah
+    e = system.enclosures[0]
+    keeper = system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    system.assign_enclosure_to_keeper(e.id, keeper.id)
+    old = system.create_task_manual("Cleaning", enclosure_id=e.id, date="05/12/2025")
+    new = system.create_task_manual("Cleaning", enclosure_id=e.id, date="05/12/2026")
+    assert old.id == new.id
+
+    assert system.get_task_by_id(old.id) is old
+    assert system.get_task_by_id(new.id, "05/12/2026") is new
+    assert system.task_exists(old, "05/12/2025") and system.task_exists(new, "05/12/2026")
+
+    system.assign_task_to_staff(keeper.id, new.id, "05/12/2026")
+    system.complete_task(new.id, "05/12/2026")
+    assert system.find_task_in_schedule(old.id, "05/12/2025")[1:3] == ("uncompleted", "UNASSIGNED")
+    assert system.find_task_in_schedule(new.id, "05/12/2026")[1:3] == ("completed", keeper.id)
+    with pytest.raises(NoSuchTaskError):
+        system.find_task_in_schedule(old.id, "05/12/2027")
+
+    system.remove_staff(keeper.id)
+    system.remove_enclosure(e.id)
+    assert list(system.iter_tasks()) == []
+    assert not system.task_exists(old)
+    with pytest.raises(NoSuchTaskError):
+        system.get_task_by_id(old.id, "05/12/2025")
+
+def test_schedule_uses_ordinal_date_keys(system_with_savannah):
+    system = system_with_savannah
+    e = system.enclosures[0]
+    e.cleanliness = 2
+    system.schedule_cleaning_auto("05/06/2020")
+    system.schedule_cleaning_auto("5/6/2020")
+
+    assert list(system.tasks_by_date) == ["05/06/2020"]
+    assert system.get_date_ordinal("05/06/2020") == parse_date("05/06/2020")
+    assert system.get_date_ordinal() == 0
+
+    date_key, _, _, task = next(system.iter_tasks(date="05/06/2020"))
+    assert date_key == parse_date("05/06/2020")
+    assert task.date == "05/06/2020"
+    assert system.task_exists(task, "05/06/2020")
+    assert not system.task_exists(task, "06/06/2020")
+
+def test_iter_tasks_chronological_order(system):
+    t1 = CleaningTask("50Sav1", "07/06/2020")
+    t2 = CleaningTask("50Sav1", "05/06/2020")
+    t3 = CleaningTask("50Sav1", "UNSCHEDULED")
+    t4 = CleaningTask("50Sav1", "06/05/2021")
+
+    system.add_task(t1, date="07/06/2020")
+    system.add_task(t3)
+    system.add_task(t2, date="05/06/2020")
+    system.add_task(t4, date="06/05/2021")
+
+    assert [t for _, _, _, t in system.iter_tasks()] == [t2, t1, t4, t3]
+
+def test_iter_tasks_date_range(system):
+    tasks = []
+    for day in range(1, 11):
+        date = f"{day:02d}/06/2020"
+        task = CleaningTask("50Sav1", date)
+        system.add_task(task, date=date)
+        tasks.append(task)
+    system.add_task(CleaningTask("50Sav1", "UNSCHEDULED"))
+
+    week = [t for _, _, _, t in system.iter_tasks(start="03/06/2020", end="09/06/2020")]
+    assert week == tasks[2:9]
+
+    assert [t for _, _, _, t in system.iter_tasks(start="09/06/2020")] == tasks[8:]
+    assert [t for _, _, _, t in system.iter_tasks(end="02/06/2020")] == tasks[:2]
+    assert list(system.iter_tasks(start="01/07/2020", end="31/07/2020")) == []
+
+    with pytest.raises(InvalidDateError):
+        list(system.iter_tasks(start="2020/06/01"))
+
+def test_iter_tasks_staff_and_unassigned_indexes(system_with_savannah):
+    system = system_with_savannah
+    e = system.enclosures[0]
+    system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    keeper = system.staff[0]
+    system.assign_enclosure_to_keeper(e.id, keeper.id)
+
+    for day in range(1, 6):
+        system.add_task(CleaningTask(e.id, f"{day:02d}/06/2020"), date=f"{day:02d}/06/2020")
+    system.add_task(CleaningTask(e.id, "UNSCHEDULED"))
+
+    for day in (4, 2):
+        system.assign_task_to_staff(keeper.id, f"Cln-{e.id}-{day:02d}/06")
+
+    keeper_tasks = list(system.iter_tasks(staff_id=keeper.id))
+    assert [t.id for _, _, _, t in keeper_tasks] == [f"Cln-{e.id}-02/06", f"Cln-{e.id}-04/06"]
+    assert all(group == keeper.id for _, _, group, _ in keeper_tasks)
+    assert keeper_tasks[0][0] == parse_date("02/06/2020")
+
+    pool = [t.id for _, _, _, t in system.iter_tasks(assigned=False)]
+    assert pool == [f"Cln-{e.id}-01/06", f"Cln-{e.id}-03/06", f"Cln-{e.id}-05/06", f"Cln-{e.id}-UNSCH"]
+
+    assert [t.id for _, _, _, t in system.iter_tasks(staff_id=keeper.id, start="03/06/2020")] == [f"Cln-{e.id}-04/06"]
+    assert list(system.iter_tasks(staff_id=keeper.id, assigned=False)) == []
+    assert list(system.iter_tasks(staff_id=keeper.id, status="completed")) == []
+
+    system.remove_staff(keeper.id)
+    assert list(system.iter_tasks(staff_id=keeper.id)) == []
+    assert len(list(system.iter_tasks(assigned=False))) == 6
+
+def test_hungry_animals_tracked_per_enclosure(system_with_lions_assigned):
+    system = system_with_lions_assigned
+    e = system.enclosures[0]
+    nala = system.get_animal("Nala")
+    mufasa = system.get_animal("Mufasa")
+
+    assert system.get_hungry_animals(e.id) == [nala, mufasa]
+
+    nala.eat("meat")
+    assert system.get_hungry_animals(e.id) == [mufasa]
+
+    mufasa.hungry = False
+    assert system.get_hungry_animals(e.id) == []
+    system.schedule_feeding_auto("06/06/2020")
+    assert "06/06/2020" not in system.tasks_by_date
+
+    system.add_enclosure(60, "Savannah")
+    other = system.enclosures[1]
+    nala.hungry = True
+    system.assign_animal_to_enclosure("Nala", other.id)
+    assert system.get_hungry_animals(e.id) == []
+    assert system.get_hungry_animals(other.id) == [nala]
+
+    system.remove_animal("Nala")
+    assert system.get_hungry_animals(other.id) == []
+    with pytest.raises(NoSuchEnclosureError):
+        system.get_hungry_animals("Nowhere")
+
+def test_dirtiest_enclosures_follow_cleanliness(system):
+    first = system.add_enclosure(50, "Savannah")
+    second = system.add_enclosure(60, "Savannah")
+    third = system.add_enclosure(70, "Savannah")
+
+    assert system.get_dirtiest_enclosures(2) == [first, second]
+
+    third.cleanliness = 0
+    second.cleanliness = 2
+    assert system.get_dirtiest_enclosures(2) == [third, second]
+    assert system.get_dirtiest_enclosures(10) == [third, second, first]
+    assert system.get_dirtiest_enclosures(10, below=3) == [third, second]
+    assert system.get_dirtiest_enclosures(0) == []
+
+    second.be_cleaned()
+    second.be_cleaned()
+    third.be_cleaned()
+    assert system.get_dirtiest_enclosures(10, below=3) == [third]
+
+    system.schedule_cleaning_auto("05/06/2020")
+    assert [t.enclosure_id for _, _, _, t in system.iter_tasks()] == [third.id]
+
+    system.remove_enclosure(third.id)
+    assert system.get_dirtiest_enclosures(10) == [second, first]
+
+    with pytest.raises(ValueError):
+        system.get_dirtiest_enclosures(-1)
+
+def test_auto_assign_tasks_balances_load(system_with_lions_assigned):
+    system = system_with_lions_assigned
+    e = system.enclosures[0]
+    other = system.add_enclosure(60, "Savannah")
+    unstaffed = system.add_enclosure(70, "Savannah")
+    for enclosure in (e, other, unstaffed):
+        enclosure.cleanliness = 1
+
+    system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    system.add_staff("Amy Keeper", 30, "Female", "02/02/1996", role="Keeper")
+    system.add_staff("Pet Parker", 30, "Male", "01/01/1995", role="Veterinarian")
+    bob, amy, vet = system.staff
+    system.assign_enclosure_to_keeper(e.id, bob.id)
+    system.assign_enclosure_to_keeper(e.id, amy.id)
+    system.assign_enclosure_to_keeper(other.id, bob.id)
+    system.assign_animal_to_vet("Nala", vet.id)
+    system.get_animal("Nala").ailment = True
+    system.get_animal("Mufasa").ailment = True
+
+    system.schedule_cleaning_auto("05/06/2020")
+    system.schedule_feeding_auto("05/06/2020")
+    system.schedule_treatment_auto("05/06/2020")
+
+    assignments, unassigned = system.auto_assign_tasks("05/06/2020")
+    assert assignments == {
+        f"Cln-{e.id}-05/06": bob.id,
+        f"Cln-{other.id}-05/06": bob.id,
+        "Fd-50Sav1-1-05/06": amy.id,
+        "Tr-Nala-05/06": vet.id,
+    }
+    assert unassigned == [f"Cln-{unstaffed.id}-05/06", "Tr-Mufasa-05/06"]
+    assert [t.id for _, _, _, t in system.iter_tasks(staff_id=amy.id)] == ["Fd-50Sav1-1-05/06"]
+    assert system.get_task_by_id("Tr-Nala-05/06") in vet.tasks
+    assert system.auto_assign_tasks("06/06/2020") == ({}, [])
+
+def test_auto_assign_tasks_includes_recurring_occurrences(system_with_lions_assigned):
+    system = system_with_lions_assigned
+    e = system.enclosures[0]
+    unstaffed = system.add_enclosure(70, "Savannah")
+    system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    bob = system.staff[0]
+    system.assign_enclosure_to_keeper(e.id, bob.id)
+    system.add_recurring_task("Cleaning", "01/06/2020", every=7, enclosure_id=e.id)
+    system.add_recurring_task("Cleaning", "01/06/2020", every=7, enclosure_id=unstaffed.id)
+
+    assignments, unassigned = system.auto_assign_tasks("08/06/2020")
+    assert assignments == {"Cln-50Sav1-08/06": bob.id}
+    assert unassigned == [f"Cln-{unstaffed.id}-08/06"]
+    assert list(system.tasks_by_date) == ["08/06/2020"]
+    assert system.get_task_by_id("Cln-50Sav1-08/06") in bob.tasks
+    assert [t.id for _, _, _, t in system.iter_tasks(date="08/06/2020", assigned=False)] == \
+           [f"Cln-{unstaffed.id}-08/06"]
+    assert system.auto_assign_tasks("08/06/2020") == ({}, [f"Cln-{unstaffed.id}-08/06"])
+
+def test_schedule_horizon(system_with_lions_assigned):
+    system = system_with_lions_assigned
+    e = system.enclosures[0]
+    e.cleanliness = 1
+    system.get_animal("Nala").ailment = True
+    system.schedule_cleaning_auto("02/06/2020")
+
+    added = system.schedule_horizon("01/06/2020", 7, kinds=["cleaning", "Treatment"])
+    assert len(added) == 13
+    assert sorted(system.tasks_by_date, key=parse_date) == [f"{day:02d}/06/2020" for day in range(1, 8)]
+    assert [t.id for _, _, _, t in system.iter_tasks(date="03/06/2020")] == ["Cln-50Sav1-03/06", "Tr-Nala-03/06"]
+
+    assert system.schedule_horizon("01/06/2020", 7, kinds=["Cleaning", "Treatment"]) == []
+    feeding = system.schedule_horizon("07/06/2020", 2, kinds="Feeding")
+    assert [t.id for t in feeding] == ["Fd-50Sav1-1-07/06", "Fd-50Sav1-1-08/06"]
+
+    with pytest.raises(InvalidTaskTypeError):
+        system.schedule_horizon("01/06/2020", 7, kinds=["Grooming"])
+    with pytest.raises(ValueError):
+        system.schedule_horizon("01/06/2020", 0)
+    with pytest.raises(InvalidDateError):
+        system.schedule_horizon("2020/06/01", 3)
+
+def test_schedule_horizon_longer_than_a_year(system_with_savannah):
+    system = system_with_savannah
+    e = system.enclosures[0]
+    e.cleanliness = 1
+
+    added = system.schedule_horizon("01/06/2020", 400, kinds="Cleaning")
+    assert len(added) == 400
+    first = system.find_task_in_schedule("Cln-50Sav1-01/06")
+    repeat = system.get_task_by_id("Cln-50Sav1-01/06", "01/06/2021")
+    assert first[0] == parse_date("01/06/2020")
+    assert repeat is not first[3]
+
+    system.remove_enclosure(e.id)
+    assert list(system.iter_tasks()) == []
+
+def test_recurring_tasks_expand_lazily(system_with_lions_assigned):
+    system = system_with_lions_assigned
+    e = system.enclosures[0]
+    system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    keeper = system.staff[0]
+    system.assign_enclosure_to_keeper(e.id, keeper.id)
+
+    daily = system.add_recurring_task("feeding", "01/06/2020", enclosure_id=e.id, animal_names=["All Animals"])
+    weekly = system.add_recurring_task("Cleaning", "01/06/2020", every=7, end="30/06/2020", enclosure_id=e.id,
+                                       staff_id=keeper.id)
+    assert system.recurring_tasks == [daily, weekly]
+    assert system.tasks_by_date == {}
+
+    day = list(system.iter_tasks(date="08/06/2020"))
+    assert [(group, t.id) for _, _, group, t in day] == [("UNASSIGNED", "Fd-50Sav1-1-08/06"),
+                                                         (keeper.id, "Cln-50Sav1-08/06")]
+    assert [t.id for _, _, _, t in system.iter_tasks(date="09/06/2020")] == ["Fd-50Sav1-1-09/06"]
+    week = list(system.iter_tasks(start="01/06/2020", end="30/06/2020", staff_id=keeper.id))
+    assert [t.date for _, _, _, t in week] == ["01/06/2020", "08/06/2020", "15/06/2020", "22/06/2020", "29/06/2020"]
+    assert list(system.iter_tasks(date="06/07/2020", staff_id=keeper.id)) == []
+    assert system.tasks_by_date == {}
+
+    system.assign_task_to_staff(keeper.id, "Fd-50Sav1-1-08/06")
+    assert system.find_task_in_schedule("Fd-50Sav1-1-08/06")[2] == keeper.id
+    day = list(system.iter_tasks(date="08/06/2020"))
+    assert [t.id for _, _, _, t in day] == ["Fd-50Sav1-1-08/06", "Cln-50Sav1-08/06"]
+    assert list(system.tasks_by_date) == ["08/06/2020"]
+
+    with pytest.raises(InvalidStaffRoleError):
+        system.add_recurring_task("Treatment", "01/06/2020", animal_names="Nala", staff_id=keeper.id)
+    with pytest.raises(NoSuchTaskError):
+        system.remove_recurring_task("Rec-99")
+
+    system.remove_recurring_task(daily.id)
+    assert [t.id for _, _, _, t in system.iter_tasks(date="09/06/2020")] == []
+
+
+def test_recurring_task_ids_resolve_from_templates(system_with_lions_assigned):
+    system = system_with_lions_assigned
+    e = system.enclosures[0]
+    system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    keeper = system.staff[0]
+    system.assign_enclosure_to_keeper(e.id, keeper.id)
+    system.add_recurring_task("Cleaning", "01/06/2020", every=7, enclosure_id=e.id)
+
+    # Lookups build the occurrence without storing it, and return the same answer every time.
+    date_key, status, group, task = system.find_task_in_schedule("Cln-50Sav1-15/06")
+    assert (format_date(date_key), status, group, task.id) == ("15/06/2020", "uncompleted", "UNASSIGNED",
+                                                               "Cln-50Sav1-15/06")
+    assert system.find_task_in_schedule("Cln-50Sav1-15/06")[0] == date_key
+    # 14/06/2020 is not a weekly occurrence, so the id resolves to the next year.
+    assert system.get_task_by_id("Cln-50Sav1-14/06").date == "14/06/2021"
+    with pytest.raises(NoSuchTaskError):
+        system.get_task_by_id("Cln-50Sav1-15/06", "15/06/2021")
+    assert system.tasks_by_date == {}
+    with pytest.raises(NoSuchTaskError):
+        system.find_task_in_schedule("Cln-50Sav1-16/06", "16/06/2020")
+    with pytest.raises(NoSuchTaskError):
+        system.find_task_in_schedule("Cln-50Sav12-15/06")
+
+    # Assigning by id needs no earlier iter_tasks call, and stores only that occurrence.
+    system.assign_task_to_staff(keeper.id, "Cln-50Sav1-22/06")
+    assert list(system.tasks_by_date) == ["22/06/2020"]
+    assert system.get_task_by_id("Cln-50Sav1-22/06") in keeper.tasks
+    system.complete_task("Cln-50Sav1-22/06")
+    assert system.find_task_in_schedule("Cln-50Sav1-22/06")[1] == "completed"
+
+
+def test_stored_recurring_occurrence_survives_template_change(system_with_lions_assigned):
+    system = system_with_lions_assigned
+    e = system.enclosures[0]
+    system.add_animal("Mammal", "Simba", "Lion", 2)
+    system.assign_animal_to_enclosure("Simba", e.id)
+    system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    keeper = system.staff[0]
+    system.assign_enclosure_to_keeper(e.id, keeper.id)
+    system.add_recurring_task("Feeding", "01/01/2030", enclosure_id=e.id, animal_names=["Simba", "Nala", "Mufasa"])
+
+    system.assign_task_to_staff(keeper.id, "Fd-50Sav1-3-02/01")
+    system.remove_animal("Mufasa")
+
+    # The template now generates 'Fd-50Sav1-2-...', but the stored task is still that day's feeding.
+    day = list(system.iter_tasks(date="02/01/2030"))
+    assert [(group, t.id) for _, _, group, t in day] == [(keeper.id, "Fd-50Sav1-3-02/01")]
+    with pytest.raises(NoSuchTaskError):
+        system.find_task_in_schedule("Fd-50Sav1-2-02/01", "02/01/2030")
+    assert [t.id for _, _, _, t in system.iter_tasks(date="03/01/2030")] == ["Fd-50Sav1-2-03/01"]
+
+
+def test_auto_scheduling_skips_recurring_occurrences(system_with_lions_assigned):
+    system = system_with_lions_assigned
+    e = system.enclosures[0]
+    system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    keeper = system.staff[0]
+    system.assign_enclosure_to_keeper(e.id, keeper.id)
+    system.add_recurring_task("Cleaning", "01/06/2020", every=7, enclosure_id=e.id, staff_id=keeper.id)
+    e.cleanliness = 1
+
+    system.schedule_cleaning_auto("08/06/2020")
+    system.schedule_cleaning_auto("09/06/2020")
+    assert list(system.tasks_by_date) == ["09/06/2020"]
+    day = list(system.iter_tasks(date="08/06/2020"))
+    assert [(group, t.id) for _, _, group, t in day] == [(keeper.id, "Cln-50Sav1-08/06")]
+    assert [t.date for t in system.schedule_horizon("07/06/2020", 3, kinds="Cleaning")] == ["07/06/2020"]
+
+
+def test_recurring_tasks_expand_to_horizon(system_with_lions_assigned):
+    system = system_with_lions_assigned
+    e = system.enclosures[0]
+    system.add_staff("Bob Keeper", 30, "Male", "01/01/1995", role="Keeper")
+    keeper = system.staff[0]
+    system.assign_enclosure_to_keeper(e.id, keeper.id)
+    system.create_task_manual("Cleaning", enclosure_id=e.id)
+    first = today_key() - 3
+    system.add_recurring_task("Cleaning", format_date(first), every=7, enclosure_id=e.id, staff_id=keeper.id)
+
+    last = max(today_key(), first) + ZooSystem.RECURRING_HORIZON_DAYS
+    expected = list(range(first, last + 1, 7))
+    everything = list(system.iter_tasks())
+    assert [d for d, _, _, _ in everything] == expected + [UNSCHEDULED]
+    assert [d for d, _, _, _ in system.iter_tasks(staff_id=keeper.id)] == expected
+    # The horizon runs past the start of the range when that is later than today.
+    later = list(range(first + 7, first + 7 + ZooSystem.RECURRING_HORIZON_DAYS + 1, 7))
+    assert [d for d, _, _, _ in system.iter_tasks(start=format_date(first + 7))] == later
+    assert [d for d, _, _, _ in system.iter_tasks(end=format_date(first + 7))] == expected[:2]
+    assert list(system.iter_tasks(status="completed")) == []
@@ -10,6 +10,8 @@ ID: 110457330
 Username: PIEBY002
 This is my own work as defined by the University's Academic Integrity Policy.
 '''
+from collections import namedtuple
+
 mammal_data = {
     "Lion": {"diet": ["meat", "organs", "bones"], "enclosure": "Savannah", "sound": "roar", "max_age": 25},
     "Black Bear": {"diet": ["fish", "berries", "insects", "meat", "plants"], "enclosure": "Forest", "sound": "growl", "max_age": 30},
@@ -105,3 +107,45 @@ for groups in animal_data:
         animals.append(species)
 
 
+# Compiled species catalog, built once at import. Keys are normalised species names and values are immutable
+# records, so species validation and lookups are a single dictionary access.
+SpeciesRecord = namedtuple("SpeciesRecord", ["species", "type", "enclosure", "diet", "sound", "max_age"])
+
+
+def normalise_name(name: str) -> str:
+    """ Returns a species or enclosure name with collapsed whitespace and title casing, as used for catalog keys. """
+    return " ".join(name.strip().split()).title()
+
+
+animal_types = {"Mammal": mammal_data, "Bird": bird_data, "Reptile": reptile_data}
+
+species_catalog = {}
+for animal_type, groups in animal_types.items():
+    for species, info in groups.items():
+        species_catalog[normalise_name(species)] = SpeciesRecord(species=species,
+                                                                 type=animal_type,
+                                                                 enclosure=info["enclosure"],
+                                                                 diet=frozenset(info["diet"]),
+                                                                 sound=info["sound"],
+                                                                 max_age=info["max_age"])
+
+enclosure_types = frozenset(all_enclosures)
+
+# Records for species created outside the catalog (e.g. custom diets), shared between animals of the same profile.
+interned_records = {}
+
+
+def intern_species_record(species: str, enclosure: str, diet, sound: str) -> SpeciesRecord:
+    """ Returns the shared immutable record for a species profile, so animals of one species reference one object.
+        The catalog record is reused when the profile matches it exactly. """
+    diet = frozenset(diet)
+    record = species_catalog.get(normalise_name(species))
+    if record is not None and (record.species, record.enclosure, record.diet, record.sound) == (species, enclosure, diet, sound):
+        return record
+
+    key = (species, enclosure, diet, sound)
+    record = interned_records.get(key)
+    if record is None:
+        record = SpeciesRecord(species=species, type=None, enclosure=enclosure, diet=diet, sound=sound, max_age=None)
+        interned_records[key] = record
+    return record